@@ -0,0 +1,73 @@
+"""Compares the per-resource overhead of the synchronous and asynchronous evaluation paths
+
+Every policy is a trivial local check, so the timings are dominated by pylicy's own overhead.
+
+Usage:
+    poetry run python benchmarks/apply_sync.py [--resources N] [--policies N]
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any, List
+
+from pylicy import PolicyDecision, PolicyDecisionAction, Pylicy, Resource, Rule, UserRule, policy
+
+SCOPE = "benchmark_apply_sync"
+
+
+def register_policies(count: int) -> None:
+    for i in range(count):
+
+        def checker(resource: Resource, rule: Rule) -> PolicyDecision:
+            if resource.data["size"] > 100:
+                return PolicyDecision(action=PolicyDecisionAction.DENY, reason="too big")
+            return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+        policy.register_policy(f"policy_{i}", checker, scope=SCOPE, sync=True)
+
+
+def timed(label: str, resources: int, run: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed:8.3f}s {elapsed / resources * 1e6:10.2f}us/resource")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--resources", type=int, default=20000)
+    parser.add_argument("--policies", type=int, default=5)
+    args = parser.parse_args()
+
+    register_policies(args.policies)
+    policies = Pylicy.from_rules([UserRule(name="all", resources=["*"], policies=["*"])], scope=SCOPE)
+    resources: List[Resource] = [
+        Resource(id=f"resource_{i}", data={"size": i % 200}) for i in range(args.resources)
+    ]
+    # Plans are cached after the first resolution, warm the cache so each path is measured equally
+    policies.apply_all_sync(resources[:1])
+
+    async def apply_each() -> None:
+        for resource in resources:
+            await policies.apply(resource)
+
+    # A new event loop per call is slow enough that a sample is representative
+    sample_size = max(1, len(resources) // 20)
+    sample = resources[:sample_size]
+    timed(
+        "asyncio.run(apply) per resource",
+        len(sample),
+        lambda: [asyncio.run(policies.apply(r)) for r in sample],
+    )
+    timed("await apply per resource", len(resources), lambda: asyncio.run(apply_each()))
+    timed("await apply_all", len(resources), lambda: asyncio.run(policies.apply_all(resources)))
+    timed("apply_sync per resource", len(resources), lambda: [policies.apply_sync(r) for r in resources])
+    timed("apply_all_sync", len(resources), lambda: policies.apply_all_sync(resources))
+
+
+if __name__ == "__main__":
+    main()
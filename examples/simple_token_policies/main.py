@@ -16,10 +16,14 @@ class TokenAgePolicy(pylicy.Policy):
     """ Checks that a token is < 30 days since last rotation """
     name = 'token_age'
 
-    async def __call__(self, resource, rule):
+    def prepare(self, rule):
         rule_context = rule.context or {}
         max_rotation_time = rule_context.get('max_rotation_time', 30)
         warn_rotation_time = rule_context.get('warn_rotation_time', int(0.8 * max_rotation_time))
+        return max_rotation_time, warn_rotation_time
+
+    async def __call__(self, resource, rule, rotation_times):
+        max_rotation_time, warn_rotation_time = rotation_times
 
         time_since_rotation = mock_get_datetime() - dt.datetime.fromisoformat(resource.data['rotated_at'])
 
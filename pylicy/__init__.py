@@ -1,4 +1,5 @@
 from .models import PolicyDecision, PolicyDecisionAction, Resource, Rule, UserRule
+from .multi_scope import MultiScopePylicy
 from .policy import Policy, policy_checker
 from .pylicy import Pylicy
 
@@ -8,6 +9,7 @@ __all__ = [
     "PolicyDecision",
     "PolicyDecisionAction",
     "Pylicy",
+    "MultiScopePylicy",
     "Rule",
     "Resource",
     "UserRule",
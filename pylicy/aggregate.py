@@ -0,0 +1,165 @@
+import collections
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import JSON, PlanExplanation, PolicyDecisionAction, ResourceResult
+
+DEFAULT_TOP_N = 10
+
+
+def split_prefix(separator: str, depth: int = 1) -> Callable[[str], str]:
+    """Creates a prefix function grouping resource ids by their leading components
+
+    Args:
+        separator: Separator between components of resource ids
+        depth: Number of leading components forming the prefix
+
+    Returns:
+        A function mapping a resource id to its prefix
+
+    Example:
+    >>> split_prefix("/")("org/team/resource")
+    'org'
+    >>> split_prefix("/", depth=2)("org/team/resource")
+    'org/team'
+    """
+
+    def prefix(resource_id: str) -> str:
+        return separator.join(resource_id.split(separator, depth)[:depth])
+
+    return prefix
+
+
+class Summary:
+    """Running counts of decisions, folded in as results arrive
+
+    Memory is proportional to the number of policies, rules and prefixes rather than the number of
+    resources.
+    """
+
+    def __init__(self, *, top_n: int = DEFAULT_TOP_N, prefix: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            top_n: Number of resources with the most denials to keep
+            prefix: Function mapping resource ids to a prefix to count by, see `split_prefix`. Counts by
+                prefix are not kept if omitted
+        """
+        self.top_n = top_n
+        self.prefix = prefix
+
+        self.resources = 0
+        self.unmatched_resources = 0
+        self.by_policy: Dict[str, "collections.Counter[str]"] = collections.defaultdict(collections.Counter)
+        self.by_rule: Dict[str, "collections.Counter[str]"] = collections.defaultdict(collections.Counter)
+        self.by_prefix: Dict[str, "collections.Counter[str]"] = collections.defaultdict(collections.Counter)
+        self._top_denied: List[Tuple[int, str]] = []
+
+    def add(self, result: ResourceResult) -> None:
+        """Folds a result into the summary
+
+        Args:
+            result: Result to count
+        """
+        self.resources += 1
+        if not result.plan:
+            self.unmatched_resources += 1
+            return
+
+        prefix_counts = self.by_prefix[self.prefix(result.resource_id)] if self.prefix is not None else None
+        denied = 0
+        for step in result.plan:
+            action = result.decisions[step.policy_name].action
+            self.by_policy[step.policy_name][action.value] += 1
+            self.by_rule[step.rule.name][action.value] += 1
+            if prefix_counts is not None:
+                prefix_counts[action.value] += 1
+            if action == PolicyDecisionAction.DENY:
+                denied += 1
+
+        if denied:
+            self._push_denied(denied, result.resource_id)
+
+    def merge(self, other: "Summary") -> None:
+        """Folds the counts of another summary into this one
+
+        Args:
+            other: Summary to merge
+        """
+        self.resources += other.resources
+        self.unmatched_resources += other.unmatched_resources
+        for mine, theirs in [
+            (self.by_policy, other.by_policy),
+            (self.by_rule, other.by_rule),
+            (self.by_prefix, other.by_prefix),
+        ]:
+            for key, counts in theirs.items():
+                mine[key].update(counts)
+        for denied, resource_id in other._top_denied:
+            self._push_denied(denied, resource_id)
+
+    @property
+    def top_denied(self) -> List[Tuple[str, int]]:
+        """Resources with the most denials and their number of denials, most denied first"""
+        return [(resource_id, denied) for denied, resource_id in sorted(self._top_denied, reverse=True)]
+
+    def to_dict(self) -> Dict[str, JSON]:
+        """Converts the summary to plain json-compatible types"""
+        return {
+            "resources": self.resources,
+            "unmatched_resources": self.unmatched_resources,
+            "by_policy": {key: dict(counts) for key, counts in self.by_policy.items()},
+            "by_rule": {key: dict(counts) for key, counts in self.by_rule.items()},
+            "by_prefix": {key: dict(counts) for key, counts in self.by_prefix.items()},
+            "top_denied": [list(entry) for entry in self.top_denied],
+        }
+
+    def _push_denied(self, denied: int, resource_id: str) -> None:
+        if self.top_n <= 0:
+            return
+        if len(self._top_denied) < self.top_n:
+            heapq.heappush(self._top_denied, (denied, resource_id))
+        else:
+            heapq.heappushpop(self._top_denied, (denied, resource_id))
+
+
+class Coverage:
+    """Counts of the resources each rule and policy would apply to"""
+
+    def __init__(self) -> None:
+        self.resources = 0
+        self.unmatched_resources = 0
+        self.by_rule: "collections.Counter[str]" = collections.Counter()
+        self.by_policy: Dict[str, "collections.Counter[str]"] = collections.defaultdict(collections.Counter)
+        self.excluded: Dict[str, "collections.Counter[str]"] = collections.defaultdict(collections.Counter)
+
+    def add(self, explanation: PlanExplanation, count: int = 1) -> None:
+        """Folds an explanation into the coverage
+
+        Args:
+            explanation: Explanation of a resource's plan
+            count: Number of resources sharing the same plan
+        """
+        self.resources += count
+        if not explanation.plan:
+            self.unmatched_resources += count
+
+        for rule in explanation.effective_rules:
+            self.by_rule[rule.name] += count
+        for step in explanation.plan:
+            self.by_policy[step.policy_name][step.rule.name] += count
+        for policy_name, rule in explanation.excluded.items():
+            self.excluded[policy_name][rule.name] += count
+
+    def policy_totals(self) -> Dict[str, int]:
+        """Number of resources each policy would be applied to"""
+        return {policy_name: sum(rules.values()) for policy_name, rules in self.by_policy.items()}
+
+    def to_dict(self) -> Dict[str, JSON]:
+        """Converts the coverage to plain json-compatible types"""
+        return {
+            "resources": self.resources,
+            "unmatched_resources": self.unmatched_resources,
+            "by_rule": dict(self.by_rule),
+            "by_policy": {key: dict(rules) for key, rules in self.by_policy.items()},
+            "excluded": {key: dict(rules) for key, rules in self.excluded.items()},
+        }
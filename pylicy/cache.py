@@ -0,0 +1,112 @@
+import sys
+import threading
+from collections.abc import Hashable, Iterable
+from typing import Callable, Dict, List, Tuple, TypeVar
+
+from . import utils
+
+T = TypeVar("T")
+
+
+class _CacheEntry:
+    __slots__ = ("value", "refs")
+
+    def __init__(self, value: object):
+        self.value = value
+        self.refs = 0
+
+
+class CompilationCache:
+    """Shares compiled patterns and policy resolutions between Pylicy instances
+
+    Entries are reference counted. Every Pylicy acquires the entries it uses when constructed and releases
+    them when garbage collected, evicting entries no longer used by any instance.
+    """
+
+    def __init__(self) -> None:
+        # Reentrant as instances release their entries from a finalizer, which garbage collection may run
+        # while this thread already holds the lock
+        self._lock = threading.RLock()
+        self._entries: Dict[Hashable, _CacheEntry] = {}
+
+    def resource_matcher(
+        self, patterns: Iterable[str], *, keys: List[Hashable], regex: bool = False
+    ) -> utils.PatternSet:
+        """Acquires compiled resource patterns
+
+        Args:
+            patterns: Resource patterns of a rule
+            keys: List to record the acquired cache key in, for later release
+            regex: Accept `regex:<expression>` patterns, see `utils.PatternSet`
+
+        Returns:
+            Compiled patterns shared with any other user of the same patterns
+
+        Raises:
+            re.error: when a regex pattern is invalid
+        """
+        interned = _intern_patterns(patterns)
+        return self._acquire(
+            ("resources", interned, regex), lambda: utils.PatternSet(interned, regex=regex), keys
+        )
+
+    def policy_matches(
+        self,
+        patterns: Iterable[str],
+        policy_names: Tuple[str, ...],
+        *,
+        keys: List[Hashable],
+        regex: bool = False,
+    ) -> utils.PatternMatches:
+        """Acquires the policies matched by a rule's policy patterns
+
+        Args:
+            patterns: Policy patterns of a rule
+            policy_names: Ordered names of the policies in scope
+            keys: List to record the acquired cache key in, for later release
+            regex: Accept `regex:<expression>` patterns, see `utils.PatternSet`
+
+        Returns:
+            Matched policies shared with any other user of the same patterns and policies
+
+        Raises:
+            re.error: when a regex pattern is invalid
+        """
+        interned = _intern_patterns(patterns)
+        return self._acquire(
+            ("policies", interned, policy_names, regex),
+            lambda: utils.match_patterns(utils.PatternSet(interned, regex=regex), policy_names),
+            keys,
+        )
+
+    def release(self, keys: Iterable[Hashable]) -> None:
+        """Releases previously acquired entries, evicting any which are no longer in use
+
+        Args:
+            keys: Keys recorded when acquiring entries
+        """
+        with self._lock:
+            for key in keys:
+                entry = self._entries[key]
+                entry.refs -= 1
+                if entry.refs == 0:
+                    del self._entries[key]
+
+    def _acquire(self, key: Hashable, factory: Callable[[], T], keys: List[Hashable]) -> T:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _CacheEntry(factory())
+            entry.refs += 1
+        keys.append(key)
+        return entry.value  # type: ignore
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _intern_patterns(patterns: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(pattern) for pattern in patterns)
+
+
+DEFAULT_CACHE = CompilationCache()
@@ -0,0 +1,152 @@
+import json
+import sqlite3
+from collections.abc import Iterator
+from types import TracebackType
+from typing import Dict, Optional, Type
+
+from . import decisions
+from .models import ExecutionPlanStep, ResourceResult, Rule
+
+DEFAULT_COMMIT_EVERY = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS results (resource_id TEXT PRIMARY KEY, result TEXT NOT NULL);
+"""
+
+
+class Checkpoint:
+    """Records evaluated resources in a SQLite database so that an interrupted evaluation can resume
+
+    Results are stored with their plan and decisions, so results of earlier runs can be recovered with
+    `results`. Every checkpoint is tied to the fingerprint of the Pylicy configuration it was created for,
+    see `Pylicy.fingerprint`.
+    """
+
+    def __init__(
+        self, path: str, fingerprint: str, *, resume: bool = True, commit_every: int = DEFAULT_COMMIT_EVERY
+    ):
+        """
+        Args:
+            path: Database file to record results in, created if it does not exist
+            fingerprint: Fingerprint of the configuration being evaluated
+            resume: Keep results already recorded in the database. Otherwise any previous results are
+                discarded and the evaluation starts over
+            commit_every: Number of results to buffer before committing them to the database
+
+        Raises:
+            ValueError: when resuming from a checkpoint recorded with a different fingerprint
+        """
+        self.commit_every = commit_every
+        self._fingerprint = fingerprint
+        self._buffer: Dict[str, str] = {}
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        if resume and row is not None and row[0] != fingerprint:
+            self._connection.close()
+            raise ValueError(f"Checkpoint {path} was recorded for a different configuration, cannot resume")
+        with self._connection:
+            if not resume:
+                self._connection.execute("DELETE FROM results")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)", (fingerprint,)
+            )
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    def record(self, result: ResourceResult) -> None:
+        """Records the result of a resource, committing buffered results once `commit_every` are pending
+
+        Args:
+            result: Result to record
+        """
+        self._buffer[result.resource_id] = json.dumps(
+            {
+                "plan": [[step.policy_name, json.loads(step.rule.json())] for step in result.plan],
+                "decisions": {
+                    name: decisions.encode(decision) for name, decision in result.decisions.items()
+                },
+                "elapsed": result.elapsed,
+            }
+        )
+        if len(self._buffer) >= self.commit_every:
+            self.flush()
+
+    def get(self, resource_id: str) -> Optional[ResourceResult]:
+        """Gets the recorded result of a resource
+
+        Args:
+            resource_id: Id of the resource
+
+        Returns:
+            The result, or None if the resource has not been evaluated
+        """
+        encoded = self._buffer.get(resource_id)
+        if encoded is None:
+            row = self._connection.execute(
+                "SELECT result FROM results WHERE resource_id = ?", (resource_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            encoded = row[0]
+        return _decode(resource_id, encoded)
+
+    def results(self) -> Iterator[ResourceResult]:
+        """Iterates over every recorded result"""
+        self.flush()
+        for resource_id, encoded in self._connection.execute("SELECT resource_id, result FROM results"):
+            yield _decode(resource_id, encoded)
+
+    def flush(self) -> None:
+        """Commits buffered results to the database"""
+        if not self._buffer:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO results (resource_id, result) VALUES (?, ?)", self._buffer.items()
+            )
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Commits buffered results and closes the database"""
+        self.flush()
+        self._connection.close()
+
+    def __contains__(self, resource_id: str) -> bool:
+        return (
+            resource_id in self._buffer
+            or self._connection.execute(
+                "SELECT 1 FROM results WHERE resource_id = ?", (resource_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def __len__(self) -> int:
+        self.flush()
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return int(count)
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def _decode(resource_id: str, encoded: str) -> ResourceResult:
+    raw = json.loads(encoded)
+    return ResourceResult(
+        resource_id=resource_id,
+        plan=[ExecutionPlanStep(policy_name=name, rule=Rule.parse_obj(rule)) for name, rule in raw["plan"]],
+        decisions={name: decisions.decode(decision) for name, decision in raw["decisions"].items()},
+        elapsed=raw["elapsed"],
+    )
@@ -0,0 +1,361 @@
+import argparse
+import array
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import importlib
+import importlib.util
+import itertools
+import json
+import multiprocessing.util
+import os.path
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, Callable, Dict, List, Optional
+
+from . import aggregate
+from . import checkpoint as checkpoint_
+from . import policy, sinks, utils
+from .models import Resource, ResourceResult
+from .pylicy import DEFAULT_CONCURRENCY, Pylicy
+
+SINKS: Dict[str, Callable[[Any], sinks.ResultSink]] = {
+    "jsonl": sinks.JSONLinesSink,
+    "csv": sinks.CSVSink,
+    "parquet": sinks.ParquetSink,
+}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class RunStats:
+    """Throughput and latency statistics of a batch evaluation"""
+
+    def __init__(self, summary: Optional[aggregate.Summary] = None) -> None:
+        self.summary_counts = summary
+        self.start = time.perf_counter()
+        self.resources = 0
+        self.decisions = 0
+        self.actions: "collections.Counter[str]" = collections.Counter()
+        self._latencies = array.array("d")
+
+    def record(self, result: ResourceResult) -> None:
+        self.resources += 1
+        self.decisions += len(result.decisions)
+        self.actions.update(decision.action.value for decision in result.decisions.values())
+        self._latencies.append(result.elapsed)
+        if self.summary_counts is not None:
+            self.summary_counts.add(result)
+
+    def percentile(self, q: float) -> float:
+        """Resource latency at quantile q, in seconds"""
+        if not self._latencies:
+            return 0.0
+        latencies = sorted(self._latencies)
+        return latencies[int(q * (len(latencies) - 1))]
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        throughput = self.resources / elapsed if elapsed > 0 else 0.0
+        actions = " ".join(f"{action}={count}" for action, count in sorted(self.actions.items()))
+        return "\n".join(
+            [
+                f"Evaluated {self.resources} resources ({self.decisions} decisions) in {elapsed:.3f}s"
+                + f" - {throughput:.1f} resources/s",
+                "Resource latency: "
+                + " ".join(
+                    f"{name}={self.percentile(q) * 1000:.2f}ms"
+                    for name, q in [("p50", 0.5), ("p95", 0.95), ("p99", 0.99), ("max", 1.0)]
+                ),
+                f"Actions: {actions or 'none'}",
+            ]
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pylicy", description="Apply policies to a batch of resources")
+    parser.add_argument("rules", nargs="+", help="Rule files (json or yaml) or glob patterns of rule files")
+    parser.add_argument(
+        "-p",
+        "--policies",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="Module name or path of a python file registering policies. May be repeated",
+    )
+    parser.add_argument("-s", "--scope", default=policy.DEFAULT_POLICY_SCOPE, help="Policy scope to apply")
+    parser.add_argument(
+        "-i",
+        "--input",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="Resource file to read, or - for stdin. May be repeated (default: stdin)",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=["auto", "json", "jsonl"],
+        default="auto",
+        help="Format of resource files. auto reads .json files as json arrays and others as json lines",
+    )
+    parser.add_argument("--id-field", default="id", help="Field of each resource object holding its id")
+    parser.add_argument(
+        "--data-field",
+        default="data",
+        help="Field of each resource object holding its data, or . for the object",
+    )
+    parser.add_argument("-o", "--output", default="-", help="File to write results to, or - for stdout")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["auto", *SINKS],
+        default="auto",
+        help="Result format. auto chooses based on the output file extension, defaulting to jsonl",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of resources evaluated at once by each worker",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="Number of resources sent to a worker process at a time",
+    )
+    parser.add_argument(
+        "--summary", metavar="FILE", help="Also write a json summary of decision counts to this file"
+    )
+    parser.add_argument(
+        "--summary-prefix",
+        metavar="SEPARATOR",
+        help="Count decisions by the first component of resource ids split on this separator",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="SQLite file recording evaluated resources. Rerunning with the same rules and policies skips"
+        + " resources already recorded in it",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="Discard results recorded in the checkpoint and start over"
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not print a summary")
+    return parser
+
+
+def load_policy_module(name: str) -> None:
+    """Imports a module so that its policies are registered
+
+    Args:
+        name: Dotted module name, or path of a python file
+    """
+    if name.endswith(".py") or os.path.sep in name:
+        module_name = f"_pylicy_policies_{os.path.splitext(os.path.basename(name))[0]}"
+        if module_name in sys.modules:
+            return
+        spec = importlib.util.spec_from_file_location(module_name, name)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load policies from {name}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    else:
+        if os.getcwd() not in sys.path:
+            sys.path.insert(0, os.getcwd())
+        importlib.import_module(name)
+
+
+def read_resources(paths: Iterable[str], input_format: str) -> Iterator[Any]:
+    """Streams raw resource objects from json or json lines files
+
+    Args:
+        paths: Files to read, - reads stdin
+        input_format: One of auto, json or jsonl
+
+    Returns:
+        An iterator of raw resource objects
+    """
+    for path in paths:
+        is_json = input_format == "json" or (input_format == "auto" and path.lower().endswith(".json"))
+        with open(path, "r") if path != "-" else open(sys.stdin.fileno(), "r", closefd=False) as f:
+            if is_json:
+                yield from utils.iter_json_array(f)
+            else:
+                yield from (json.loads(line) for line in f if line.strip())
+
+
+def to_resource(raw: Any, id_field: str, data_field: str) -> Resource:
+    """Builds a Resource from a raw resource object"""
+    if not isinstance(raw, dict) or id_field not in raw:
+        raise ValueError(f"Resource should be an object with an `{id_field}` field")
+    return Resource(id=raw[id_field], data=raw if data_field == "." else raw.get(data_field))
+
+
+def open_sink(output: str, output_format: str) -> sinks.ResultSink:
+    if output_format == "auto":
+        extension = os.path.splitext(output)[1].lstrip(".").lower()
+        output_format = extension if extension in SINKS else "jsonl"
+    if output == "-":
+        if output_format == "parquet":
+            raise ValueError("parquet results cannot be written to stdout")
+        return SINKS[output_format](sys.stdout)
+    return SINKS[output_format](output)
+
+
+_worker_engine: Optional[Pylicy] = None
+# Every chunk evaluated by a worker runs on the same loop, so that resources acquired by policies' setup
+# hooks (which may be bound to the loop, such as client sessions) are shared by the worker's chunks
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(rules: List[str], policy_modules: List[str], scope: str) -> None:
+    global _worker_engine, _worker_loop
+    for module in policy_modules:
+        load_policy_module(module)
+    engine = Pylicy.from_paths(rules, scope=scope)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(engine.__aenter__())
+    _worker_engine, _worker_loop = engine, loop
+    # Workers exit through multiprocessing, which runs its own finalizers but not atexit handlers
+    multiprocessing.util.Finalize(None, _teardown_worker, exitpriority=10)
+
+
+def _teardown_worker() -> None:
+    global _worker_engine, _worker_loop
+    if _worker_engine is None or _worker_loop is None:
+        return
+    try:
+        _worker_loop.run_until_complete(_worker_engine.__aexit__(None, None, None))
+    finally:
+        _worker_loop.close()
+        _worker_engine = _worker_loop = None
+
+
+def _evaluate_chunk(
+    raw_resources: List[Any], id_field: str, data_field: str, concurrency: int
+) -> List[ResourceResult]:
+    assert _worker_engine is not None and _worker_loop is not None
+    engine = _worker_engine
+
+    async def evaluate() -> List[ResourceResult]:
+        resources = (to_resource(raw, id_field, data_field) for raw in raw_resources)
+        return [result async for result in engine.apply_iter(resources, concurrency=concurrency)]
+
+    return _worker_loop.run_until_complete(evaluate())
+
+
+async def _evaluate(
+    engine: Pylicy,
+    resources: Iterable[Resource],
+    sink: sinks.ResultSink,
+    stats: RunStats,
+    concurrency: int,
+    checkpoint: Optional[checkpoint_.Checkpoint],
+) -> None:
+    async with engine:
+        async for result in engine.apply_iter(resources, concurrency=concurrency, checkpoint=checkpoint):
+            stats.record(result)
+            sink.write(result)
+            if sink.pending >= sink.buffer_size:
+                await asyncio.to_thread(sink.flush)
+
+
+def _evaluate_in_workers(
+    args: argparse.Namespace,
+    raw_resources: Iterator[Any],
+    sink: sinks.ResultSink,
+    stats: RunStats,
+    checkpoint: Optional[checkpoint_.Checkpoint],
+) -> None:
+    def write(future: "concurrent.futures.Future[List[ResourceResult]]") -> None:
+        for result in future.result():
+            stats.record(result)
+            sink.write(result)
+            if checkpoint is not None:
+                checkpoint.record(result)
+        if sink.pending >= sink.buffer_size:
+            sink.flush()
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.rules, args.policies, args.scope),
+    ) as executor:
+        if checkpoint is not None:
+            recorded = checkpoint
+            raw_resources = (
+                raw
+                for raw in raw_resources
+                if not (isinstance(raw, dict) and str(raw.get(args.id_field)) in recorded)
+            )
+        pending: set["concurrent.futures.Future[List[ResourceResult]]"] = set()
+        while chunk := list(itertools.islice(raw_resources, args.chunk_size)):
+            # Bound the number of chunks held in memory while keeping every worker busy
+            if len(pending) >= args.workers * 2:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    write(future)
+            pending.add(
+                executor.submit(_evaluate_chunk, chunk, args.id_field, args.data_field, args.concurrency)
+            )
+        for future in concurrent.futures.as_completed(pending):
+            write(future)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the pylicy command-line batch evaluator
+
+    Args:
+        argv: Command-line arguments, defaults to sys.argv
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.concurrency < 1 or args.chunk_size < 1:
+        parser.error("--workers, --concurrency and --chunk-size should be at least 1")
+
+    for module in args.policies:
+        load_policy_module(module)
+    engine = Pylicy.from_paths(args.rules, scope=args.scope)
+
+    raw_resources = read_resources(args.input or ["-"], args.input_format)
+    stats = RunStats(
+        aggregate.Summary(
+            prefix=aggregate.split_prefix(args.summary_prefix) if args.summary_prefix else None
+        )
+        if args.summary
+        else None
+    )
+    checkpoint = None
+    if args.checkpoint:
+        try:
+            checkpoint = checkpoint_.Checkpoint(
+                args.checkpoint, engine.fingerprint, resume=not args.restart
+            )
+        except ValueError as e:
+            parser.error(f"{e} - use --restart to discard it")
+    with open_sink(args.output, args.format) as sink, (
+        checkpoint if checkpoint is not None else contextlib.nullcontext()
+    ):
+        if args.workers == 1:
+            resources = (to_resource(raw, args.id_field, args.data_field) for raw in raw_resources)
+            asyncio.run(_evaluate(engine, resources, sink, stats, args.concurrency, checkpoint))
+        else:
+            _evaluate_in_workers(args, raw_resources, sink, stats, checkpoint)
+
+    if stats.summary_counts is not None:
+        with open(args.summary, "w") as f:
+            json.dump(stats.summary_counts.to_dict(), f, indent=2)
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 0
@@ -0,0 +1,208 @@
+import json
+from collections.abc import Hashable
+from typing import Any, Dict, List, NoReturn, Tuple
+
+from pydantic.json import pydantic_encoder
+
+from .models import JSON, PolicyDecision, PolicyDecisionAction
+
+DEFAULT_CACHE_SIZE = 65536
+
+
+class _ReadOnlyDict(Dict[str, Any]):
+    """Detail object of a shared decision, raising TypeError if modified
+
+    Still a dict, so that it compares equal to and is serialized like the detail it was copied from.
+    """
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Shared decisions cannot be modified")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (dict(self),))
+
+
+class _ReadOnlyList(List[Any]):
+    """Detail array of a shared decision, raising TypeError if modified"""
+
+    _read_only = _ReadOnlyDict._read_only
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (list(self),))
+
+
+class _SharedDecision(PolicyDecision):
+    """Decision shared between many results, and so immutable, including its detail"""
+
+    class Config:
+        allow_mutation = False
+
+    def __repr_name__(self) -> str:
+        return PolicyDecision.__name__
+
+
+# Prebuilt decision which checkers can return instead of constructing a new one for every resource
+ALLOW: PolicyDecision = _SharedDecision(action=PolicyDecisionAction.ALLOW)
+
+
+class DecisionCache:
+    """Flyweight cache sharing a single immutable instance between equal decisions
+
+    Decisions are equal when their action, reason and detail are equal. Decisions with a detail which
+    cannot be compared cheaply (anything but JSON values) are not shared, but are still copied with their
+    reason interned. Decisions passed to the cache are never modified.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            max_size: Number of distinct decisions and reasons to keep, the cache is cleared once exceeded
+
+        Raises:
+            ValueError: when max_size is not positive
+        """
+        if max_size < 1:
+            raise ValueError("max_size should be at least 1")
+        self.max_size = max_size
+        self._decisions: Dict[Tuple[PolicyDecisionAction, object, Hashable], PolicyDecision] = {}
+        self._reasons: Dict[str, str] = {}
+        self._seed()
+
+    def __len__(self) -> int:
+        return len(self._decisions)
+
+    def compact(self, decision: PolicyDecision) -> PolicyDecision:
+        """Gets the shared instance of a decision
+
+        Args:
+            decision: Decision produced by a policy
+
+        Returns:
+            An immutable decision equal to `decision`, shared with every other equal decision. A copy with
+            an interned reason if the decision cannot be shared
+        """
+        if isinstance(decision, _SharedDecision):
+            return decision
+        try:
+            key = (decision.action, decision.reason, _freeze(decision.detail))
+        except TypeError:
+            if decision.reason is None or self.intern(decision.reason) is decision.reason:
+                return decision
+            return decision.copy(update={"reason": self.intern(decision.reason)})
+
+        shared = self._decisions.get(key)
+        if shared is None:
+            if len(self._decisions) >= self.max_size:
+                self._decisions.clear()
+                self._seed()
+            reason = decision.reason if decision.reason is None else self.intern(decision.reason)
+            # The detail is copied, so that neither the policy nor users of the result can change it
+            shared = self._decisions[key] = _SharedDecision.construct(
+                action=decision.action, reason=reason, detail=_read_only(decision.detail)
+            )
+        return shared
+
+    def intern(self, reason: str) -> str:
+        """Gets the shared instance of a reason
+
+        Args:
+            reason: Reason of a decision
+
+        Returns:
+            A string equal to `reason`, shared with every other equal reason interned by this cache
+        """
+        interned = self._reasons.get(reason)
+        if interned is None:
+            if len(self._reasons) >= self.max_size:
+                self._reasons.clear()
+            interned = self._reasons[reason] = reason
+        return interned
+
+    def _seed(self) -> None:
+        self._decisions[(ALLOW.action, None, _freeze(None))] = ALLOW
+
+
+def encode(decision: PolicyDecision) -> Dict[str, JSON]:
+    """Converts a decision to JSON values, as written by checkpoints, result stores and sinks
+
+    Args:
+        decision: Decision to encode
+
+    Returns:
+        The decision's action value, reason and detail. The detail is encoded as pydantic would, so that
+        values the json module cannot serialize, such as datetimes, are converted
+
+    Raises:
+        TypeError: when the detail holds a value pydantic cannot encode
+    """
+    return {
+        "action": decision.action.value,
+        "reason": decision.reason,
+        "detail": encode_detail(decision.detail),
+    }
+
+
+def decode(encoded: JSON) -> PolicyDecision:
+    """Converts JSON values produced by `encode` back to a decision
+
+    Args:
+        encoded: Encoded decision
+
+    Returns:
+        A decision equal to the encoded one, with any detail values converted by `encode` left converted
+    """
+    return PolicyDecision.parse_obj(encoded)
+
+
+def encode_detail(detail: Any) -> JSON:
+    """Converts the detail of a decision to JSON values, see `encode`
+
+    Args:
+        detail: Detail to encode
+
+    Returns:
+        The detail as `json.loads(json.dumps(detail, default=pydantic_encoder))` would produce it
+
+    Raises:
+        TypeError: when the detail holds a value pydantic cannot encode
+    """
+    if detail is None or isinstance(detail, (str, int, float)):
+        return detail
+    if isinstance(detail, dict):
+        return {
+            key if isinstance(key, str) else json.dumps(key): encode_detail(item)
+            for key, item in detail.items()
+        }
+    if isinstance(detail, (list, tuple)):
+        return [encode_detail(item) for item in detail]
+    return encode_detail(pydantic_encoder(detail))
+
+
+def _read_only(value: JSON) -> JSON:
+    """Deeply copies a JSON value, with dicts and lists which raise TypeError if modified"""
+    if isinstance(value, dict):
+        return _ReadOnlyDict((key, _read_only(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _ReadOnlyList(_read_only(item) for item in value)
+    return value
+
+
+def _freeze(value: JSON) -> Hashable:
+    """Converts a JSON value to a hashable key, tagged with types so that e.g. 1, 1.0 and True differ
+
+    Raises:
+        TypeError: when the value is not made of JSON types
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    if isinstance(value, list):
+        return (list, tuple(_freeze(item) for item in value))
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return (type(value), value)
+    raise TypeError(f"Cannot freeze {type(value).__name__}")
@@ -0,0 +1,172 @@
+import asyncio
+import collections
+import contextlib
+import time
+from collections.abc import AsyncIterator
+from typing import AsyncContextManager, Deque, Optional
+
+
+class RateLimit:
+    """Token bucket limiting how often executions of a policy may start
+
+    Tokens are reserved in the order executions arrive, so waiting executions start in order once their
+    token becomes available.
+    """
+
+    def __init__(self, rate: float, *, burst: int = 1):
+        """
+        Args:
+            rate: Sustained number of executions allowed per second
+            burst: Number of executions allowed to start at once after a period of inactivity
+
+        Raises:
+            ValueError: when rate is not positive or burst is less than 1
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate limits need a positive rate and a burst of at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Waits until an execution may start"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return
+
+        try:
+            await asyncio.sleep(-self._tokens / self.rate)
+        except asyncio.CancelledError:
+            self._tokens += 1
+            raise
+
+
+class AdaptiveConcurrency:
+    """Limits concurrent executions of a policy, adapting the limit to how the backend copes
+
+    The limit grows by one for every limit's worth of successful executions and shrinks multiplicatively
+    when an execution fails or is slower than the latency target (additive increase, multiplicative
+    decrease).
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 256,
+        latency_target: Optional[float] = None,
+        backoff: float = 0.5,
+    ):
+        """
+        Args:
+            initial: Concurrency limit to start with
+            minimum: Lowest the limit can be reduced to
+            maximum: Highest the limit can be increased to
+            latency_target: Seconds above which an execution is considered a sign of an overloaded backend,
+                by default only failures reduce the limit
+            backoff: Factor the limit is multiplied by when reduced
+
+        Raises:
+            ValueError: when the limits are not ordered or the backoff is not between 0 and 1
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Concurrency limits should satisfy 1 <= minimum <= initial <= maximum")
+        if not 0 < backoff < 1:
+            raise ValueError("Concurrency backoff should be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = collections.deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """Waits for a free execution slot, which must be returned with `release`"""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not waiter.cancelled():
+                # A slot was handed over just as the wait was cancelled, pass it on
+                self.release()
+            raise
+
+    def release(self, latency: Optional[float] = None, *, failed: bool = False) -> None:
+        """Returns an execution slot, adapting the limit to the outcome of the execution
+
+        Args:
+            latency: Seconds the execution took, or None if it never ran
+            failed: Whether the execution raised an error
+        """
+        if failed or (
+            latency is not None and self.latency_target is not None and latency > self.latency_target
+        ):
+            self._limit = max(self.minimum, self._limit * self.backoff)
+        elif latency is not None:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
+
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+
+@contextlib.asynccontextmanager
+async def limited(
+    rate_limit: Optional[RateLimit],
+    concurrency: Optional[AdaptiveConcurrency],
+    *,
+    admission: Optional[AsyncContextManager[None]] = None,
+) -> AsyncIterator[None]:
+    """Holds a concurrency slot and rate limit token for the duration of a single execution
+
+    Args:
+        rate_limit: Rate limit to take a token from
+        concurrency: Concurrency limit to take a slot from, adapted to the latency and outcome of the
+            execution
+        admission: Context entered only once the slot and token have been acquired, such as a scheduler's
+            slot, so that it is not held while waiting for the limits. Its wait is not counted as latency
+    """
+    if concurrency is not None:
+        await concurrency.acquire()
+
+    latency: Optional[float] = None
+    failed = False
+    try:
+        if rate_limit is not None:
+            await rate_limit.acquire()
+        async with contextlib.AsyncExitStack() as stack:
+            if admission is not None:
+                await stack.enter_async_context(admission)
+            start = time.monotonic()
+            try:
+                yield
+            except Exception:
+                failed = True
+                raise
+            finally:
+                latency = time.monotonic() - start
+    finally:
+        if concurrency is not None:
+            concurrency.release(latency, failed=failed)
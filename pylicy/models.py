@@ -1,8 +1,8 @@
 import enum
 from collections.abc import Awaitable
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, FrozenSet, List, NamedTuple, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # @ref https://github.com/python/typing/issues/182
 JSON = Union[str, int, float, bool, None, Dict[str, Any], List[Any]]
@@ -13,6 +13,12 @@ TResourceIdentifier = str
 
 
 PolicyChecker = Callable[["Resource", "Rule"], Awaitable["PolicyDecision"]]
+PreparedPolicyChecker = Callable[["Resource", "Rule", Any], Awaitable["PolicyDecision"]]
+SyncPolicyChecker = Callable[["Resource", "Rule"], "PolicyDecision"]
+AnyPolicyChecker = Union[PolicyChecker, PreparedPolicyChecker, SyncPolicyChecker]
+RulePreparer = Callable[["Rule"], Any]
+# Fetches the data of a resource given its id and the fields needed, or None if all of its data is needed
+ResourceLoader = Callable[[str, Optional[FrozenSet[str]]], Awaitable[Any]]
 
 
 class PolicyDecisionAction(enum.Enum):
@@ -22,11 +28,13 @@ class PolicyDecisionAction(enum.Enum):
         ALLOW: Resource passes policy
         WARN: Resource passes policy but a warning should be raised
         DENY: Resource does not pass policy
+        ERROR: Policy failed to check the resource, only produced when errors are isolated
     """
 
     ALLOW = "allow"
     WARN = "warn"
     DENY = "deny"
+    ERROR = "error"
 
 
 class PolicyDecision(BaseModel):
@@ -49,10 +57,13 @@ class Resource(BaseModel):
     Fields:
         id: Matchable string identifier for resource
         data: Resource data
+        loader: Fetches the resource data only once a policy is to be applied to the resource, replacing
+            `data`. Called with the resource id and the fields needed by the planned policies
     """
 
     id: TResourceIdentifier
     data: Any
+    loader: Optional[ResourceLoader] = Field(default=None, repr=False)
 
     class Config:
         allow_mutation = False
@@ -97,3 +108,46 @@ class Rule(BaseModel):
     policy_patterns: List[str]
 
     context: Optional[JSON] = None
+
+
+class ExecutionPlanStep(NamedTuple):
+    policy_name: str
+    rule: Rule
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"{self.rule.name}:{self.policy_name}"
+
+
+ExecutionPlan = List[ExecutionPlanStep]
+
+
+class ResourceResult(NamedTuple):
+    """Outcome of applying policies to a single resource
+
+    Fields:
+        resource_id: Identifier of the resource
+        plan: Steps which were executed, recording the rule each policy was applied from
+        decisions: Mapping of policy names to policy decisions
+        elapsed: Wall time in seconds taken to plan and evaluate the resource
+    """
+
+    resource_id: TResourceIdentifier
+    plan: ExecutionPlan
+    decisions: Dict[str, PolicyDecision]
+    elapsed: float = 0.0
+
+
+class PlanExplanation(NamedTuple):
+    """How policies would be applied to a resource
+
+    Fields:
+        resource_id: Identifier of the resource
+        effective_rules: Rules matching the resource, in order of non-decreasing weight
+        plan: Policies which would be executed and the rule each would be applied from
+        excluded: Policies excluded from the resource by a `!` pattern, and the rule which excluded them
+    """
+
+    resource_id: TResourceIdentifier
+    effective_rules: List[Rule]
+    plan: ExecutionPlan
+    excluded: Dict[str, Rule]
@@ -0,0 +1,173 @@
+import asyncio
+import contextlib
+from typing import Any, Dict, FrozenSet, List, NoReturn, Optional, Union
+
+from . import scheduling
+from .models import (
+    ExecutionPlan,
+    PolicyDecision,
+    Resource,
+    ResourceLoader,
+    Rule,
+    UserRule,
+)
+from .pylicy import DuplicateResources, Pylicy, deduplicate_resources
+
+
+def _failed_loader(error: Exception) -> ResourceLoader:
+    """Creates a loader raising the error of a load which already failed"""
+
+    async def load(resource_id: str, fields: Optional[FrozenSet[str]]) -> NoReturn:
+        raise error
+
+    return load
+
+
+class MultiScopePylicy:
+    """Applies several policy scopes to resources in a single pass
+
+    Each resource is planned once per scope and the steps of every scope are scheduled together, so an
+    inventory is only traversed once regardless of the number of scopes.
+    """
+
+    def __init__(self, engines: Dict[str, Pylicy]):
+        """
+        Args:
+            engines: Mapping of scope names to the Pylicy object evaluating that scope
+        """
+        self._engines = engines.copy()
+        self._exit_stack = contextlib.AsyncExitStack()
+
+    async def __aenter__(self) -> "MultiScopePylicy":
+        """Sets up the policies of every scope, see `Pylicy.__aenter__`"""
+        async with contextlib.AsyncExitStack() as stack:
+            for engine in self._engines.values():
+                await stack.enter_async_context(engine)
+            self._exit_stack = stack.pop_all()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Tears down the policies of every scope"""
+        await self._exit_stack.aclose()
+
+    @property
+    def engines(self) -> Dict[str, Pylicy]:
+        return self._engines.copy()
+
+    async def apply(
+        self,
+        resource: Resource,
+        *,
+        priority: int = scheduling.Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, PolicyDecision]]:
+        """Applies relevant policies of every scope to a resource
+
+        Args:
+            resource: Resource to apply policies to
+            priority: Priority of the evaluation's policy executions, see `Pylicy.apply`
+            timeout: Seconds by which every policy execution must be admitted, see `Pylicy.apply`
+
+        Returns:
+            A mapping of scope -> {policy_name -> policy_decision}
+
+        Raises:
+            TypeError: when resource isn't a Resource
+            TimeoutError: when a policy execution is not admitted by a scheduler before the timeout
+        """
+
+        if not isinstance(resource, Resource):
+            raise TypeError("resource should be a pylicy.Resource type")
+
+        return await self._apply(resource, scheduling.Request.create(priority, timeout))
+
+    async def _apply(
+        self, resource: Resource, request: scheduling.Request
+    ) -> Dict[str, Dict[str, PolicyDecision]]:
+        plans = {scope: engine.plan(resource.id) for scope, engine in self._engines.items()}
+        if resource.loader is not None and any(plans.values()):
+            resource = await self._load(resource, plans)
+        return dict(
+            zip(
+                self._engines.keys(),
+                await asyncio.gather(
+                    *[
+                        engine.apply_plan(resource, plans[scope], request=request)
+                        for scope, engine in self._engines.items()
+                    ]
+                ),
+            )
+        )
+
+    async def _load(self, resource: Resource, plans: Dict[str, ExecutionPlan]) -> Resource:
+        """Fetches the data of a lazily loaded resource once, with the fields needed by every scope's plan
+
+        A failed load is passed on to every scope, so that each handles it as it would its own load.
+        """
+        assert resource.loader is not None
+        fields: Optional[FrozenSet[str]] = frozenset()
+        for scope, plan in plans.items():
+            if plan:
+                scope_fields = self._engines[scope].fields(plan)
+                fields = None if fields is None or scope_fields is None else fields | scope_fields
+        try:
+            data = await resource.loader(resource.id, fields)
+        except Exception as e:
+            return resource.copy(update={"loader": _failed_loader(e)})
+        return resource.copy(update={"data": data, "loader": None})
+
+    async def apply_all(
+        self,
+        resources: List[Resource],
+        *,
+        duplicates: DuplicateResources = "last",
+        priority: int = scheduling.Priority.BATCH,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, Dict[str, PolicyDecision]]]:
+        """Applies relevant policies of every scope to a list of resources
+
+        Args:
+            resources: resources to apply policies to
+            duplicates: Which resource to evaluate when several share an id. See `Pylicy.apply_all`
+            priority: Priority of the policy executions, see `Pylicy.apply_all`
+            timeout: Seconds by which every policy execution must be admitted, see `Pylicy.apply_all`
+
+        Returns:
+            A mapping of scope -> {resource -> {policy_name -> policy_decision}}
+
+        Raises:
+            TypeError: when resource isn't a list
+            ValueError: when `duplicates` is `error` and resource ids are not unique
+            TimeoutError: when a policy execution is not admitted by a scheduler before the timeout
+        """
+
+        if not isinstance(resources, list):
+            raise TypeError(
+                "Did not get expected list of resources - use .apply(resource) for singular resources"
+            )
+
+        resources = deduplicate_resources(resources, duplicates)
+        request = scheduling.Request.create(priority, timeout)
+
+        results: Dict[str, Dict[str, Dict[str, PolicyDecision]]] = {scope: {} for scope in self._engines}
+        for resource, scoped_decisions in zip(
+            resources, await asyncio.gather(*[self._apply(resource, request) for resource in resources])
+        ):
+            for scope, decisions in scoped_decisions.items():
+                results[scope][resource.id] = decisions
+        return results
+
+    # === Factories === #
+
+    @classmethod
+    def from_rules(cls, rules: List[Union[Rule, UserRule]], *, scopes: List[str]) -> "MultiScopePylicy":
+        """Loads a MultiScopePylicy object applying the same rules to several scopes
+
+        Args:
+            rules: List of pylicy rules
+            scopes: policy scopes to load for
+
+        Returns:
+            A MultiScopePylicy object evaluating every scope
+        """
+        return cls({scope: Pylicy.from_rules(rules, scope=scope) for scope in scopes})
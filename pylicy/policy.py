@@ -1,18 +1,47 @@
 import abc
+import asyncio
 import collections
 import inspect
 from collections.abc import Callable
-from typing import Dict
-
-from .models import PolicyChecker, PolicyDecision, Resource, Rule
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Tuple, TypeVar, cast
+
+from . import limits
+from . import retry as retry_
+from .models import (
+    AnyPolicyChecker,
+    PolicyChecker,
+    PolicyDecision,
+    PreparedPolicyChecker,
+    Resource,
+    Rule,
+    RulePreparer,
+    SyncPolicyChecker,
+)
 
 DEFAULT_POLICY_SCOPE = "default"
 
+TChecker = TypeVar("TChecker", PolicyChecker, PreparedPolicyChecker, SyncPolicyChecker)
+
 
 policies: Dict[str, Dict[str, PolicyChecker]] = collections.defaultdict(dict)
 policies[DEFAULT_POLICY_SCOPE] = {}
 
 
+class PolicyOptions(NamedTuple):
+    """Options a policy was registered with, see `register_policy`"""
+
+    prepare: Optional[RulePreparer] = None
+    rate_limit: Optional[limits.RateLimit] = None
+    concurrency: Optional[limits.AdaptiveConcurrency] = None
+    retry: Optional[retry_.Retry] = None
+    fields: Optional[FrozenSet[str]] = None
+    sync: bool = False
+
+
+# Options of each registered policy, by scope then policy name, along with the policy registered
+_options: Dict[str, Dict[str, Tuple[AnyPolicyChecker, PolicyOptions]]] = collections.defaultdict(dict)
+
+
 def get_policies(scope: str = DEFAULT_POLICY_SCOPE) -> Dict[str, PolicyChecker]:
     """Gets a list of policies
 
@@ -32,16 +61,61 @@ def get_policies(scope: str = DEFAULT_POLICY_SCOPE) -> Dict[str, PolicyChecker]:
     return policies[scope].copy()
 
 
-def register_policy(name: str, policy: PolicyChecker, *, scope: str = DEFAULT_POLICY_SCOPE) -> None:
+def get_options(name: str, scope: str = DEFAULT_POLICY_SCOPE) -> PolicyOptions:
+    """Gets the options a policy was registered with
+
+    Args:
+        name: Name of the policy
+        scope: The scope or namespace the policy was registered into
+
+    Returns:
+        The policy's options, combining those passed to `register_policy` with those declared by the policy.
+        Policies placed in `policies` directly rather than registered only have the options they declare
+
+    Raises:
+        KeyError: when the policy is not in the scope
+    """
+    checker = policies.get(scope, {})[name]
+    registered = _options.get(scope, {}).get(name)
+    if registered is not None and registered[0] is checker:
+        return registered[1]
+    return get_declared_options(checker)
+
+
+def register_policy(
+    name: str,
+    policy: AnyPolicyChecker,
+    *,
+    scope: str = DEFAULT_POLICY_SCOPE,
+    prepare: Optional[RulePreparer] = None,
+    rate_limit: Optional[limits.RateLimit] = None,
+    concurrency: Optional[limits.AdaptiveConcurrency] = None,
+    retry: Optional[retry_.Retry] = None,
+    fields: Optional[Iterable[str]] = None,
+    sync: bool = False,
+) -> None:
     """Registers a policy
 
     Args:
         name: Name of the policy
         policy: The policy callable to register
         scope: The scope or namespace the policy should be registered into
+        prepare: Precomputes a value from each rule applying the policy, passed to the policy as a third
+            argument. Defaults to the policy's `prepare` attribute
+        rate_limit: Limits how often the policy is executed. Defaults to the policy's `rate_limit` attribute
+        concurrency: Limits how many executions of the policy run at once. Defaults to the policy's
+            `concurrency` attribute
+        retry: Retries failed executions of the policy. Defaults to the policy's `retry` attribute
+        fields: Fields of the resource data read by the policy, so that lazily loaded resources only fetch
+            those fields. Defaults to the policy's `fields` attribute
+        sync: Register a plain function returning a decision, usable with `Pylicy.apply_sync`. Defaults to
+            the policy's `sync` attribute
+
+    The options are kept with the registration, see `get_options`, rather than on the policy itself.
 
     Raises:
-        RuntimeWarning: Upon a conflicting duplicate class registration
+        RuntimeWarning: Upon a conflicting duplicate class registration, or a synchronous function
+            registered without `sync`
         TypeError: When the policy is malformed
     """
     if not callable(policy):
@@ -49,23 +123,146 @@ def register_policy(name: str, policy: PolicyChecker, *, scope: str = DEFAULT_PO
     if name in policies.get(scope, []):  # Do not touch a scope in-case something else goes wrong later
         raise RuntimeWarning(f"Policy {name} has already been registered to scope {scope}, ignoring")
 
-    if not isinstance(policy, BasePolicy) and not inspect.iscoroutinefunction(policy):
+    if sync or (isinstance(policy, BasePolicy) and policy.sync):
+        if inspect.iscoroutinefunction(policy) or inspect.iscoroutinefunction(getattr(policy, "__call__")):
+            raise TypeError(f"Cannot register coroutine function as synchronous checker for policy {name}")
+    elif not isinstance(policy, BasePolicy) and not inspect.iscoroutinefunction(policy):
         raise RuntimeWarning(
             f"Cannot register synchronus checker for policy {name} - use a coroutine function instead"
         )
 
-    policies[scope][name] = policy
+    if prepare is not None and not callable(prepare):
+        raise TypeError("Cannot register a non-callable as a policy's prepare hook")
+
+    declared = get_declared_options(policy)
+    policies[scope][name] = cast(PolicyChecker, policy)
+    _options[scope][name] = (
+        policy,
+        PolicyOptions(
+            prepare=prepare if prepare is not None else declared.prepare,
+            rate_limit=rate_limit if rate_limit is not None else declared.rate_limit,
+            concurrency=concurrency if concurrency is not None else declared.concurrency,
+            retry=retry if retry is not None else declared.retry,
+            fields=frozenset(fields) if fields is not None else declared.fields,
+            sync=sync or declared.sync,
+        ),
+    )
+
+
+def get_declared_options(policy: AnyPolicyChecker) -> PolicyOptions:
+    """Gets the options declared as attributes of a policy, see `register_policy`
+
+    Args:
+        policy: The policy callable
+
+    Returns:
+        The options the policy declares, with defaults for any it does not
+    """
+    rate_limit, concurrency = get_limits(policy)
+    return PolicyOptions(
+        prepare=get_preparer(policy),
+        rate_limit=rate_limit,
+        concurrency=concurrency,
+        retry=get_retry(policy),
+        fields=get_fields(policy),
+        sync=is_sync(policy),
+    )
+
+
+def get_preparer(policy: AnyPolicyChecker) -> Optional[RulePreparer]:
+    """Gets the hook precomputing a value from each rule declared by a policy, if it has one
+
+    Args:
+        policy: The policy callable
+
+    Returns:
+        The policy's `prepare` callable, or None if the policy does not prepare rules
+    """
+    prepare = getattr(policy, "prepare", None)
+    return prepare if callable(prepare) else None
+
+
+def get_limits(
+    policy: AnyPolicyChecker,
+) -> Tuple[Optional[limits.RateLimit], Optional[limits.AdaptiveConcurrency]]:
+    """Gets the limits declared on a policy
+
+    Args:
+        policy: The policy callable
+
+    Returns:
+        The policy's rate limit and concurrency limit, either of which may be None
+    """
+    rate_limit = getattr(policy, "rate_limit", None)
+    concurrency = getattr(policy, "concurrency", None)
+    return (
+        rate_limit if isinstance(rate_limit, limits.RateLimit) else None,
+        concurrency if isinstance(concurrency, limits.AdaptiveConcurrency) else None,
+    )
+
+
+def get_retry(policy: AnyPolicyChecker) -> Optional[retry_.Retry]:
+    """Gets the retry declared on a policy
+
+    Args:
+        policy: The policy callable
+
+    Returns:
+        The policy's retry, or None if failed executions should not be retried
+    """
+    retry = getattr(policy, "retry", None)
+    return retry if isinstance(retry, retry_.Retry) else None
+
+
+def get_fields(policy: AnyPolicyChecker) -> Optional[FrozenSet[str]]:
+    """Gets the fields of resource data declared as read by a policy
+
+    Args:
+        policy: The policy callable
+
+    Returns:
+        The fields the policy reads, or None if the policy may read all of a resource's data
+    """
+    fields = getattr(policy, "fields", None)
+    return frozenset(fields) if fields is not None else None
+
+
+def is_sync(policy: AnyPolicyChecker) -> bool:
+    """Checks whether a policy declares itself a synchronous checker, see `register_policy`
+
+    Args:
+        policy: The policy callable
+
+    Returns:
+        Whether calling the policy returns a decision rather than an awaitable
+    """
+    return getattr(policy, "sync", False) is True
 
 
 def policy_checker(
-    policy_name: str, *, scope: str = DEFAULT_POLICY_SCOPE
-) -> Callable[[PolicyChecker], PolicyChecker]:
+    policy_name: str,
+    *,
+    scope: str = DEFAULT_POLICY_SCOPE,
+    prepare: Optional[RulePreparer] = None,
+    rate_limit: Optional[limits.RateLimit] = None,
+    concurrency: Optional[limits.AdaptiveConcurrency] = None,
+    retry: Optional[retry_.Retry] = None,
+    fields: Optional[Iterable[str]] = None,
+    sync: bool = False,
+) -> Callable[[TChecker], TChecker]:
     """A function decorator to register a function under a name
 
     Arg:
         fn: Function to decorate
         policy_name: Name of the policy
         scope: The scope or namespace the policy should be registered into
+        prepare: Precomputes a value from each rule applying the policy, passed to the function as a third
+            argument
+        rate_limit: Limits how often the function is executed
+        concurrency: Limits how many executions of the function run at once
+        retry: Retries failed executions of the function
+        fields: Fields of the resource data read by the function
+        sync: Register a plain function returning a decision, usable with `Pylicy.apply_sync`
 
     Returns:
         A decorator to wrap a function
@@ -79,17 +276,122 @@ def policy_checker(
     if callable(policy_name):
         raise TypeError("policy decorator should be called (i.e. @policy('name'))")
 
-    def decorator(fn: PolicyChecker) -> PolicyChecker:
-        register_policy(policy_name, fn, scope=scope)
+    def decorator(fn: TChecker) -> TChecker:
+        register_policy(
+            policy_name,
+            fn,
+            scope=scope,
+            prepare=prepare,
+            rate_limit=rate_limit,
+            concurrency=concurrency,
+            retry=retry,
+            fields=fields,
+            sync=sync,
+        )
         return fn
 
     return decorator
 
 
+class _Lifecycle:
+    """Tracks a policy's setup shared by every concurrent user of the policy"""
+
+    __slots__ = ("ready", "users")
+
+    def __init__(self, ready: "asyncio.Future[None]"):
+        self.ready = ready
+        self.users = 0
+
+
+_lifecycles: Dict[int, _Lifecycle] = {}
+
+
+async def setup_policy(policy: PolicyChecker) -> None:
+    """Runs a policy's `setup` hook if it has one
+
+    Policies are shared by every Pylicy in their scope, so the hook only runs for the first user of a policy
+    and later users wait for it to complete. Every successful call should be paired with `teardown_policy`.
+
+    Args:
+        policy: The policy callable
+
+    Raises:
+        Exception: any error raised by the setup hook
+    """
+    setup = getattr(policy, "setup", None)
+    if not callable(setup):
+        return
+
+    lifecycle = _lifecycles.get(id(policy))
+    if lifecycle is None:
+        lifecycle = _lifecycles[id(policy)] = _Lifecycle(asyncio.ensure_future(setup()))
+    lifecycle.users += 1
+    try:
+        await asyncio.shield(lifecycle.ready)
+    except BaseException:
+        if _release(policy, lifecycle):
+            if not lifecycle.ready.done():
+                lifecycle.ready.cancel()
+            elif not lifecycle.ready.cancelled() and lifecycle.ready.exception() is None:
+                await _teardown(policy)
+        raise
+
+
+async def teardown_policy(policy: PolicyChecker) -> None:
+    """Runs a policy's `teardown` hook once its last user is done with it
+
+    Args:
+        policy: The policy callable, previously set up with `setup_policy`
+
+    Raises:
+        Exception: any error raised by the teardown hook
+    """
+    lifecycle = _lifecycles.get(id(policy))
+    if lifecycle is not None and _release(policy, lifecycle):
+        await _teardown(policy)
+
+
+def _release(policy: PolicyChecker, lifecycle: _Lifecycle) -> bool:
+    lifecycle.users -= 1
+    if lifecycle.users > 0:
+        return False
+    del _lifecycles[id(policy)]
+    return True
+
+
+async def _teardown(policy: PolicyChecker) -> None:
+    teardown = getattr(policy, "teardown", None)
+    if callable(teardown):
+        await teardown()
+
+
 class BasePolicy(abc.ABC):
-    """Abstract base policy class defining common interfaces for policies"""
+    """Abstract base policy class defining common interfaces for policies
+
+    Policies may also define a `prepare(rule)` method, called once for each rule applying the policy when
+    a `Pylicy` is constructed. Its result is passed to `__call__` as a third argument, so that parsing a
+    rule's context is not repeated for every resource.
+    """
 
     name: str
+    # Limits shared by every execution of the policy, enforced by Pylicy
+    rate_limit: Optional[limits.RateLimit] = None
+    concurrency: Optional[limits.AdaptiveConcurrency] = None
+    retry: Optional[retry_.Retry] = None
+    # Fields of the resource data read by the policy, None if it may read all of it
+    fields: Optional[FrozenSet[str]] = None
+    # Whether __call__ is a plain method returning a decision, usable with Pylicy.apply_sync
+    sync: bool = False
+
+    async def setup(self) -> None:
+        """Acquires any resources shared between checks, such as clients or connection pools
+
+        Called when a `Pylicy` using the policy is entered with `async with`, only once however many are
+        entered at a time.
+        """
+
+    async def teardown(self) -> None:
+        """Releases resources acquired by `setup`, once the last `Pylicy` using the policy has exited"""
 
     @abc.abstractmethod
     async def __call__(self, resource: Resource, rule: Rule) -> PolicyDecision:
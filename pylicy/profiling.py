@@ -0,0 +1,221 @@
+import contextlib
+import contextvars
+import json
+import os
+import time
+from collections.abc import Awaitable, Generator, Iterator
+from typing import Any, Dict, List, Literal, NamedTuple, Optional, Tuple, TypeVar
+
+from .models import JSON
+
+T = TypeVar("T")
+
+Stack = Tuple[str, ...]
+
+
+class PhaseTotals(NamedTuple):
+    """Accumulated time spent in a phase
+
+    Fields:
+        calls: Number of times the phase was entered
+        wall: Total wall time in seconds, including time spent waiting on other tasks or I/O
+        cpu: Total CPU time in seconds, only counting time the phase itself was running
+    """
+
+    calls: int
+    wall: float
+    cpu: float
+
+
+class _TimedAwaitable:
+    """Wraps an awaitable, measuring the CPU time of only the steps it runs on the event loop
+
+    Checkers interleave on the event loop, so timing a checker from start to finish would also attribute the
+    time spent running every other checker to it.
+    """
+
+    def __init__(self, awaitable: Awaitable[T]):
+        self._awaitable = awaitable
+        self.cpu = 0.0
+        self.waited = 0.0
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        iterator = self._awaitable.__await__()
+        send: Any = None
+        throw: Optional[BaseException] = None
+        while True:
+            start = time.thread_time()
+            try:
+                yielded = iterator.throw(throw) if throw is not None else iterator.send(send)
+            except StopIteration as e:
+                return e.value
+            finally:
+                self.cpu += time.thread_time() - start
+
+            try:
+                send, throw = (yield yielded), None
+            except BaseException as e:
+                send, throw = None, e
+
+
+# Awaitable being profiled by the current task, so that waits recorded within it are excluded from its time
+_profiled: "contextvars.ContextVar[Optional[_TimedAwaitable]]" = contextvars.ContextVar(
+    "pylicy_profiled", default=None
+)
+
+
+class Profiler:
+    """Records the wall and CPU time spent in each phase of a policy run
+
+    Phases are identified by a stack of names, e.g. `("plan",)`, `("schedule",)` or
+    `("execute", "my_policy")`. Totals are always accumulated, individual events are only kept if
+    `record_events` is set and are used to produce Chrome trace-event files.
+    """
+
+    def __init__(self, *, record_events: bool = True):
+        """
+        Args:
+            record_events: Keep every timed event so that a trace can be dumped. Memory grows with the
+                number of events, disable for very large runs where only totals are required
+        """
+        self.record_events = record_events
+        self._origin = time.perf_counter()
+        self._totals: Dict[Stack, PhaseTotals] = {}
+        self._events: List[Dict[str, JSON]] = []
+        self._next_id = 0
+
+    @property
+    def totals(self) -> Dict[Stack, PhaseTotals]:
+        return self._totals.copy()
+
+    @contextlib.contextmanager
+    def phase(self, *stack: str, args: Optional[Dict[str, JSON]] = None) -> Iterator[None]:
+        """Times a synchronous phase
+
+        Args:
+            stack: Name of the phase
+            args: Extra detail to attach to the trace event
+        """
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._record(stack, start, end, time.thread_time() - cpu_start, args, asynchronous=False)
+
+    def profile(
+        self, awaitable: Awaitable[T], *stack: str, args: Optional[Dict[str, JSON]] = None
+    ) -> Awaitable[T]:
+        """Times an awaitable, attributing only the CPU time spent running its own steps to it
+
+        The delay between calling this and the awaitable first running is recorded as a `schedule` phase.
+
+        Args:
+            awaitable: Awaitable to time
+            stack: Name of the phase
+            args: Extra detail to attach to the trace event
+
+        Returns:
+            An awaitable producing the same result
+        """
+        return self._profile(awaitable, time.perf_counter(), stack, args)
+
+    async def _profile(
+        self, awaitable: Awaitable[T], scheduled: float, stack: Stack, args: Optional[Dict[str, JSON]]
+    ) -> T:
+        start = time.perf_counter()
+        self._record(("schedule",), scheduled, start, 0.0, None, asynchronous=True)
+
+        timed = _TimedAwaitable(awaitable)
+        token = _profiled.set(timed)
+        try:
+            return await timed  # type: ignore
+        finally:
+            _profiled.reset(token)
+            self._record(
+                stack, start, time.perf_counter() - timed.waited, timed.cpu, args, asynchronous=True
+            )
+
+    def wait(
+        self, awaitable: Awaitable[T], *stack: str, args: Optional[Dict[str, JSON]] = None
+    ) -> Awaitable[T]:
+        """Times waiting on an awaitable, such as for a scheduler slot
+
+        The wait is not counted in the time of the awaitable being profiled which it is part of, if any.
+
+        Args:
+            awaitable: Awaitable to time
+            stack: Name of the phase
+            args: Extra detail to attach to the trace event
+
+        Returns:
+            An awaitable producing the same result
+        """
+        return self._wait(awaitable, stack, args)
+
+    async def _wait(self, awaitable: Awaitable[T], stack: Stack, args: Optional[Dict[str, JSON]]) -> T:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            end = time.perf_counter()
+            self._record(stack, start, end, 0.0, args, asynchronous=True)
+            profiled = _profiled.get()
+            if profiled is not None:
+                profiled.waited += end - start
+
+    def dump_chrome_trace(self, path: str) -> None:
+        """Writes recorded events in the Chrome trace-event format, viewable in chrome://tracing or Perfetto
+
+        Args:
+            path: File to write to
+        """
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self._events, "displayTimeUnit": "ms"}, f)
+
+    def dump_collapsed(self, path: str, *, metric: Literal["cpu", "wall"] = "cpu") -> None:
+        """Writes totals as collapsed stacks in microseconds, as consumed by flamegraph.pl or speedscope
+
+        Args:
+            path: File to write to
+            metric: Which time to report for each stack
+        """
+        with open(path, "w") as f:
+            for stack, totals in sorted(self._totals.items()):
+                value = round((totals.cpu if metric == "cpu" else totals.wall) * 1_000_000)
+                if value > 0:
+                    f.write(f"{';'.join(('pylicy',) + stack)} {value}\n")
+
+    def _record(
+        self,
+        stack: Stack,
+        start: float,
+        end: float,
+        cpu: float,
+        args: Optional[Dict[str, JSON]],
+        *,
+        asynchronous: bool,
+    ) -> None:
+        totals = self._totals.get(stack, PhaseTotals(0, 0.0, 0.0))
+        self._totals[stack] = PhaseTotals(totals.calls + 1, totals.wall + end - start, totals.cpu + cpu)
+
+        if not self.record_events:
+            return
+
+        event: Dict[str, JSON] = {
+            "name": stack[-1],
+            "cat": stack[0],
+            "pid": os.getpid(),
+            "tid": 0,
+            "ts": (start - self._origin) * 1_000_000,
+            "args": {**(args or {}), "cpu_ms": cpu * 1000},
+        }
+        if asynchronous:
+            # Interleaved steps cannot be nested on a single thread track, so use async begin/end pairs
+            self._next_id += 1
+            self._events.append({**event, "ph": "b", "id": self._next_id})
+            self._events.append(
+                {**event, "ph": "e", "id": self._next_id, "ts": (end - self._origin) * 1_000_000}
+            )
+        else:
+            self._events.append({**event, "ph": "X", "dur": (end - start) * 1_000_000})
@@ -1,26 +1,148 @@
 import asyncio
+import collections
+import contextlib
+import hashlib
 import itertools
 import json
 import logging
-from typing import IO, AnyStr, Dict, List, NamedTuple, Optional, Union
+import time
+import weakref
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Hashable,
+    Iterator,
+)
+from typing import (
+    IO,
+    Any,
+    AnyStr,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 import yaml
 
-from . import policy
+from . import aggregate
+from . import cache as cache_
+from . import checkpoint as checkpoint_
+from . import decisions as decisions_
+from . import limits, policy, profiling
 from . import rules as rules_
-from . import utils
-from .models import JSON, PolicyChecker, PolicyDecision, Resource, Rule, UserRule
+from . import scheduling
+from . import store as store_
+from . import tracing, utils
+from .models import (
+    JSON,
+    ExecutionPlan,
+    ExecutionPlanStep,
+    PlanExplanation,
+    PolicyChecker,
+    PolicyDecision,
+    PolicyDecisionAction,
+    PreparedPolicyChecker,
+    Resource,
+    ResourceResult,
+    Rule,
+    UserRule,
+)
+from .sinks import ResultSink
 
+DEFAULT_CONCURRENCY = 64
 
-class ExecutionPlanStep(NamedTuple):
-    policy_name: str
+
+DuplicateResources = Literal["first", "last", "error"]
+
+
+def deduplicate_resources(resources: Iterable[Resource], duplicates: DuplicateResources) -> List[Resource]:
+    """Removes resources with repeated ids, preserving the position of the first occurrence
+
+    Args:
+        resources: Resources to deduplicate
+        duplicates: Which resource to keep when several share an id - the `first`, the `last`, or raise an
+            `error`
+
+    Returns:
+        One resource per id, in the order the ids first appeared
+
+    Raises:
+        TypeError: when a resource isn't a Resource
+        ValueError: when `duplicates` is unknown, or is `error` and resource ids are not unique
+    """
+    if duplicates not in ("first", "last", "error"):
+        raise ValueError(f"Unknown duplicate resource handling {duplicates}")
+
+    unique: Dict[str, Resource] = {}
+    for resource in resources:
+        if not isinstance(resource, Resource):
+            raise TypeError("resource should be a pylicy.Resource type")
+        if resource.id in unique:
+            if duplicates == "error":
+                raise ValueError(f"Duplicate resource id {resource.id}")
+            if duplicates == "first":
+                continue
+        unique[resource.id] = resource
+    return list(unique.values())
+
+
+TPrefilterItem = TypeVar("TPrefilterItem", str, Tuple[str, Any])
+
+
+class _InFlightStep:
+    """Execution shared by concurrent identical steps, running until every step awaiting it is cancelled"""
+
+    __slots__ = ("resource", "rule", "decision", "waiters")
+
+    def __init__(self, resource: Resource, rule: Rule, decision: "asyncio.Task[PolicyDecision]"):
+        self.resource = resource
+        self.rule = rule
+        self.decision = decision
+        self.waiters = 0
+
+
+class _CompiledRule(NamedTuple):
     rule: Rule
+    resource_matcher: utils.PatternSet
+    policy_matches: utils.PatternMatches
 
-    def __repr__(self) -> str:  # pragma: no cover
-        return f"{self.rule.name}:{self.policy_name}"
 
+# Bitmask of the compiled rules applicable to a resource, bit i being set if the i-th compiled rule applies
+EffectiveRules = int
 
-ExecutionPlan = List[ExecutionPlanStep]
+
+class _ResolvedPlan(NamedTuple):
+    steps: Tuple[Tuple[int, int], ...]  # (policy index, compiled rule index) of each step of the plan
+    plan: Tuple[ExecutionPlanStep, ...]
+    excluded: Dict[str, Rule]
+
+
+_EMPTY_PLAN = _ResolvedPlan(steps=(), plan=(), excluded={})
+
+
+PLAN_CACHE_SIZE = 4096
+
+
+# Internal evaluations which are not given a request are scheduled as batch work
+_DEFAULT_REQUEST = scheduling.Request(scheduling.Priority.BATCH, None)
+
+
+# Marks rules without a prepared value, as None may be a prepared value
+_UNPREPARED = object()
+
+
+async def _resolved(decision: PolicyDecision) -> PolicyDecision:
+    return decision
 
 
 class Pylicy:
@@ -30,13 +152,138 @@ class Pylicy:
         *,
         scope: str = policy.DEFAULT_POLICY_SCOPE,
         logger: Optional[logging.Logger] = None,
+        cache: Optional[cache_.CompilationCache] = None,
+        coalesce: bool = False,
+        profiler: Optional[profiling.Profiler] = None,
+        tracing_config: Optional[tracing.Tracing] = None,
+        isolate_errors: bool = False,
+        scheduler: Optional[scheduling.Scheduler] = None,
+        decision_cache: Optional[decisions_.DecisionCache] = None,
+        regex_patterns: bool = False,
     ):
+        """
+        Args:
+            rules: Rules to apply
+            scope: policy scope to load for
+            logger: Logger to use, defaults to the module logger
+            cache: Cache to share compiled rules through, defaults to a cache shared by all instances
+            coalesce: Share a single evaluation between concurrent executions of the same policy and rule
+                against an equal resource
+            profiler: Profiler recording the time spent planning, scheduling and executing each policy
+            tracing_config: Tracing configuration to emit OpenTelemetry spans with
+            isolate_errors: Turn exceptions raised by policies (after any retries) into ERROR decisions
+                instead of failing the whole evaluation. A lazily loaded resource whose loader fails gets an
+                ERROR decision for every policy planned for it
+            scheduler: Scheduler admitting policy executions by the priority and deadline of their
+                evaluation, which may be shared with other instances. Executions are not limited if omitted
+            decision_cache: Cache sharing one immutable instance between equal decisions and interning their
+                reasons, reducing the memory held by large result sets. May be shared with other instances
+            regex_patterns: Accept rule patterns of the form `regex:<expression>`, see `utils.PatternSet`
+
+        Raises:
+            re.error: when regex_patterns is set and a rule has an invalid regex pattern
+        """
         self._scope = scope
         self._policies = policy.get_policies(scope)
         self._rules = rules.copy()
 
         self._logger = logger or logging.getLogger(__name__)
 
+        self._regex_patterns = regex_patterns
+        self._cache = cache if cache is not None else cache_.DEFAULT_CACHE
+        self._cache_keys: List[Hashable] = []
+        # Policies are numbered by their position here, matching the bits of each rule's policy masks
+        self._policy_names: Tuple[str, ...] = tuple(self._policies.keys())
+        # Registered before compiling, so that entries acquired before an invalid pattern are still released
+        weakref.finalize(self, self._cache.release, self._cache_keys)
+        self._compiled_rules = self._compile_rules()
+        # Plans only depend on which rules apply, so are shared by every resource matching the same rules
+        self._plan_cache: Dict[EffectiveRules, _ResolvedPlan] = {}
+        self._options = {
+            policy_name: policy.get_options(policy_name, scope) for policy_name in self._policies
+        }
+        self._prepared = self._prepare_rules()
+        self._limits = {
+            policy_name: (options.rate_limit, options.concurrency)
+            for policy_name, options in self._options.items()
+            if options.rate_limit is not None or options.concurrency is not None
+        }
+        self._retries = {
+            policy_name: options.retry
+            for policy_name, options in self._options.items()
+            if options.retry is not None
+        }
+        self._fields = {policy_name: options.fields for policy_name, options in self._options.items()}
+        self._sync = frozenset(
+            policy_name for policy_name, options in self._options.items() if options.sync
+        )
+        self._isolate_errors = isolate_errors
+        self._scheduler = scheduler
+        self._decision_cache = decision_cache
+
+        self._coalesce = coalesce
+        self._in_flight: Dict[Tuple[str, str, str], _InFlightStep] = {}
+        # Checkers set up by each unexited `__aenter__`, so an exit only tears down what this Pylicy set up
+        self._set_up: List[List[PolicyChecker]] = []
+
+        self._profiler = profiler
+        self._tracing = tracing_config if tracing_config is not None and tracing_config.enabled else None
+
+    async def __aenter__(self) -> "Pylicy":
+        """Sets up every policy in scope, see `BasePolicy.setup`
+
+        Raises:
+            Exception: the first error raised by a policy's setup, after tearing down every other policy
+        """
+        checkers = self._distinct_checkers()
+        results = await asyncio.gather(*map(policy.setup_policy, checkers), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            await self._teardown(
+                [
+                    checker
+                    for checker, result in zip(checkers, results)
+                    if not isinstance(result, BaseException)
+                ]
+            )
+            raise errors[0]
+        self._set_up.append(checkers)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Tears down the policies set up by the matching `__aenter__`, see `BasePolicy.teardown`
+
+        An exit without a matching enter does nothing, so it cannot tear down policies still used by another
+        Pylicy in the same scope.
+        """
+        if self._set_up:
+            await self._teardown(self._set_up.pop())
+
+    async def _teardown(self, checkers: List[PolicyChecker]) -> None:
+        results = await asyncio.gather(*map(policy.teardown_policy, checkers), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _distinct_checkers(self) -> List[PolicyChecker]:
+        """Policy checkers in scope, with checkers registered under several names only included once"""
+        return list({id(checker): checker for checker in self._policies.values()}.values())
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the scope, rules and policies, identifying the configuration producing results"""
+        configuration: Dict[str, Any] = {
+            "scope": self._scope,
+            "rules": [json.loads(rule.json()) for rule in self._rules],
+            "policies": {
+                name: f"{checker.__module__}.{getattr(checker, '__qualname__', type(checker).__qualname__)}"
+                for name, checker in self._policies.items()
+            },
+        }
+        if self._regex_patterns:  # Only included when set, so that other fingerprints are unchanged
+            configuration["regex_patterns"] = True
+        return hashlib.sha256(json.dumps(configuration, sort_keys=True).encode()).hexdigest()
+
     @property
     def rules(self) -> List[Rule]:
         return self._rules.copy()
@@ -58,44 +305,190 @@ class Pylicy:
             )
         )
 
-    async def apply(self, resource: Resource) -> Dict[str, PolicyDecision]:
+    async def apply(
+        self,
+        resource: Resource,
+        *,
+        priority: int = scheduling.Priority.INTERACTIVE,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, PolicyDecision]:
         """Applies relevant policy to a resource
 
         Args:
             resource: Resource to apply policies to
+            priority: Priority of the evaluation's policy executions, if a scheduler is configured
+            timeout: Seconds by which every policy execution must be admitted by the scheduler, if one is
+                configured
+
+        Returns:
+            A mapping of policy names to policy decisions
+
+        Raises:
+            TypeError: when resource isn't a Resource
+            TimeoutError: when a policy execution is not admitted by the scheduler before the timeout
+        """
+
+        return await self._apply(resource, scheduling.Request.create(priority, timeout))
+
+    async def _apply(self, resource: Resource, request: scheduling.Request) -> Dict[str, PolicyDecision]:
+        if not isinstance(resource, Resource):
+            raise TypeError("resource should be a pylicy.Resource type")
+
+        return await self._apply_plan(resource, self._plan(resource.id), request)
+
+    def plan(self, resource_id: str) -> ExecutionPlan:
+        """Plans the policies to apply to a resource and the rule each is applied from, see `explain`
+
+        Args:
+            resource_id: Id of the resource to plan
+
+        Returns:
+            The steps `apply` would execute for the resource
+        """
+        return self._plan(resource_id)
+
+    async def apply_plan(
+        self, resource: Resource, plan: ExecutionPlan, *, request: Optional[scheduling.Request] = None
+    ) -> Dict[str, PolicyDecision]:
+        """Applies an already planned set of policies to a resource, see `plan`
+
+        Callers evaluating several plans together, such as `MultiScopePylicy`, can plan every resource first
+        and share one request between the evaluations.
+
+        Args:
+            resource: Resource to apply policies to
+            plan: Steps to execute, usually from `plan`
+            request: Priority and deadline of the evaluation's policy executions, if a scheduler is
+                configured. Defaults to an interactive request without a deadline
 
         Returns:
             A mapping of policy names to policy decisions
 
         Raises:
             TypeError: when resource isn't a Resource
+            TimeoutError: when a policy execution is not admitted by the scheduler before the deadline
         """
 
         if not isinstance(resource, Resource):
             raise TypeError("resource should be a pylicy.Resource type")
 
-        plan = self._resolve_resource_policies(resource.id)
+        return await self._apply_plan(
+            resource,
+            plan,
+            request if request is not None else scheduling.Request.create(scheduling.Priority.INTERACTIVE),
+        )
+
+    async def _apply_plan(
+        self, resource: Resource, plan: ExecutionPlan, request: scheduling.Request = _DEFAULT_REQUEST
+    ) -> Dict[str, PolicyDecision]:
+        """Executes an already resolved plan for a resource"""
         self._logger.debug("Processing resource '%s' with plan %s", resource.id, plan)
+        if resource.loader is not None and plan:
+            try:
+                resource = await self._load(resource, plan)
+            except Exception as e:
+                if not self._isolate_errors:
+                    raise
+                self._logger.warning("Loading resource %s failed", resource.id, exc_info=True)
+                return {step.policy_name: self._error_decision(e) for step in plan}
+        if self._tracing is not None and self._tracing.sample_resource():
+            with self._tracing.span(
+                "pylicy.apply", {"pylicy.resource.id": resource.id, "pylicy.plan.size": len(plan)}
+            ):
+                return await self._gather_plan(resource, plan, request, traced=True)
+        return await self._gather_plan(resource, plan, request, traced=False)
+
+    def fields(self, plan: ExecutionPlan) -> Optional[FrozenSet[str]]:
+        """Gets the fields of resource data read by the policies of a plan, see `policy.register_policy`
+
+        Args:
+            plan: Steps to execute, usually from `plan`
+
+        Returns:
+            The fields a lazily loaded resource is loaded with, or None when a policy reads every field
+        """
+        projection: FrozenSet[str] = frozenset()
+        for step in plan:
+            policy_fields = self._fields[step.policy_name]
+            if policy_fields is None:
+                return None
+            projection |= policy_fields
+        return projection
+
+    async def _load(self, resource: Resource, plan: ExecutionPlan) -> Resource:
+        """Fetches the data of a lazily loaded resource, only including the fields needed by the plan"""
+        assert resource.loader is not None
+        loading = resource.loader(resource.id, self.fields(plan))
+        if self._profiler is not None:
+            loading = self._profiler.profile(loading, "load", args={"resource": resource.id})
+        return resource.copy(update={"data": await loading, "loader": None})
+
+    async def _gather_plan(
+        self, resource: Resource, plan: ExecutionPlan, request: scheduling.Request, *, traced: bool
+    ) -> Dict[str, PolicyDecision]:
+        """Executes every step of a plan concurrently"""
         return dict(
             zip(
                 [step.policy_name for step in plan],
                 await asyncio.gather(
-                    *[self._execute_policy(step.policy_name, resource, step.rule) for step in plan]
+                    *[self._execute_step(step, resource, request, traced=traced) for step in plan]
                 ),
             )
         )
 
-    async def apply_all(self, resources: List[Resource]) -> Dict[str, Dict[str, PolicyDecision]]:
+    def _execute_step(
+        self, step: ExecutionPlanStep, resource: Resource, request: scheduling.Request, *, traced: bool
+    ) -> Awaitable[PolicyDecision]:
+        """Creates the execution of a step, instrumented for tracing and profiling if enabled"""
+        execution: Awaitable[PolicyDecision] = self._execute_policy(
+            step.policy_name, resource, step.rule, request
+        )
+        if traced and self._tracing is not None:
+            execution = self._tracing.execute(
+                execution,
+                {
+                    "pylicy.resource.id": resource.id,
+                    "pylicy.policy": step.policy_name,
+                    "pylicy.rule": step.rule.name,
+                },
+            )
+        if self._profiler is not None:
+            execution = self._profiler.profile(
+                execution,
+                "execute",
+                step.policy_name,
+                args={"resource": resource.id, "rule": step.rule.name},
+            )
+        return execution
+
+    async def apply_all(
+        self,
+        resources: List[Resource],
+        *,
+        duplicates: DuplicateResources = "last",
+        checkpoint: Optional[checkpoint_.Checkpoint] = None,
+        priority: int = scheduling.Priority.BATCH,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Dict[str, PolicyDecision]]:
         """Applies all policies to a list of resources
 
         Args:
             resources: resources to apply policies to
+            duplicates: Which resource to evaluate when several share an id - the `first`, the `last`, or
+                raise an `error`. Only one resource is evaluated per id
+            checkpoint: Checkpoint to record results in. Resources it already has results for are not
+                evaluated again, their recorded decisions are returned instead
+            priority: Priority of the policy executions, if a scheduler is configured
+            timeout: Seconds by which every policy execution must be admitted by the scheduler, if one is
+                configured
 
         Returns:
             A list of resource -> {policy_name -> policy_decision} mappings
 
         Raises:
             TypeError: when resource isn't a list
+            ValueError: when `duplicates` is `error` and resource ids are not unique
+            TimeoutError: when a policy execution is not admitted by the scheduler before the timeout
         """
 
         if not isinstance(resources, list):
@@ -103,11 +496,402 @@ class Pylicy:
                 "Did not get expected list of resources - use .apply(resource) for singular resources"
             )
 
-        return dict(
-            zip(
-                [resource.id for resource in resources],
-                await asyncio.gather(*[self.apply(resource) for resource in resources]),
+        resources = deduplicate_resources(resources, duplicates)
+        if checkpoint is not None:
+            self._check_fingerprint(checkpoint)
+        request = scheduling.Request.create(priority, timeout)
+        if self._tracing is not None:
+            with self._tracing.span(
+                "pylicy.apply_all", {"pylicy.scope": self._scope, "pylicy.resources": len(resources)}
+            ):
+                return await self._apply_all(resources, request, checkpoint)
+        return await self._apply_all(resources, request, checkpoint)
+
+    async def _apply_all(
+        self,
+        resources: List[Resource],
+        request: scheduling.Request,
+        checkpoint: Optional[checkpoint_.Checkpoint] = None,
+    ) -> Dict[str, Dict[str, PolicyDecision]]:
+        """Applies all policies to a list of resources with unique ids"""
+        if checkpoint is None:
+            return dict(
+                zip(
+                    [resource.id for resource in resources],
+                    await asyncio.gather(*[self._apply(resource, request) for resource in resources]),
+                )
+            )
+
+        async def apply(resource: Resource) -> Dict[str, PolicyDecision]:
+            recorded = checkpoint.get(resource.id)
+            if recorded is not None:
+                return recorded.decisions
+            result = await self._apply_result(resource, request)
+            checkpoint.record(result)
+            return result.decisions
+
+        try:
+            return dict(
+                zip(
+                    [resource.id for resource in resources],
+                    await asyncio.gather(*[apply(resource) for resource in resources]),
+                )
+            )
+        finally:
+            checkpoint.flush()
+
+    def apply_sync(self, resource: Resource) -> Dict[str, PolicyDecision]:
+        """Applies relevant policy to a resource without an event loop
+
+        Every planned policy must be a synchronous checker, see `register_policy`, which is checked before
+        any policy is called. Policies are called one after another, ignoring any rate limits, concurrency
+        limits, retries and scheduler, so this suits policies which only make fast local checks.
+
+        Args:
+            resource: Resource to apply policies to
+
+        Returns:
+            A mapping of policy names to policy decisions
+
+        Raises:
+            TypeError: when resource isn't a Resource, or a planned policy is not synchronous
+            ValueError: when the resource's data is lazily loaded
+        """
+
+        if not isinstance(resource, Resource):
+            raise TypeError("resource should be a pylicy.Resource type")
+
+        plan = self._plan(resource.id)
+        self._check_sync(resource, plan)
+        return self._apply_plan_sync(resource, plan)
+
+    def _check_sync(self, resource: Resource, plan: ExecutionPlan) -> None:
+        """Checks that a plan can be applied synchronously, see `apply_sync`"""
+        if not plan:
+            return
+        if resource.loader is not None:
+            raise ValueError("Lazily loaded resources can only be applied asynchronously - use .apply")
+        for policy_name, _ in plan:
+            if policy_name not in self._sync:
+                raise TypeError(f"Policy {policy_name} is not synchronous - use .apply")
+
+    def _apply_plan_sync(self, resource: Resource, plan: ExecutionPlan) -> Dict[str, PolicyDecision]:
+        """Calls every synchronous checker of an already checked plan for a resource"""
+        decisions: Dict[str, PolicyDecision] = {}
+        for policy_name, rule in plan:
+            try:
+                decision = self._call_sync_checker(policy_name, resource, rule)
+            except Exception as e:
+                if not self._isolate_errors:
+                    raise
+                self._log_policy_error(policy_name, resource, rule)
+                decisions[policy_name] = self._error_decision(e)
+                continue
+            decisions[policy_name] = (
+                decision if self._decision_cache is None else self._decision_cache.compact(decision)
+            )
+        return decisions
+
+    def apply_all_sync(
+        self, resources: List[Resource], *, duplicates: DuplicateResources = "last"
+    ) -> Dict[str, Dict[str, PolicyDecision]]:
+        """Applies all policies to a list of resources without an event loop, see `apply_sync`
+
+        Every resource's plan is checked before any policy is called.
+
+        Args:
+            resources: resources to apply policies to
+            duplicates: Which resource to evaluate when several share an id - the `first`, the `last`, or
+                raise an `error`. Only one resource is evaluated per id
+
+        Returns:
+            A list of resource -> {policy_name -> policy_decision} mappings
+
+        Raises:
+            TypeError: when resource isn't a list, or a planned policy is not synchronous
+            ValueError: when `duplicates` is `error` and resource ids are not unique, or a resource's data
+                is lazily loaded
+        """
+
+        if not isinstance(resources, list):
+            raise TypeError(
+                "Did not get expected list of resources - use .apply_sync(resource) for singular resources"
+            )
+
+        planned = [
+            (resource, self._plan(resource.id)) for resource in deduplicate_resources(resources, duplicates)
+        ]
+        for resource, plan in planned:
+            self._check_sync(resource, plan)
+        return {resource.id: self._apply_plan_sync(resource, plan) for resource, plan in planned}
+
+    async def apply_iter(
+        self,
+        resources: Union[Iterable[Resource], AsyncIterable[Resource]],
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[checkpoint_.Checkpoint] = None,
+        priority: int = scheduling.Priority.BATCH,
+    ) -> AsyncIterator[ResourceResult]:
+        """Applies all policies to a stream of resources, yielding results as they complete
+
+        Only `concurrency` resources are evaluated at once, so neither the resources nor the results need to
+        be held in memory together.
+
+        Args:
+            resources: Iterable or async iterable of resources to apply policies to
+            concurrency: Maximum number of resources to evaluate at once
+            checkpoint: Checkpoint to record results in. Resources it already has results for are skipped,
+                their results can be recovered with `Checkpoint.results`
+            priority: Priority of the policy executions, if a scheduler is configured
+
+        Returns:
+            An async iterator of results, in order of completion
+
+        Raises:
+            TypeError: when a resource isn't a Resource
+            ValueError: when concurrency is not positive
+        """
+
+        if concurrency < 1:
+            raise ValueError("concurrency should be at least 1")
+        if checkpoint is not None:
+            self._check_fingerprint(checkpoint)
+
+        request = scheduling.Request.create(priority)
+        pending: set["asyncio.Future[ResourceResult]"] = set()
+        try:
+            async for resource in utils.iterate(resources):
+                if not isinstance(resource, Resource):
+                    raise TypeError("resource should be a pylicy.Resource type")
+                if checkpoint is not None and resource.id in checkpoint:
+                    continue
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield self._completed(task, checkpoint)
+                pending.add(asyncio.ensure_future(self._apply_result(resource, request)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield self._completed(task, checkpoint)
+        finally:
+            for task in pending:
+                task.cancel()
+            if checkpoint is not None:
+                checkpoint.flush()
+
+    @staticmethod
+    def _completed(
+        task: "asyncio.Future[ResourceResult]", checkpoint: Optional[checkpoint_.Checkpoint]
+    ) -> ResourceResult:
+        result = task.result()
+        if checkpoint is not None:
+            checkpoint.record(result)
+        return result
+
+    def _check_fingerprint(self, checkpoint: checkpoint_.Checkpoint) -> None:
+        if checkpoint.fingerprint != self.fingerprint:
+            raise ValueError("Checkpoint was created for a different configuration")
+
+    async def apply_to_sink(
+        self,
+        resources: Union[Iterable[Resource], AsyncIterable[Resource]],
+        sink: ResultSink,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[checkpoint_.Checkpoint] = None,
+        priority: int = scheduling.Priority.BATCH,
+    ) -> int:
+        """Applies all policies to a stream of resources, writing results to a sink as they complete
+
+        Buffered results are flushed in a worker thread so that serialization overlaps with evaluation.
+        The sink is flushed but not closed once every resource has been written.
+
+        Args:
+            resources: Iterable or async iterable of resources to apply policies to
+            sink: Sink to write results to
+            concurrency: Maximum number of resources to evaluate at once
+            checkpoint: Checkpoint to record results in, skipping resources it already has results for
+            priority: Priority of the policy executions, if a scheduler is configured
+
+        Returns:
+            The number of resources evaluated
+        """
+
+        count = 0
+        async for result in self.apply_iter(
+            resources, concurrency=concurrency, checkpoint=checkpoint, priority=priority
+        ):
+            sink.write(result)
+            count += 1
+            if sink.pending >= sink.buffer_size:
+                await asyncio.to_thread(sink.flush)
+        await asyncio.to_thread(sink.flush)
+        return count
+
+    def explain(self, resource_ids: Iterable[str]) -> Iterator[PlanExplanation]:
+        """Explains how policies would be applied to resources, without executing any policies
+
+        Args:
+            resource_ids: Ids of the resources to explain
+
+        Returns:
+            An iterator of explanations, in the same order as `resource_ids`
+
+        Raises:
+            TypeError: when resource_ids is a single string
+        """
+
+        if isinstance(resource_ids, str):
+            raise TypeError("Expected an iterable of resource ids, not a single id")
+
+        for resource_id in resource_ids:
+            yield self._explain(resource_id, self._find_effective_rules_for_resource(resource_id))
+
+    def plan_all(self, resource_ids: Iterable[str]) -> aggregate.Coverage:
+        """Counts how many resources each policy would be applied to and from which rules, without executing
+        any policies
+
+        Args:
+            resource_ids: Ids of the resources to plan
+
+        Returns:
+            Coverage of every policy and rule
+
+        Raises:
+            TypeError: when resource_ids is a single string
+        """
+
+        if isinstance(resource_ids, str):
+            raise TypeError("Expected an iterable of resource ids, not a single id")
+
+        # Resources matching the same rules share a plan, so only count them and resolve each plan once
+        counts: "collections.Counter[EffectiveRules]" = collections.Counter()
+        examples: Dict[EffectiveRules, str] = {}
+        for resource_id in resource_ids:
+            effective_rules = self._find_effective_rules_for_resource(resource_id)
+            counts[effective_rules] += 1
+            examples.setdefault(effective_rules, resource_id)
+
+        coverage = aggregate.Coverage()
+        for effective_rules, count in counts.items():
+            coverage.add(self._explain(examples[effective_rules], effective_rules), count)
+        return coverage
+
+    def prefilter(self, items: Iterable[TPrefilterItem]) -> Iterator[TPrefilterItem]:
+        """Filters resource ids, or (id, payload) pairs, down to those with at least one policy to apply
+
+        Only the rules are consulted, so irrelevant resources can be dropped before `Resource` objects are
+        constructed for them.
+
+        Args:
+            items: Resource ids or (id, payload) pairs to filter
+
+        Returns:
+            An iterator of the items with a non-empty plan, in the same order as `items`
+
+        Raises:
+            TypeError: when items is a single string
+        """
+
+        if isinstance(items, str):
+            raise TypeError("Expected an iterable of resource ids, not a single id")
+
+        relevant: Dict[EffectiveRules, bool] = {0: False}
+        for item in items:
+            effective_rules = self._find_effective_rules_for_resource(
+                item if isinstance(item, str) else item[0]
             )
+            is_relevant = relevant.get(effective_rules)
+            if is_relevant is None:
+                is_relevant = relevant[effective_rules] = bool(
+                    self._resolve_effective_rules(effective_rules).plan
+                )
+            if is_relevant:
+                yield item
+
+    async def summarize(
+        self,
+        resources: Union[Iterable[Resource], AsyncIterable[Resource]],
+        *,
+        summary: Optional[aggregate.Summary] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[checkpoint_.Checkpoint] = None,
+        priority: int = scheduling.Priority.BATCH,
+    ) -> aggregate.Summary:
+        """Applies all policies to a stream of resources, only keeping counts of the decisions made
+
+        Args:
+            resources: Iterable or async iterable of resources to apply policies to
+            summary: Summary to fold results into, allowing counts by prefix and the number of most denied
+                resources to be configured. A new summary is created if omitted
+            concurrency: Maximum number of resources to evaluate at once
+            checkpoint: Checkpoint to record results in. Results it already has are counted without
+                evaluating their resources again
+            priority: Priority of the policy executions, if a scheduler is configured
+
+        Returns:
+            The summary of all decisions
+        """
+
+        summary = summary if summary is not None else aggregate.Summary()
+        if checkpoint is not None:
+            self._check_fingerprint(checkpoint)
+            for result in checkpoint.results():
+                summary.add(result)
+        async for result in self.apply_iter(
+            resources, concurrency=concurrency, checkpoint=checkpoint, priority=priority
+        ):
+            summary.add(result)
+        return summary
+
+    async def apply_to_store(
+        self,
+        resources: Union[Iterable[Resource], AsyncIterable[Resource]],
+        *,
+        store: Optional[store_.ResultStore] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        checkpoint: Optional[checkpoint_.Checkpoint] = None,
+        priority: int = scheduling.Priority.BATCH,
+    ) -> store_.ResultStore:
+        """Applies all policies to a stream of resources, collecting the decisions into a mapping like
+        `apply_all` which spills to disk once it exceeds its memory budget
+
+        Args:
+            resources: Iterable or async iterable of resources to apply policies to
+            store: Store to add results to, configuring the file and memory budget. A new store spilling
+                to a temporary file is created if omitted
+            concurrency: Maximum number of resources to evaluate at once
+            checkpoint: Checkpoint to record results in. Results it already has are added without
+                evaluating their resources again
+            priority: Priority of the policy executions, if a scheduler is configured
+
+        Returns:
+            The store, mapping resource ids to {policy_name -> policy_decision} mappings
+        """
+
+        store = store if store is not None else store_.ResultStore()
+        if checkpoint is not None:
+            self._check_fingerprint(checkpoint)
+            for result in checkpoint.results():
+                store.add(result)
+        async for result in self.apply_iter(
+            resources, concurrency=concurrency, checkpoint=checkpoint, priority=priority
+        ):
+            store.add(result)
+        return store
+
+    async def _apply_result(
+        self, resource: Resource, request: scheduling.Request = _DEFAULT_REQUEST
+    ) -> ResourceResult:
+        """Applies relevant policy to a resource, keeping the plan alongside the decisions"""
+        start = time.perf_counter()
+        plan = self._plan(resource.id)
+        decisions = await self._apply_plan(resource, plan, request)
+        return ResourceResult(
+            resource_id=resource.id, plan=plan, decisions=decisions, elapsed=time.perf_counter() - start
         )
 
     def __eq__(self, other: object) -> bool:
@@ -129,111 +913,396 @@ class Pylicy:
             + f"policies=[{','.join([policy for policy in self._policies])}]>"
         )
 
+    def _compile_rules(self) -> List[_CompiledRule]:
+        """Compiles rules in order of non-decreasing weight, sharing compilations through the cache"""
+        return [
+            _CompiledRule(
+                rule=rule,
+                resource_matcher=self._cache.resource_matcher(
+                    rule.resource_patterns, keys=self._cache_keys, regex=self._regex_patterns
+                ),
+                policy_matches=self._cache.policy_matches(
+                    rule.policy_patterns,
+                    self._policy_names,
+                    keys=self._cache_keys,
+                    regex=self._regex_patterns,
+                ),
+            )
+            for rule_list in self._weighted_rules.values()
+            for rule in rule_list
+        ]
+
+    def _prepare_rules(self) -> Dict[str, Dict[int, Any]]:
+        """Runs each policy's prepare hook against every rule including it, keyed by policy and rule id"""
+        prepared: Dict[str, Dict[int, Any]] = {}
+        for policy_index, policy_name in enumerate(self._policy_names):
+            prepare = self._options[policy_name].prepare
+            if prepare is None:
+                continue
+            prepared[policy_name] = {
+                id(compiled_rule.rule): prepare(compiled_rule.rule)
+                for compiled_rule in self._compiled_rules
+                if compiled_rule.policy_matches.include_mask >> policy_index & 1
+            }
+        return prepared
+
+    def _plan(self, resource: str) -> ExecutionPlan:
+        """Plans policies and rules to use, recording the time taken if profiling"""
+        if self._profiler is None:
+            return self._resolve_resource_policies(resource)
+        with self._profiler.phase("plan", args={"resource": resource}):
+            return self._resolve_resource_policies(resource)
+
     def _resolve_resource_policies(self, resource: str) -> ExecutionPlan:
         """Plans policies and rules to use, considering weight"""
-        policy_names = list(self._policies.keys())
-
         effective_rules = self._find_effective_rules_for_resource(resource)
-        if len(effective_rules) == 0:
+        if not effective_rules:
             return []
+        return list(self._resolve_effective_rules(effective_rules).plan)
 
-        plan: ExecutionPlan = []
-        seen: set[str] = set()
+    def _resolve_effective_rules(self, effective_rules: EffectiveRules) -> _ResolvedPlan:
+        """Resolves the policies planned and excluded by a set of effective rules, memoizing the result"""
+        resolved = self._plan_cache.get(effective_rules)
+        if resolved is not None:
+            return resolved
 
-        for rule in reversed(effective_rules):
-            rule_policies = utils.match_patterns(rule.policy_patterns, policy_names)
-            plan.extend(
-                [
-                    ExecutionPlanStep(policy_name=p_name, rule=rule)
-                    for p_name in rule_policies.include
-                    if p_name not in seen
-                ]
+        steps: List[Tuple[int, int]] = []
+        excluded: Dict[str, Rule] = {}
+        seen = 0
+
+        # Rules of higher weight come later, and claim every policy they match before lower weighted rules
+        for index in reversed(list(utils.iter_bits(effective_rules))):
+            compiled_rule = self._compiled_rules[index]
+            rule_policies = compiled_rule.policy_matches
+            steps.extend(
+                (policy_index, index)
+                for policy_index in utils.iter_bits(rule_policies.include_mask & ~seen)
             )
-            seen.update(rule_policies.matched)
+            for policy_index in utils.iter_bits(rule_policies.exclude_mask & ~seen):
+                excluded[self._policy_names[policy_index]] = compiled_rule.rule
+            seen |= rule_policies.matched_mask
 
-        return plan
+        plan = tuple(
+            ExecutionPlanStep(
+                policy_name=self._policy_names[policy_index], rule=self._compiled_rules[index].rule
+            )
+            for policy_index, index in steps
+        )
+        if len(self._plan_cache) >= PLAN_CACHE_SIZE:
+            self._plan_cache.clear()
+        resolved = self._plan_cache[effective_rules] = _ResolvedPlan(
+            steps=tuple(steps), plan=plan, excluded=excluded
+        )
+        return resolved
 
-    def _find_effective_rules_for_resource(self, resource: str) -> List[Rule]:
+    def _find_effective_rules_for_resource(self, resource: str) -> EffectiveRules:
         """Finds all rules applicable to a given resource, ordered by non-decreasing weight"""
-        effective_rules: List[Rule] = []
-        for rule_list in self._weighted_rules.values():
-            for rule in rule_list:
-                matches = utils.match_patterns(rule.resource_patterns, [resource])
-                if len(matches.include) > 0:
-                    effective_rules.append(rule)
+        effective_rules = 0
+        for index, compiled_rule in enumerate(self._compiled_rules):
+            if compiled_rule.resource_matcher.match(resource):
+                effective_rules |= 1 << index
         return effective_rules
 
-    async def _execute_policy(self, policy_name: str, resource: Resource, rule: Rule) -> PolicyDecision:
-        """Executes a policy given its name"""
+    def _explain(self, resource_id: str, effective_rules: EffectiveRules) -> PlanExplanation:
+        resolved = self._resolve_effective_rules(effective_rules) if effective_rules else _EMPTY_PLAN
+        return PlanExplanation(
+            resource_id=resource_id,
+            effective_rules=[
+                self._compiled_rules[index].rule for index in utils.iter_bits(effective_rules)
+            ],
+            plan=list(resolved.plan),
+            excluded=resolved.excluded.copy(),
+        )
+
+    async def _execute_policy(
+        self,
+        policy_name: str,
+        resource: Resource,
+        rule: Rule,
+        request: scheduling.Request = _DEFAULT_REQUEST,
+    ) -> PolicyDecision:
+        """Executes a policy given its name, coalescing concurrent identical executions if enabled"""
+        if not self._coalesce:
+            return await self._run_policy(policy_name, resource, rule, request)
+
+        key = (resource.id, policy_name, rule.name)
+        in_flight = self._in_flight.get(key)
+        if in_flight is None:
+            # The execution runs in its own task so that cancelling the step which started it does not
+            # cancel the steps coalesced into it
+            decision = asyncio.ensure_future(self._run_policy(policy_name, resource, rule, request))
+            in_flight = self._in_flight[key] = _InFlightStep(
+                resource=resource, rule=rule, decision=decision
+            )
+            decision.add_done_callback(lambda _: self._finish_in_flight(key, in_flight))
+        elif (in_flight.resource is resource or in_flight.resource == resource) and in_flight.rule == rule:
+            self._logger.debug("Coalescing policy %s for resource %s", policy_name, resource.id)
+        else:
+            # Same id but different data - evaluate independently without displacing the in-flight step
+            return await self._run_policy(policy_name, resource, rule, request)
+
+        in_flight.waiters += 1
+        try:
+            return await asyncio.shield(in_flight.decision)
+        finally:
+            in_flight.waiters -= 1
+            if not in_flight.waiters and not in_flight.decision.done():
+                # Every step awaiting the execution was cancelled, so nothing needs its decision
+                in_flight.decision.cancel()
+                self._finish_in_flight(key, in_flight)
+
+    def _finish_in_flight(self, key: Tuple[str, str, str], in_flight: _InFlightStep) -> None:
+        """Stops coalescing steps into an execution which has completed or been cancelled"""
+        if self._in_flight.get(key) is in_flight:
+            del self._in_flight[key]
+        if in_flight.decision.done() and not in_flight.decision.cancelled():
+            in_flight.decision.exception()  # Mark as retrieved in case nothing was left waiting
+
+    async def _run_policy(
+        self,
+        policy_name: str,
+        resource: Resource,
+        rule: Rule,
+        request: scheduling.Request = _DEFAULT_REQUEST,
+    ) -> PolicyDecision:
+        """Runs a policy checker, retrying it and isolating its errors if configured"""
         self._logger.debug(
             "Executing policy %s (from %s) for resource %s", policy_name, rule.name, resource.id
         )
-        return await self._policies[policy_name](resource, rule)
+        retry = self._retries.get(policy_name)
+        try:
+            if retry is None:
+                decision = await self._run_attempt(policy_name, resource, rule, request)
+            else:
+                decision = await retry.run(
+                    lambda: self._run_attempt(policy_name, resource, rule, request),
+                    abort_on=(scheduling.DeadlineExceeded,),
+                )
+        except scheduling.DeadlineExceeded:
+            raise
+        except Exception as e:
+            if not self._isolate_errors:
+                raise
+            self._log_policy_error(policy_name, resource, rule)
+            return self._error_decision(e)
+        return decision if self._decision_cache is None else self._decision_cache.compact(decision)
+
+    def _log_policy_error(self, policy_name: str, resource: Resource, rule: Rule) -> None:
+        """Logs the error being handled of a failed policy"""
+        self._logger.warning(
+            "Policy %s (from %s) failed for resource %s",
+            policy_name,
+            rule.name,
+            resource.id,
+            exc_info=True,
+        )
+
+    def _error_decision(self, error: Exception) -> PolicyDecision:
+        """Turns the error of a failed policy or loader into an ERROR decision"""
+        decision = PolicyDecision(
+            action=PolicyDecisionAction.ERROR,
+            reason=f"{type(error).__name__}: {error}",
+            detail={"exception": type(error).__qualname__},
+        )
+        return decision if self._decision_cache is None else self._decision_cache.compact(decision)
+
+    async def _run_attempt(
+        self, policy_name: str, resource: Resource, rule: Rule, request: scheduling.Request
+    ) -> PolicyDecision:
+        """Runs a single attempt of a policy checker within the policy's limits, holding a scheduler slot
+        only once the limits allow the attempt to run"""
+        admission = (
+            None if self._scheduler is None else self._admitted(policy_name, resource, rule, request)
+        )
+        policy_limits = self._limits.get(policy_name)
+        if policy_limits is not None:
+            async with limits.limited(*policy_limits, admission=admission):
+                return await self._call_checker(policy_name, resource, rule)
+        if admission is not None:
+            async with admission:
+                return await self._call_checker(policy_name, resource, rule)
+        return await self._call_checker(policy_name, resource, rule)
+
+    @contextlib.asynccontextmanager
+    async def _admitted(
+        self, policy_name: str, resource: Resource, rule: Rule, request: scheduling.Request
+    ) -> AsyncIterator[None]:
+        """Holds a scheduler slot for an attempt, recording the wait for it as a schedule phase"""
+        assert self._scheduler is not None
+        admission: Awaitable[None] = self._scheduler.admit(request)
+        if self._tracing is not None:
+            admission = self._tracing.schedule(
+                admission,
+                {"pylicy.resource.id": resource.id, "pylicy.policy": policy_name, "pylicy.rule": rule.name},
+            )
+        if self._profiler is not None:
+            admission = self._profiler.wait(
+                admission, "schedule", policy_name, args={"resource": resource.id, "rule": rule.name}
+            )
+        await admission
+        try:
+            yield
+        finally:
+            self._scheduler.release()
+
+    def _call_checker(self, policy_name: str, resource: Resource, rule: Rule) -> Awaitable[PolicyDecision]:
+        if policy_name in self._sync:
+            return _resolved(self._call_sync_checker(policy_name, resource, rule))
+        checker = self._policies[policy_name]
+        if policy_name not in self._prepared:
+            return checker(resource, rule)
+        return cast(PreparedPolicyChecker, checker)(resource, rule, self._prepared_value(policy_name, rule))
+
+    def _call_sync_checker(self, policy_name: str, resource: Resource, rule: Rule) -> PolicyDecision:
+        checker = cast(Callable[..., PolicyDecision], self._policies[policy_name])
+        if policy_name not in self._prepared:
+            return checker(resource, rule)
+        return checker(resource, rule, self._prepared_value(policy_name, rule))
+
+    def _prepared_value(self, policy_name: str, rule: Rule) -> Any:
+        """Gets the value prepared from a rule, preparing rules of plans not built by this instance now"""
+        prepared = self._prepared[policy_name].get(id(rule), _UNPREPARED)
+        if prepared is _UNPREPARED:
+            prepare = self._options[policy_name].prepare
+            assert prepare is not None
+            return prepare(rule)
+        return prepared
 
     # === Factories === #
 
     @classmethod
     def from_raw_dict(
-        cls, raw_dict: Dict[str, JSON], *, scope: str = policy.DEFAULT_POLICY_SCOPE
+        cls, raw_dict: Dict[str, JSON], *, scope: str = policy.DEFAULT_POLICY_SCOPE, **options: Any
     ) -> "Pylicy":
         """Loads a Pylicy object from a raw mapping
 
         Args:
             raw_dict: Raw mapping to load (of the form {version: 1, rules: {}})
             scope: policy scope to load for
+            options: Options of the Pylicy object, such as `isolate_errors` or `scheduler`, see `__init__`
 
         Returns:
             A Pylicy object created from the configuration
         """
-        return cls(rules_.load(raw_dict, policy.get_policies(scope)), scope=scope)
+        return cls(rules_.load(raw_dict, policy.get_policies(scope)), scope=scope, **options)
 
     @classmethod
     def from_yaml(
-        cls, file: Union[str, IO[AnyStr]], *, scope: str = policy.DEFAULT_POLICY_SCOPE
+        cls,
+        file: Union[str, IO[AnyStr]],
+        *,
+        scope: str = policy.DEFAULT_POLICY_SCOPE,
+        stream: bool = False,
+        **options: Any,
     ) -> "Pylicy":
         """Loads a Pylicy object from a yaml file on disk
 
         Args:
             file: File handle or path to yaml file to load
             scope: policy scope to load for
+            stream: Parse and resolve rules one at a time rather than loading the whole document.
+                All invalid rules are reported together in a `rules.RuleValidationError`
+            options: Options of the Pylicy object, such as `isolate_errors` or `scheduler`, see `__init__`
 
         Returns:
             A Pylicy object created from the configuration
         """
         if isinstance(file, str):
             with open(file, "r") as f:
-                return cls.from_raw_dict(yaml.safe_load(f), scope=scope)
+                return cls.from_yaml(f, scope=scope, stream=stream, **options)
+        elif stream:
+            return cls._from_stream(rules_.iter_yaml_entries(file), scope=scope, **options)
         else:
-            return cls.from_raw_dict(yaml.safe_load(file), scope=scope)
+            return cls.from_raw_dict(yaml.safe_load(file), scope=scope, **options)
 
     @classmethod
     def from_json(
-        cls, file: Union[str, IO[AnyStr]], *, scope: str = policy.DEFAULT_POLICY_SCOPE
+        cls,
+        file: Union[str, IO[AnyStr]],
+        *,
+        scope: str = policy.DEFAULT_POLICY_SCOPE,
+        stream: bool = False,
+        **options: Any,
     ) -> "Pylicy":
         """Loads a Pylicy object from a json file on disk
 
         Args:
             file: File handle or path to json file to load
             scope: policy scope to load for
+            stream: Parse and resolve rules one at a time rather than loading the whole document.
+                All invalid rules are reported together in a `rules.RuleValidationError`
+            options: Options of the Pylicy object, such as `isolate_errors` or `scheduler`, see `__init__`
 
         Returns:
             A Pylicy object created from the configuration
         """
         if isinstance(file, str):
             with open(file, "r") as f:
-                return cls.from_raw_dict(json.load(f), scope=scope)
+                return cls.from_json(f, scope=scope, stream=stream, **options)
+        elif stream:
+            return cls._from_stream(rules_.iter_json_entries(file), scope=scope, **options)
         else:
-            return cls.from_raw_dict(json.load(file), scope=scope)
+            return cls.from_raw_dict(json.load(file), scope=scope, **options)
+
+    @classmethod
+    def from_paths(
+        cls,
+        globs: Union[str, Iterable[str]],
+        *,
+        scope: str = policy.DEFAULT_POLICY_SCOPE,
+        max_workers: Optional[int] = None,
+        processes: bool = False,
+        stream: bool = False,
+        **options: Any,
+    ) -> "Pylicy":
+        """Loads a Pylicy object from many json and yaml files at once
+
+        Files are parsed concurrently and their rules concatenated in sorted path order, producing the same
+        object as loading a single file containing every rule. Per-file load times are logged at debug level
+        by `pylicy.rules`; use `rules.load_files` directly to inspect them.
+
+        Args:
+            globs: Glob pattern(s) of rule files. Files ending in `.json` are read as json, others as yaml
+            scope: policy scope to load for
+            max_workers: Maximum number of files to parse at once
+            processes: Parse files in a process pool rather than a thread pool
+            stream: Parse and resolve rules one at a time rather than loading whole documents
+            options: Options of the Pylicy object, such as `isolate_errors` or `scheduler`, see `__init__`
+
+        Returns:
+            A Pylicy object created from the configuration
+
+        Raises:
+            FileNotFoundError: when a pattern does not match any file
+            ValueError: when the same rule name is defined more than once
+            rules.RuleValidationError: when streaming and rules are invalid, naming the file of each rule
+        """
+        loaded_files = rules_.load_files(
+            rules_.expand_paths(globs),
+            policy.get_policies(scope),
+            max_workers=max_workers,
+            processes=processes,
+            stream=stream,
+        )
+        return cls(rules_.merge_files(loaded_files), scope=scope, **options)
+
+    @classmethod
+    def _from_stream(cls, entries: Iterable[rules_.StreamEntry], *, scope: str, **options: Any) -> "Pylicy":
+        """Loads a Pylicy object from streamed rule entries"""
+        return cls(
+            list(rules_.iter_load_stream(entries, policy.get_policies(scope))), scope=scope, **options
+        )
 
     @classmethod
     def from_rules(
-        cls, rules: List[Union[Rule, UserRule]], *, scope: str = policy.DEFAULT_POLICY_SCOPE
+        cls, rules: List[Union[Rule, UserRule]], *, scope: str = policy.DEFAULT_POLICY_SCOPE, **options: Any
     ) -> "Pylicy":
         """Loads a Pylicy object directly from a list of rules
 
         Args:
             rules: List of pylicy rules
             scope: policy scope to load for
+            options: Options of the Pylicy object, such as `isolate_errors` or `scheduler`, see `__init__`
 
         Returns:
             A Pylicy object created from the configuration
@@ -243,4 +1312,4 @@ class Pylicy:
         concrete_rules: List[Rule] = [
             (rule if isinstance(rule, Rule) else rules_.resolve_user_rule(rule, policies)) for rule in rules
         ]
-        return cls(concrete_rules, scope=scope)
+        return cls(concrete_rules, scope=scope, **options)
@@ -0,0 +1,83 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from typing import Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+class Retry:
+    """Retries failed executions of a policy with exponential backoff and full jitter"""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        *,
+        initial: float = 0.1,
+        maximum: float = 10.0,
+        multiplier: float = 2.0,
+        jitter: bool = True,
+        retry_on: Tuple[Type[Exception], ...] = (Exception,),
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            attempts: Total number of attempts, including the first
+            initial: Seconds to wait before the first retry
+            maximum: Most seconds to wait before any retry
+            multiplier: Factor the wait grows by after every retry
+            jitter: Wait a random time between zero and the backoff, spreading out retries of executions
+                which failed together
+            retry_on: Exception types worth retrying, anything else is raised immediately
+            seed: Seed for the jitter, for reproducible waits
+
+        Raises:
+            ValueError: when attempts is less than 1 or a wait is negative
+        """
+        if attempts < 1:
+            raise ValueError("Retries need at least 1 attempt")
+        if initial < 0 or maximum < 0 or multiplier < 1:
+            raise ValueError("Retry waits should be non-negative and non-decreasing")
+        self.attempts = attempts
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on = retry_on
+        self._random = random.Random(seed)
+
+    def delay(self, retry: int) -> float:
+        """Seconds to wait before a retry
+
+        Args:
+            retry: Number of the retry, starting at 1
+
+        Returns:
+            The wait in seconds
+        """
+        backoff = min(self.maximum, self.initial * self.multiplier ** (retry - 1))
+        return self._random.uniform(0, backoff) if self.jitter else backoff
+
+    async def run(
+        self, execution: Callable[[], Awaitable[T]], *, abort_on: Tuple[Type[Exception], ...] = ()
+    ) -> T:
+        """Runs an execution, retrying it if it fails with a retryable exception
+
+        Args:
+            execution: Creates a new attempt of the execution
+            abort_on: Exception types which are never retried, even if they are among `retry_on`
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            Exception: the error of the last attempt, or of any attempt failing with a non-retryable error
+        """
+        for retry in range(1, self.attempts):
+            try:
+                return await execution()
+            except abort_on:
+                raise
+            except self.retry_on:
+                await asyncio.sleep(self.delay(retry))
+        return await execution()
@@ -1,11 +1,86 @@
-from collections.abc import Iterable
-from typing import Dict, List
+import concurrent.futures
+import glob
+import json
+import logging
+import os.path
+import time
+from collections.abc import Iterable, Iterator
+from typing import IO, Any, AnyStr, Dict, List, NamedTuple, Optional, Tuple, Union
 
+import yaml
 from pydantic import ValidationError
 
 from . import utils
 from .models import JSON, Rule, UserRule
 
+logger = logging.getLogger(__name__)
+
+
+class StreamEntry(NamedTuple):
+    """A single top-level entry produced while streaming a rules document
+
+    Fields:
+        key: Top-level key the entry belongs to
+        value: Parsed value. A `rules` list is yielded as a `[]` placeholder followed by one entry per rule
+        line: 1-indexed line the value starts on
+        position: Position of the rule within the `rules` list, `None` for top-level values
+    """
+
+    key: str
+    value: JSON
+    line: int
+    position: Optional[int] = None
+
+
+class RuleError(NamedTuple):
+    """A rule which failed validation whilst loading
+
+    Fields:
+        position: Position of the rule within the `rules` list
+        line: 1-indexed line the rule starts on, if known
+        name: Name of the rule, if one could be determined
+        message: Human-readable description of the failure
+        path: Path of the file the rule was loaded from, if loaded from a file
+    """
+
+    position: int
+    line: Optional[int]
+    name: Optional[str]
+    message: str
+    path: Optional[str] = None
+
+    def __str__(self) -> str:
+        location = f"line {self.line}" if self.line is not None else f"position {self.position}"
+        if self.path is not None:
+            location = f"{self.path}, {location}"
+        return f"{self.name or f'<anonymous rule {self.position}>'} ({location}): {self.message}"
+
+
+class LoadedRuleFile(NamedTuple):
+    """Rules loaded from a single file
+
+    Fields:
+        path: Path of the file
+        rules: Rules loaded from the file, in order
+        elapsed: Wall time in seconds taken to read, parse and resolve the file
+    """
+
+    path: str
+    rules: List[Rule]
+    elapsed: float
+
+
+class RuleValidationError(ValueError):
+    """Raised when one or more rules fail validation during a streaming load"""
+
+    def __init__(self, errors: List[RuleError]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} invalid rule(s): " + "; ".join(str(error) for error in errors))
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Rebuilt from the errors rather than the message, e.g. when returned from a process pool
+        return (type(self), (self.errors,))
+
 
 def resolve_user_rule(user_rule: UserRule, policy_names: Iterable[str]) -> Rule:
     """Resolves optional fields on a UserRule to produce a concrete Rule
@@ -28,6 +103,17 @@ def resolve_user_rule(user_rule: UserRule, policy_names: Iterable[str]) -> Rule:
     )
 
 
+def _parse_user_rule(index: int, rule: JSON) -> UserRule:
+    """Validates a single raw rule, raising TypeError or ValueError when it is malformed"""
+    if not isinstance(rule, dict):
+        raise TypeError(f"`rule` {index} should be a dict")
+
+    try:
+        return UserRule(**rule)
+    except ValidationError as e:
+        raise ValueError(f'Invalid rule {rule.get("name", f"<anonymous rule {index}>")}') from e
+
+
 def load_v1(rules: Dict[str, JSON], policy_names: Iterable[str]) -> List[Rule]:
     """Loads human-friendly rules using the v1 layout"""
 
@@ -37,19 +123,19 @@ def load_v1(rules: Dict[str, JSON], policy_names: Iterable[str]) -> List[Rule]:
         raise TypeError("`rules` should be a list of rules")
 
     raw_rules: Iterable[JSON] = rules["rules"]
-    user_rules: List[UserRule] = []
-    for i, rule in enumerate(raw_rules):
-        if not isinstance(rule, dict):
-            raise TypeError(f"`rule` {i} should be a dict")
-
-        try:
-            user_rules.append(UserRule(**rule))
-        except ValidationError as e:
-            raise ValueError(f'Invalid rule {rule.get("name", f"<anonymous rule {i}>")}') from e
+    user_rules: List[UserRule] = [_parse_user_rule(i, rule) for i, rule in enumerate(raw_rules)]
 
     return [resolve_user_rule(rule, policy_names) for rule in user_rules]
 
 
+def _major_version(version: JSON) -> str:
+    """Extracts the major version of a rules document, raising NotImplementedError if unsupported"""
+    major_version = str(version).split(".")[0]
+    if major_version != "1":
+        raise NotImplementedError(f"Unsupported major version {major_version}")
+    return major_version
+
+
 def load(rules: Dict[str, JSON], policy_names: Iterable[str]) -> List[Rule]:
     """Loads human-friendly rules into a internal representation
 
@@ -67,9 +153,312 @@ def load(rules: Dict[str, JSON], policy_names: Iterable[str]) -> List[Rule]:
     if "version" not in rules:
         raise AttributeError("`version` not found in rules")
 
-    major_version = str(rules["version"]).split(".")[0]
+    _major_version(rules["version"])
+    return load_v1(rules, policy_names)
 
-    if major_version == "1":
-        return load_v1(rules, policy_names)
-    else:
-        raise NotImplementedError(f"Unsupported major version {major_version}")
+
+def iter_load_stream(entries: Iterable[StreamEntry], policy_names: Iterable[str]) -> Iterator[Rule]:
+    """Validates and resolves streamed rules one at a time
+
+    Unlike `load`, invalid rules do not abort loading immediately. Every rule is validated and all failures
+    are raised together once the stream is exhausted.
+
+    Args:
+        entries: Entries produced by `iter_json_entries` or `iter_yaml_entries`
+        policy_names: Names of the policies to use during rule resolution
+
+    Returns:
+        An iterator of internal rule representations
+
+    Raises:
+        AttributeError: when a version or the rules list is missing
+        NotImplementedError: when the major version is not supported
+        TypeError: when `rules` is not a list
+        ValueError: when `rules` is defined more than once
+        RuleValidationError: when one or more rules are invalid
+    """
+
+    policy_names = list(policy_names)
+    has_version = False
+    has_rules = False
+    errors: List[RuleError] = []
+
+    for entry in entries:
+        if entry.key == "version":
+            _major_version(entry.value)
+            has_version = True
+        elif entry.key == "rules" and entry.position is None:
+            # Loading the whole document would only keep the last list, whose rules have not been read yet
+            if has_rules:
+                raise ValueError(f"`rules` is defined more than once (line {entry.line})")
+            if not isinstance(entry.value, list):
+                raise TypeError("`rules` should be a list of rules")
+            has_rules = True
+        elif entry.key == "rules" and entry.position is not None:
+            try:
+                user_rule = _parse_user_rule(entry.position, entry.value)
+            except (TypeError, ValueError) as e:
+                errors.append(_rule_error(entry, e))
+                continue
+            # Keep validating once something has failed, but there is no point resolving further rules
+            if not errors:
+                yield resolve_user_rule(user_rule, policy_names)
+
+    if not has_version:
+        raise AttributeError("`version` not found in rules")
+    if not has_rules:
+        raise AttributeError("`rules` list not found in rules")
+    if errors:
+        raise RuleValidationError(errors)
+
+
+def _rule_error(entry: StreamEntry, error: Exception) -> RuleError:
+    """Describes a streamed rule which failed validation"""
+    assert entry.position is not None
+    name = entry.value.get("name") if isinstance(entry.value, dict) else None
+    message = str(error)
+    if isinstance(error.__cause__, ValidationError):
+        message = "; ".join(
+            f"{'.'.join(str(loc) for loc in detail['loc'])}: {detail['msg']}"
+            for detail in error.__cause__.errors()
+        )
+    return RuleError(
+        position=entry.position,
+        line=entry.line,
+        name=name if isinstance(name, str) else None,
+        message=message,
+    )
+
+
+def iter_json_entries(
+    file: IO[AnyStr], *, chunk_size: int = utils.STREAM_CHUNK_SIZE
+) -> Iterator[StreamEntry]:
+    """Incrementally parses a JSON rules document, yielding each rule as soon as it is read
+
+    Args:
+        file: File handle of the json document
+        chunk_size: Number of characters to read from the file at a time
+
+    Returns:
+        An iterator of top-level entries and rules
+
+    Raises:
+        ValueError: when the document is not valid JSON, or anything follows the document
+    """
+
+    reader = utils.JSONStreamReader(file, chunk_size=chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        # Values are preceded by whitespace, which is skipped so that the line is that of the value itself
+        reader.peek()
+        line = reader.line
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError(f"Expected an object key at line {line}")
+        reader.expect(":")
+
+        if key == "rules" and reader.peek() == "[":
+            yield StreamEntry(key, [], reader.line)
+            reader.expect("[")
+            if reader.peek() != "]":
+                index = 0
+                while True:
+                    reader.peek()
+                    line = reader.line
+                    yield StreamEntry(key, reader.value(), line, index)
+                    index += 1
+                    if reader.peek() != ",":
+                        break
+                    reader.expect(",")
+            reader.expect("]")
+        else:
+            reader.peek()
+            line = reader.line
+            yield StreamEntry(key, reader.value(), line)
+
+        if reader.peek() != ",":
+            break
+        reader.expect(",")
+    reader.expect("}")
+    reader.end()
+
+
+def iter_yaml_entries(file: IO[AnyStr]) -> Iterator[StreamEntry]:
+    """Incrementally parses a YAML rules document, composing one rule at a time
+
+    Args:
+        file: File handle of the yaml document
+
+    Returns:
+        An iterator of top-level entries and rules
+
+    Raises:
+        TypeError: when the document is not a mapping
+        yaml.YAMLError: when the document is not valid YAML
+    """
+
+    loader: Any = yaml.SafeLoader(file)
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            return
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise TypeError("rules document should be a mapping")
+        loader.get_event()
+
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = loader.construct_document(loader.compose_node(None, None))
+            line = loader.peek_event().start_mark.line + 1
+
+            if key == "rules" and loader.check_event(yaml.SequenceStartEvent):
+                yield StreamEntry(key, [], line)
+                loader.get_event()
+                index = 0
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    node = loader.compose_node(None, None)
+                    yield StreamEntry(key, loader.construct_document(node), node.start_mark.line + 1, index)
+                    index += 1
+                loader.get_event()
+            else:
+                node = loader.compose_node(None, None)
+                yield StreamEntry(key, loader.construct_document(node), line)
+    finally:
+        loader.dispose()
+
+
+def expand_paths(patterns: Union[str, Iterable[str]]) -> List[str]:
+    """Expands glob patterns into a sorted, de-duplicated list of file paths
+
+    Args:
+        patterns: A glob pattern or list of glob patterns. `**` matches recursively
+
+    Returns:
+        Matching file paths in a deterministic order
+
+    Raises:
+        FileNotFoundError: when a pattern does not match any file
+    """
+
+    paths: set[str] = set()
+    for pattern in [patterns] if isinstance(patterns, str) else patterns:
+        matches = [path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)]
+        if not matches:
+            raise FileNotFoundError(f"No rule files found matching {pattern}")
+        paths.update(os.path.normpath(path) for path in matches)
+    return sorted(paths)
+
+
+def load_file(path: str, policy_names: Iterable[str], *, stream: bool = False) -> LoadedRuleFile:
+    """Loads rules from a json or yaml file, choosing the format from the file extension
+
+    Args:
+        path: Path of the file to load. Files ending in `.json` are read as json, anything else as yaml
+        policy_names: Names of the policies to use during rule resolution
+        stream: Parse and resolve rules one at a time rather than loading the whole document
+
+    Returns:
+        The rules loaded from the file along with the time taken to load them
+
+    Raises:
+        RuleValidationError: when streaming and one or more rules are invalid, with errors naming the file
+    """
+
+    start = time.perf_counter()
+    is_json = path.lower().endswith(".json")
+    with open(path, "r") as f:
+        if stream:
+            entries = iter_json_entries(f) if is_json else iter_yaml_entries(f)
+            try:
+                loaded = list(iter_load_stream(entries, policy_names))
+            except RuleValidationError as e:
+                raise RuleValidationError([error._replace(path=path) for error in e.errors]) from None
+        else:
+            loaded = load(json.load(f) if is_json else yaml.safe_load(f), policy_names)
+    return LoadedRuleFile(path=path, rules=loaded, elapsed=time.perf_counter() - start)
+
+
+def load_files(
+    paths: Iterable[str],
+    policy_names: Iterable[str],
+    *,
+    max_workers: Optional[int] = None,
+    processes: bool = False,
+    stream: bool = False,
+) -> List[LoadedRuleFile]:
+    """Loads several rule files concurrently
+
+    Args:
+        paths: Paths of the files to load
+        policy_names: Names of the policies to use during rule resolution
+        max_workers: Maximum number of files to load at once, defaults to the executor's default
+        processes: Load files in a process pool rather than a thread pool. This avoids contention on the GIL
+            when parsing many large files
+        stream: Parse and resolve rules one at a time rather than loading whole documents
+
+    Returns:
+        The loaded files, in the same order as `paths`
+
+    Raises:
+        RuleValidationError: when streaming and rules in one or more files are invalid. Invalid rules of
+            every file are reported together
+    """
+
+    paths = list(paths)
+    policy_names = list(policy_names)
+    executor_cls = (
+        concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    )
+
+    with executor_cls(max_workers=max_workers) as executor:
+        futures = [executor.submit(load_file, path, policy_names, stream=stream) for path in paths]
+        loaded_files: List[LoadedRuleFile] = []
+        errors: List[RuleError] = []
+        for future in futures:
+            try:
+                loaded_files.append(future.result())
+            except RuleValidationError as e:
+                errors.extend(e.errors)
+    if errors:
+        raise RuleValidationError(errors)
+
+    for loaded_file in loaded_files:
+        logger.debug(
+            "Loaded %d rule(s) from %s in %.3fs",
+            len(loaded_file.rules),
+            loaded_file.path,
+            loaded_file.elapsed,
+        )
+    return loaded_files
+
+
+def merge_files(loaded_files: Iterable[LoadedRuleFile]) -> List[Rule]:
+    """Concatenates rules from several files, ensuring that rule names are unique
+
+    Args:
+        loaded_files: Files to merge, in the order their rules should appear
+
+    Returns:
+        Rules from every file, in order
+
+    Raises:
+        ValueError: when the same rule name is defined more than once
+    """
+
+    merged: List[Rule] = []
+    origins: Dict[str, str] = {}
+    duplicates: List[str] = []
+    for loaded_file in loaded_files:
+        for rule in loaded_file.rules:
+            if rule.name in origins:
+                duplicates.append(f"{rule.name} ({origins[rule.name]}, {loaded_file.path})")
+            else:
+                origins[rule.name] = loaded_file.path
+            merged.append(rule)
+
+    if duplicates:
+        raise ValueError(f"Duplicate rule names: {', '.join(duplicates)}")
+    return merged
@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import enum
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncIterator
+from typing import List, NamedTuple, Optional, Tuple
+
+DEFAULT_CONCURRENCY = 64
+
+
+class Priority(enum.IntEnum):
+    """Priority classes of evaluations, lower values are admitted first
+
+    Any integer can be used as a priority, these are the classes used by default.
+    """
+
+    INTERACTIVE = 0
+    BATCH = 10
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a policy execution is not admitted before its request's deadline"""
+
+
+class Request(NamedTuple):
+    """Priority and deadline shared by every policy execution of an evaluation"""
+
+    priority: int
+    deadline: Optional[float]  # time.monotonic() by which executions must be admitted
+
+    @classmethod
+    def create(cls, priority: int, timeout: Optional[float] = None) -> "Request":
+        """Creates a request
+
+        Args:
+            priority: Priority of the request
+            timeout: Seconds from now by which executions must be admitted, or None to wait indefinitely
+
+        Returns:
+            The request
+        """
+        return cls(priority, None if timeout is None else time.monotonic() + timeout)
+
+
+class Scheduler:
+    """Admits policy executions by priority, then deadline, then arrival
+
+    Only `concurrency` executions run at once, the rest wait to be admitted. Executions of a higher priority
+    request are admitted ahead of every waiting execution of a lower priority request, so interactive
+    evaluations are not queued behind batch evaluations sharing the scheduler. Executions not admitted by
+    their request's deadline are dropped with a `DeadlineExceeded` error.
+
+    Pylicy only holds a slot while an attempt of a policy is actually running, not while the attempt waits
+    for its policy's limits or backs off before a retry.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY):
+        """
+        Args:
+            concurrency: Maximum number of policy executions to run at once
+
+        Raises:
+            ValueError: when concurrency is not positive
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency should be at least 1")
+        self.concurrency = concurrency
+        self._running = 0
+        self._waiting: List[Tuple[int, float, int, "asyncio.Future[None]"]] = []
+        self._arrivals = itertools.count()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, waiter in self._waiting if not waiter.done())
+
+    async def admit(self, request: Request) -> None:
+        """Waits until an execution is admitted, which must be followed by `release` once it completes
+
+        Args:
+            request: Request the execution belongs to
+
+        Raises:
+            DeadlineExceeded: when the request's deadline passes before the execution is admitted
+        """
+        now = time.monotonic()
+        if request.deadline is not None and request.deadline <= now:
+            raise DeadlineExceeded("Deadline passed before the policy execution was admitted")
+        while self._waiting and self._waiting[0][3].done():
+            heapq.heappop(self._waiting)  # Expired or cancelled waiters are only removed lazily
+        if self._running < self.concurrency and not self._waiting:
+            self._running += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter: "asyncio.Future[None]" = loop.create_future()
+        deadline = math.inf if request.deadline is None else request.deadline
+        heapq.heappush(self._waiting, (request.priority, deadline, next(self._arrivals), waiter))
+        timer = None if request.deadline is None else loop.call_later(deadline - now, _expire, waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                # Admitted just as the wait was cancelled, pass the slot on
+                self.release()
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+    @contextlib.asynccontextmanager
+    async def admitted(self, request: Request) -> AsyncIterator[None]:
+        """Holds a slot for the duration of a single execution, see `admit`
+
+        Args:
+            request: Request the execution belongs to
+        """
+        await self.admit(request)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def release(self) -> None:
+        """Frees the slot of an admitted execution, admitting the next waiting execution"""
+        self._running -= 1
+        while self._waiting and self._running < self.concurrency:
+            *_, waiter = heapq.heappop(self._waiting)
+            if not waiter.done():
+                self._running += 1
+                waiter.set_result(None)
+
+
+def _expire(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_exception(DeadlineExceeded("Deadline passed before the policy execution was admitted"))
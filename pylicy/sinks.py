@@ -0,0 +1,176 @@
+import abc
+import csv
+import importlib
+import json
+from types import TracebackType
+from typing import IO, Any, Dict, List, Optional, Tuple, Type, Union
+
+from . import decisions
+from .models import JSON, ResourceResult
+
+pyarrow: Optional[Any]
+try:
+    pyarrow = importlib.import_module("pyarrow")
+    importlib.import_module("pyarrow.parquet")
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+DEFAULT_BUFFER_SIZE = 1000
+
+COLUMNS = ("resource_id", "policy", "rule", "action", "reason", "detail")
+
+ResultRow = Tuple[str, str, str, str, Optional[str], JSON]
+
+
+class ResultSink(abc.ABC):
+    """Destination which results are written to incrementally
+
+    Results are flattened into one row per resource and policy (see `COLUMNS`) and buffered, being written
+    in bulk once `buffer_size` rows are pending. Resources with an empty plan do not produce any rows.
+    """
+
+    def __init__(self, *, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Args:
+            buffer_size: Number of rows to buffer before they are written
+        """
+        self.buffer_size = buffer_size
+        self._buffer: List[ResultRow] = []
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of rows waiting to be written"""
+        return len(self._buffer)
+
+    def write(self, result: ResourceResult) -> None:
+        """Buffers the rows of a result
+
+        Args:
+            result: Result to write
+        """
+        if self._closed:
+            raise ValueError("Cannot write to a closed sink")
+
+        for step in result.plan:
+            decision = result.decisions[step.policy_name]
+            self._buffer.append(
+                (
+                    result.resource_id,
+                    step.policy_name,
+                    step.rule.name,
+                    decision.action.value,
+                    decision.reason,
+                    decisions.encode_detail(decision.detail),
+                )
+            )
+
+    def flush(self) -> None:
+        """Writes all buffered rows"""
+        if self._buffer:
+            rows, self._buffer = self._buffer, []
+            self._write_rows(rows)
+
+    def close(self) -> None:
+        """Flushes buffered rows and releases any underlying resources"""
+        if not self._closed:
+            self.flush()
+            self._close()
+            self._closed = True
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: List[ResultRow]) -> None:
+        """Writes rows to the underlying destination"""
+
+    def _close(self) -> None:
+        """Releases underlying resources"""
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class _FileSink(ResultSink):
+    """Sink writing to a text file, which is only closed if it was opened by the sink"""
+
+    def __init__(self, file: Union[str, IO[str]], *, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size=buffer_size)
+        self._owns_file = isinstance(file, str)
+        self._file: IO[str] = open(file, "w", newline="") if isinstance(file, str) else file
+
+    def _close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class JSONLinesSink(_FileSink):
+    """Writes each row as a json object on its own line"""
+
+    def _write_rows(self, rows: List[ResultRow]) -> None:
+        self._file.write("".join(json.dumps(dict(zip(COLUMNS, row))) + "\n" for row in rows))
+
+
+class CSVSink(_FileSink):
+    """Writes rows as csv with a header, json encoding each decision's detail"""
+
+    def __init__(self, file: Union[str, IO[str]], *, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(file, buffer_size=buffer_size)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def _write_rows(self, rows: List[ResultRow]) -> None:
+        self._writer.writerows(row[:-1] + ("" if row[-1] is None else json.dumps(row[-1]),) for row in rows)
+
+
+class ParquetSink(ResultSink):
+    """Writes rows as columnar record batches to a parquet file
+
+    Requires the optional `pyarrow` dependency. Each flush writes a single row group, so `buffer_size`
+    controls the row group size. Decision details are stored as json encoded strings.
+    """
+
+    def __init__(self, path: str, *, buffer_size: int = 64 * 1024):
+        """
+        Args:
+            path: Path of the parquet file to write
+            buffer_size: Number of rows to buffer before they are written as a row group
+
+        Raises:
+            ImportError: when pyarrow is not installed
+        """
+        if pyarrow is None:
+            raise ImportError("ParquetSink requires pyarrow to be installed")
+
+        super().__init__(buffer_size=buffer_size)
+        self._schema = pyarrow.schema(
+            [
+                ("resource_id", pyarrow.string()),
+                ("policy", pyarrow.string()),
+                ("rule", pyarrow.string()),
+                ("action", pyarrow.string()),
+                ("reason", pyarrow.string()),
+                ("detail", pyarrow.string()),
+            ]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def _write_rows(self, rows: List[ResultRow]) -> None:
+        assert pyarrow is not None
+        columns: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+        for row in rows:
+            for column, value in zip(COLUMNS[:-1], row):
+                columns[column].append(value)
+            columns["detail"].append(None if row[-1] is None else json.dumps(row[-1]))
+        self._writer.write_batch(pyarrow.RecordBatch.from_pydict(columns, schema=self._schema))
+
+    def _close(self) -> None:
+        self._writer.close()
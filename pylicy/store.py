@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import tempfile
+import weakref
+from collections.abc import Callable, ItemsView, Iterator, Mapping
+from types import TracebackType
+from typing import Any, Dict, Optional, Tuple, Type
+
+from . import decisions as decisions_
+from .models import PolicyDecision, ResourceResult
+
+DEFAULT_MEMORY_BUDGET = 100_000
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS results (resource_id TEXT PRIMARY KEY, decisions TEXT NOT NULL)"
+
+Decisions = Dict[str, PolicyDecision]
+
+
+class ResultStore(Mapping[str, Decisions]):
+    """Read-only mapping of resource ids to their decisions, spilling to SQLite once too large for memory
+
+    Results are held in memory until more than `memory_budget` decisions have been added, at which point
+    they are written to a database and memory only buffers the next `memory_budget` decisions. Results
+    without any decisions count as one decision, so that they are still bounded by the budget. Reads see
+    every added result wherever it is held, with results added later replacing earlier results for the same
+    id.
+    """
+
+    def __init__(self, path: Optional[str] = None, *, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        """
+        Args:
+            path: Database file to spill to, created if it does not exist and replacing any results already
+                in it. A temporary file deleted on `close` is used if omitted
+            memory_budget: Number of decisions to hold in memory before spilling to the database
+
+        Raises:
+            ValueError: when memory_budget is not positive
+        """
+        if memory_budget < 1:
+            raise ValueError("memory_budget should be at least 1")
+        self.memory_budget = memory_budget
+        self._path = path
+        self._memory: Dict[str, Decisions] = {}
+        self._held = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._finalizer: Optional[Callable[[], Any]] = None
+
+    @property
+    def spilled(self) -> bool:
+        """Whether results have been written to the database"""
+        return self._connection is not None
+
+    def add(self, result: ResourceResult) -> None:
+        """Adds the decisions of a result, spilling to the database if the memory budget is exceeded
+
+        Args:
+            result: Result to add
+        """
+        previous = self._memory.get(result.resource_id)
+        if previous is not None:
+            self._held -= _cost(previous)
+        self._memory[result.resource_id] = result.decisions
+        self._held += _cost(result.decisions)
+        if self._held > self.memory_budget:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes every result held in memory to the database"""
+        if not self._memory:
+            return
+        connection = self._connect()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO results (resource_id, decisions) VALUES (?, ?)",
+                [(resource_id, _encode(decisions)) for resource_id, decisions in self._memory.items()],
+            )
+        self._memory.clear()
+        self._held = 0
+
+    def close(self) -> None:
+        """Closes the database, deleting it if it was temporary. Results held in memory are discarded"""
+        if self._finalizer is not None:
+            self._finalizer()
+        self._connection = None
+        self._finalizer = None
+        self._memory.clear()
+        self._held = 0
+
+    def items(self) -> ItemsView[str, Decisions]:
+        return _ResultItems(self)
+
+    def __getitem__(self, resource_id: str) -> Decisions:
+        decisions = self._memory.get(resource_id)
+        if decisions is not None:
+            return decisions
+        if self._connection is not None:
+            row = self._connection.execute(
+                "SELECT decisions FROM results WHERE resource_id = ?", (resource_id,)
+            ).fetchone()
+            if row is not None:
+                return _decode(row[0])
+        raise KeyError(resource_id)
+
+    def __contains__(self, resource_id: object) -> bool:
+        return resource_id in self._memory or (
+            self._connection is not None
+            and self._connection.execute(
+                "SELECT 1 FROM results WHERE resource_id = ?", (resource_id,)
+            ).fetchone()
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        if self._connection is None:
+            return iter(list(self._memory))
+        self.flush()
+        return (
+            resource_id for (resource_id,) in self._connection.execute("SELECT resource_id FROM results")
+        )
+
+    def __len__(self) -> int:
+        if self._connection is None:
+            return len(self._memory)
+        self.flush()
+        (count,) = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return int(count)
+
+    def _iter_items(self) -> Iterator[Tuple[str, Decisions]]:
+        if self._connection is None:
+            yield from list(self._memory.items())
+            return
+        self.flush()
+        for resource_id, encoded in self._connection.execute("SELECT resource_id, decisions FROM results"):
+            yield resource_id, _decode(encoded)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        if self._path is None:
+            descriptor, path = tempfile.mkstemp(prefix="pylicy-", suffix=".db")
+            os.close(descriptor)
+        else:
+            path = self._path
+        connection = sqlite3.connect(path)
+        with connection:
+            connection.execute(_SCHEMA)
+            connection.execute("DELETE FROM results")
+        self._connection = connection
+        self._finalizer = weakref.finalize(self, _cleanup, connection, path if self._path is None else None)
+        return connection
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+class _ResultItems(ItemsView[str, Decisions]):
+    """Items of a store, decoding spilled results in one pass rather than looking up each id"""
+
+    _mapping: ResultStore
+
+    def __iter__(self) -> Iterator[Tuple[str, Decisions]]:
+        return self._mapping._iter_items()
+
+
+def _cost(decisions: Decisions) -> int:
+    return max(len(decisions), 1)
+
+
+def _encode(decisions: Decisions) -> str:
+    return json.dumps({name: decisions_.encode(decision) for name, decision in decisions.items()})
+
+
+def _decode(encoded: str) -> Decisions:
+    return {name: decisions_.decode(decision) for name, decision in json.loads(encoded).items()}
+
+
+def _cleanup(connection: sqlite3.Connection, temporary: Optional[str]) -> None:
+    connection.close()
+    if temporary is not None:
+        os.remove(temporary)
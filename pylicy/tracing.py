@@ -0,0 +1,114 @@
+import contextlib
+import contextvars
+import importlib
+import random
+from collections.abc import Awaitable, Iterator
+from typing import Any, Dict, Optional
+
+from .models import PolicyDecision
+
+otel_trace: Optional[Any]
+try:
+    otel_trace = importlib.import_module("opentelemetry.trace")
+except ImportError:  # pragma: no cover
+    otel_trace = None
+
+AttributeValue = Any
+
+# Whether the current task is within a `pylicy.execute` span, i.e. evaluating a sampled resource
+_executing: "contextvars.ContextVar[bool]" = contextvars.ContextVar("pylicy_executing", default=False)
+
+
+class Tracing:
+    """Emits OpenTelemetry spans around policy evaluation
+
+    A span is created per `apply_all`, per sampled resource (`pylicy.apply`), per policy executed for a
+    sampled resource (`pylicy.execute`) and per wait for a scheduler slot within it (`pylicy.schedule`).
+    When opentelemetry is not installed tracing is disabled and Pylicy skips it entirely.
+    """
+
+    def __init__(
+        self,
+        *,
+        tracer: Optional[Any] = None,
+        tracer_provider: Optional[Any] = None,
+        resource_sample_rate: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            tracer: Tracer to create spans with, defaults to a `pylicy` tracer from `tracer_provider`
+            tracer_provider: Provider to get the default tracer from, defaults to the global provider
+            resource_sample_rate: Fraction of resources to create `pylicy.apply` and `pylicy.execute` spans
+                for. Lower rates keep tracing overhead bounded on very large runs
+            seed: Seed for sampling, for reproducible traces
+        """
+        if not 0.0 <= resource_sample_rate <= 1.0:
+            raise ValueError("resource_sample_rate should be between 0 and 1")
+
+        self.resource_sample_rate = resource_sample_rate
+        self._random = random.Random(seed)
+        self._tracer: Optional[Any] = None
+        if otel_trace is not None:
+            self._tracer = tracer or otel_trace.get_tracer("pylicy", tracer_provider=tracer_provider)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a tracing library is available"""
+        return self._tracer is not None
+
+    def sample_resource(self) -> bool:
+        """Decides whether spans should be created for a resource"""
+        return self.resource_sample_rate >= 1.0 or self._random.random() < self.resource_sample_rate
+
+    @contextlib.contextmanager
+    def span(self, name: str, attributes: Dict[str, AttributeValue]) -> Iterator[Optional[Any]]:
+        """Creates a span, or does nothing if tracing is disabled
+
+        Args:
+            name: Name of the span
+            attributes: Attributes to attach to the span
+
+        Returns:
+            A context manager producing the span
+        """
+        if self._tracer is None:
+            yield None
+            return
+        with self._tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+    async def execute(
+        self, execution: Awaitable[PolicyDecision], attributes: Dict[str, AttributeValue]
+    ) -> PolicyDecision:
+        """Awaits a policy execution inside a `pylicy.execute` span, recording the decision's action
+
+        Args:
+            execution: Policy execution to await
+            attributes: Attributes to attach to the span
+
+        Returns:
+            The policy decision
+        """
+        with self.span("pylicy.execute", attributes) as span:
+            token = _executing.set(True)
+            try:
+                decision = await execution
+            finally:
+                _executing.reset(token)
+            if span is not None:
+                span.set_attribute("pylicy.decision.action", decision.action.value)
+            return decision
+
+    async def schedule(self, admission: Awaitable[None], attributes: Dict[str, AttributeValue]) -> None:
+        """Awaits admission by a scheduler in a `pylicy.schedule` span, if within a `pylicy.execute` span
+
+        Args:
+            admission: Admission to await
+            attributes: Attributes to attach to the span
+        """
+        if not _executing.get():
+            await admission
+            return
+        with self.span("pylicy.schedule", attributes):
+            await admission
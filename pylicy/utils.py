@@ -1,43 +1,141 @@
+import codecs
 import fnmatch
+import json
 import operator
-from collections.abc import Iterable, Iterator
-from typing import List, Optional, TypeVar, Union
+import os.path
+import re
+import sys
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import IO, Any, AnyStr, Callable, List, Optional, Tuple, TypeVar, Union
+
+from .models import JSON
 
 T = TypeVar("T")
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+REGEX_PREFIX = "regex:"
+
+# fnmatch.filter normalises case on case-insensitive platforms, compiled patterns must do the same
+_NORMALISE_CASE = os.path.normcase("A") != "A"
+
 
 class PatternMatches:
-    """Represents a result of a match_patterns operation"""
+    """Represents a result of a match_patterns operation
+
+    Matches are stored as bitmasks over the positions of the matched items, and the lists and sets exposed
+    are only built on first use. Results over the same items can be combined with `&` and `|` without
+    building any lists.
+    """
+
+    __slots__ = (
+        "_items",
+        "_include_mask",
+        "_matched_mask",
+        "_include",
+        "_exclude",
+        "_matched",
+        "_include_set",
+    )
 
     def __init__(self, include: set[str], matched: set[str], *, all: Optional[List[str]] = None):
-        self._include = include
-        self._matched = matched
-        self._all = all
+        items = tuple(all) if all is not None else tuple(matched | include)
+        self._init(
+            items, _to_mask(item in include for item in items), _to_mask(item in matched for item in items)
+        )
+
+    def _init(self, items: Tuple[str, ...], include_mask: int, matched_mask: int) -> None:
+        self._items = items
+        self._include_mask = include_mask
+        self._matched_mask = matched_mask | include_mask
+        self._include: Optional[List[str]] = None
+        self._exclude: Optional[List[str]] = None
+        self._matched: Optional[List[str]] = None
+        self._include_set: Optional[frozenset[str]] = None
+
+    @classmethod
+    def from_masks(cls, items: Tuple[str, ...], include_mask: int, matched_mask: int) -> "PatternMatches":
+        """Creates matches from bitmasks, where bit i is set if items[i] is included or matched
+
+        Args:
+            items: Ordered items which were matched against
+            include_mask: Bitmask of the included items
+            matched_mask: Bitmask of the items matched by any pattern, whether included or excluded
+
+        Returns:
+            The matches
+        """
+        matches = cls.__new__(cls)
+        matches._init(items, include_mask, matched_mask)
+        return matches
+
+    @property
+    def items(self) -> Tuple[str, ...]:
+        return self._items
+
+    @property
+    def include_mask(self) -> int:
+        return self._include_mask
+
+    @property
+    def matched_mask(self) -> int:
+        return self._matched_mask
+
+    @property
+    def exclude_mask(self) -> int:
+        return self._matched_mask & ~self._include_mask
 
     @property
     def include(self) -> List[str]:
-        return self._set_to_list(self._include)
+        if self._include is None:
+            self._include = self._mask_to_list(self._include_mask)
+        return self._include
 
     @property
     def exclude(self) -> List[str]:
-        return self._set_to_list(self._matched - self._include)
+        if self._exclude is None:
+            self._exclude = self._mask_to_list(self.exclude_mask)
+        return self._exclude
 
     @property
     def matched(self) -> List[str]:
-        return self._set_to_list(self._matched)
+        if self._matched is None:
+            self._matched = self._mask_to_list(self._matched_mask)
+        return self._matched
 
-    def _set_to_list(self, s: set[str]) -> List[str]:
-        return [e for e in self._all if e in s] if self._all is not None else list(s)
+    def _mask_to_list(self, mask: int) -> List[str]:
+        return [item for item, bit in zip(self._items, format(mask, "b")[::-1]) if bit == "1"]
 
-    def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, PatternMatches)
-            and other.include == self.include
-            and other.exclude == self.exclude
+    def _combine(self, other: "PatternMatches", operation: Callable[[int, int], int]) -> "PatternMatches":
+        if other._items != self._items:
+            raise ValueError("Only matches over the same items can be combined")
+        return PatternMatches.from_masks(
+            self._items,
+            operation(self._include_mask, other._include_mask),
+            operation(self._matched_mask, other._matched_mask),
         )
 
+    def __and__(self, other: "PatternMatches") -> "PatternMatches":
+        if not isinstance(other, PatternMatches):
+            return NotImplemented
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other: "PatternMatches") -> "PatternMatches":
+        if not isinstance(other, PatternMatches):
+            return NotImplemented
+        return self._combine(other, operator.or_)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PatternMatches):
+            return False
+        if other._items == self._items:
+            return other._include_mask == self._include_mask and other.exclude_mask == self.exclude_mask
+        return other.include == self.include and other.exclude == self.exclude
+
     def __contains__(self, key: str) -> bool:
-        return key in self._include
+        if self._include_set is None:
+            self._include_set = frozenset(self.include)
+        return key in self._include_set
 
     def __repr__(self) -> str:  # pragma: nocover
         return repr(self.include)
@@ -46,6 +144,195 @@ class PatternMatches:
         return iter(self.include)
 
 
+def _to_mask(flags: Iterable[bool]) -> int:
+    """Packs flags into a bitmask, where bit i is set if the i-th flag is true"""
+    return int("".join("1" if flag else "0" for flag in flags)[::-1] or "0", 2)
+
+
+class PatternSet:
+    """A precompiled list of patterns, matched against an item in a single regex scan
+
+    Every pattern is translated into a named group of one combined regex. Groups are ordered from the last
+    pattern to the first, so the group which matches is the last pattern to match the item, which decides
+    whether it is included. Matching an item gives the same result as checking whether it is included by
+    `match_patterns`.
+    """
+
+    __slots__ = ("patterns", "_regex", "_includes", "_default")
+
+    def __init__(self, patterns: Iterable[str], *, regex: bool = False):
+        """
+        Args:
+            patterns: Patterns to compile, optionally prefixed with `!` to exclude matches
+            regex: Also accept patterns of the form `regex:<expression>`, which must match the whole item.
+                Expressions are combined into a larger regex so cannot use numbered backreferences or global
+                inline flags
+
+        Raises:
+            re.error: when a regex pattern is invalid
+        """
+        self.patterns: Tuple[str, ...] = tuple(sys.intern(pattern) for pattern in patterns)
+        self._default = len(self.patterns) > 0 and self.patterns[0].startswith("!")
+        self._includes = [not pattern.startswith("!") for pattern in self.patterns]
+
+        groups = []
+        for position in reversed(range(len(self.patterns))):
+            pattern = self.patterns[position]
+            body = pattern if self._includes[position] else pattern[1:]
+            if regex and body.startswith(REGEX_PREFIX):
+                expression = f"(?:{body.partition(REGEX_PREFIX)[2]})\\Z"
+            else:
+                expression = fnmatch.translate(os.path.normcase(body))
+            groups.append(f"(?P<_{position}>{_rename_groups(expression, position)})")
+        self._regex = re.compile("|".join(groups)) if groups else None
+
+    def position(self, item: str) -> Optional[int]:
+        """Finds the last pattern matching an item
+
+        Args:
+            item: Item to match
+
+        Returns:
+            Index of the last matching pattern, or None if no pattern matches
+        """
+        if self._regex is None:
+            return None
+        if _NORMALISE_CASE:  # pragma: no cover
+            item = os.path.normcase(item)
+        found = self._regex.match(item)
+        return None if found is None else int(found.lastgroup[1:])  # type: ignore
+
+    def match(self, item: str) -> bool:
+        """Checks whether an item is included by the patterns"""
+        position = self.position(item)
+        return self._default if position is None else self._includes[position]
+
+    def __repr__(self) -> str:  # pragma: nocover
+        return f"PatternSet({list(self.patterns)!r})"
+
+
+def _rename_groups(expression: str, position: int) -> str:
+    """Prefixes named groups in a pattern's regex so they are unique within a combined regex"""
+    expression = re.sub(r"\(\?P<(\w+)>", rf"(?P<_{position}_\1>", expression)
+    return re.sub(r"\(\?P=(\w+)\)", rf"(?P=_{position}_\1)", expression)
+
+
+class JSONStreamReader:
+    """Incremental tokenizer reading JSON values from a file one chunk at a time"""
+
+    _WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, file: IO[Any], *, chunk_size: int = STREAM_CHUNK_SIZE):
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._bytes_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._consumed_lines = 0
+        self._eof = False
+
+    @property
+    def line(self) -> int:
+        return self._consumed_lines + self._buffer.count("\n", 0, self._pos) + 1
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Reads more of the file into the buffer, dropping anything already consumed"""
+        if self._eof:
+            return False
+
+        chunk = self._file.read(size or self._chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = self._bytes_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+            return False
+
+        self._consumed_lines += self._buffer.count("\n", 0, self._pos)
+        consumed = self._pos
+        self._buffer = self._buffer[consumed:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character, or an empty string at the end of the file"""
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or '<EOF>'}' at line {self.line}")
+        self._pos += 1
+
+    def end(self) -> None:
+        """Checks that nothing but whitespace is left in the file, as `json.load` does"""
+        if self.peek():
+            raise ValueError(f"Extra data at line {self.line}")
+
+    def value(self) -> JSON:
+        """Decodes the next JSON value, reading more of the file until the value is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # Grow geometrically so that very large values are not re-parsed once per chunk
+                if self._fill(max(self._chunk_size, len(self._buffer))):
+                    continue
+                raise ValueError(f"Invalid JSON at line {self.line}: {e.msg}") from e
+
+            # Scalars such as numbers may have been cut off at the end of the buffer
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            self._pos = end
+            return value  # type: ignore
+
+
+def iter_json_array(file: IO[AnyStr], *, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """Incrementally parses a JSON array, yielding each element as soon as it is read
+
+    Args:
+        file: File handle of the json document
+        chunk_size: Number of characters to read from the file at a time
+
+    Returns:
+        An iterator of array elements
+
+    Raises:
+        ValueError: when the document is not a valid JSON array, or anything follows the array
+    """
+
+    reader = JSONStreamReader(file, chunk_size=chunk_size)
+    reader.expect("[")
+    if reader.peek() != "]":
+        while True:
+            yield reader.value()
+            if reader.peek() != ",":
+                break
+            reader.expect(",")
+    reader.expect("]")
+    reader.end()
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Iterates over the positions of the set bits of a non-negative bitmask, from lowest to highest
+
+    Example:
+    >>> list(iter_bits(0b10110))
+    [1, 2, 4]
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
 def ensure_list(item: Union[List[T], T]) -> List[T]:
     """Ensure that a item is a list, converting it if it isn't already
 
@@ -73,11 +360,28 @@ def ensure_list(item: Union[List[T], T]) -> List[T]:
     return item if isinstance(item, list) else [item]
 
 
-def match_patterns(patterns: Iterable[str], items: Iterable[str]) -> PatternMatches:
+async def iterate(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """Iterate over either a synchronous or asynchronous iterable
+
+    Args:
+        items: Iterable or async iterable to iterate over
+
+    Returns:
+        An async iterator over the items
+    """
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def match_patterns(patterns: Union[Iterable[str], PatternSet], items: Iterable[str]) -> PatternMatches:
     """Match a list of strings against a list of patterns returning all matches
 
     Args:
-        patterns: A list of patterns to match
+        patterns: A list of patterns to match, or a precompiled PatternSet to scan each item only once
         items: A list of strings to match against
 
     Returns:
@@ -98,6 +402,9 @@ def match_patterns(patterns: Iterable[str], items: Iterable[str]) -> PatternMatc
         >>> match_patterns(["i*", "apple watch", "!*watch"], ["iphone", "ipad", "iwatch", "apple watch"])
         ["iphone", "ipad"]
     """
+    if isinstance(patterns, PatternSet):
+        return _match_pattern_set(patterns, items)
+
     patterns = list(patterns)
     if len(patterns) == 0:
         return PatternMatches(set(), set())
@@ -119,3 +426,14 @@ def match_patterns(patterns: Iterable[str], items: Iterable[str]) -> PatternMatc
         working_set = resolver_operator(working_set, operation_set)
 
     return PatternMatches(working_set, working_set | seen_set, all=all_items)
+
+
+def _match_pattern_set(patterns: PatternSet, items: Iterable[str]) -> PatternMatches:
+    all_items = tuple(items)
+    include_flags = []
+    matched_flags = []
+    for item in all_items:
+        position = patterns.position(item)
+        matched_flags.append(position is not None)
+        include_flags.append(patterns._default if position is None else patterns._includes[position])
+    return PatternMatches.from_masks(all_items, _to_mask(include_flags), _to_mask(matched_flags))
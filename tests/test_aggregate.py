@@ -0,0 +1,89 @@
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    aggregate,
+    policy,
+)
+from pylicy.models import ExecutionPlanStep, ResourceResult
+
+RULE_A = Rule(
+    name="rule_a", description="rule_a", weight=100, resource_patterns=["*"], policy_patterns=["*"]
+)
+RULE_B = Rule(
+    name="rule_b", description="rule_b", weight=100, resource_patterns=["*"], policy_patterns=["*"]
+)
+
+
+def _result(resource_id: str, *actions: PolicyDecisionAction) -> ResourceResult:
+    plan = [ExecutionPlanStep(f"policy_{i}", RULE_A if i == 0 else RULE_B) for i, _ in enumerate(actions)]
+    return ResourceResult(
+        resource_id=resource_id,
+        plan=plan,
+        decisions={step.policy_name: PolicyDecision(action=action) for step, action in zip(plan, actions)},
+    )
+
+
+def test_summary_counts() -> None:
+    summary = aggregate.Summary(top_n=2, prefix=aggregate.split_prefix("/"))
+    summary.add(_result("org_a/one", PolicyDecisionAction.DENY, PolicyDecisionAction.DENY))
+    summary.add(_result("org_a/two", PolicyDecisionAction.ALLOW, PolicyDecisionAction.DENY))
+    summary.add(_result("org_b/one", PolicyDecisionAction.WARN))
+    summary.add(_result("org_b/two", PolicyDecisionAction.DENY))
+    summary.add(_result("org_b/three"))
+
+    assert summary.to_dict() == {
+        "resources": 5,
+        "unmatched_resources": 1,
+        "by_policy": {"policy_0": {"deny": 2, "allow": 1, "warn": 1}, "policy_1": {"deny": 2}},
+        "by_rule": {"rule_a": {"deny": 2, "allow": 1, "warn": 1}, "rule_b": {"deny": 2}},
+        "by_prefix": {"org_a": {"deny": 3, "allow": 1}, "org_b": {"warn": 1, "deny": 1}},
+        "top_denied": [["org_a/one", 2], ["org_b/two", 1]],
+    }
+
+
+def test_summary_merge() -> None:
+    left = aggregate.Summary()
+    left.add(_result("a", PolicyDecisionAction.DENY))
+    right = aggregate.Summary()
+    right.add(_result("b", PolicyDecisionAction.DENY, PolicyDecisionAction.DENY))
+    right.add(_result("c"))
+
+    left.merge(right)
+    assert left.resources == 3
+    assert left.unmatched_resources == 1
+    assert left.by_policy["policy_0"] == {"deny": 2}
+    assert left.top_denied == [("b", 2), ("a", 1)]
+
+
+def test_summary_top_n_disabled() -> None:
+    summary = aggregate.Summary(top_n=0)
+    summary.add(_result("a", PolicyDecisionAction.DENY))
+    assert summary.top_denied == []
+
+
+@pytest.mark.asyncio
+async def test_pylicy_summarize() -> None:
+    scope = "test_pylicy_summarize"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.DENY if rsrc.data else PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["match_*"], policies=["my_policy"])], scope=scope
+    )
+
+    summary = await policies.summarize(
+        [Resource(id=f"match_{i}", data=i % 2) for i in range(4)] + [Resource(id="other", data=None)]
+    )
+    assert summary.resources == 5
+    assert summary.unmatched_resources == 1
+    assert summary.by_policy == {"my_policy": {"allow": 2, "deny": 2}}
+    assert summary.by_rule == {"simple_rule": {"allow": 2, "deny": 2}}
+    assert summary.top_denied == [("match_3", 1), ("match_1", 1)]
@@ -0,0 +1,67 @@
+import gc
+from collections.abc import Hashable
+from typing import Any, List, Union
+
+from pylicy import Pylicy, Rule, UserRule, cache, policy
+
+
+def test_compilation_cache_shares_entries() -> None:
+    compilation_cache = cache.CompilationCache()
+    keys_a: List[Hashable] = []
+    keys_b: List[Hashable] = []
+
+    matcher_a = compilation_cache.resource_matcher(["a_*", "!a_b"], keys=keys_a)
+    matcher_b = compilation_cache.resource_matcher(["a_*", "!a_b"], keys=keys_b)
+    assert matcher_a is matcher_b
+    assert matcher_a.match("a_a") and not matcher_a.match("a_b")
+
+    matches_a = compilation_cache.policy_matches(["*", "!x"], ("x", "y"), keys=keys_a)
+    assert compilation_cache.policy_matches(["*", "!x"], ("x", "y"), keys=keys_b) is matches_a
+    assert matches_a.include == ["y"]
+    assert compilation_cache.policy_matches(["*", "!x"], ("y", "x"), keys=keys_b) is not matches_a
+    assert len(compilation_cache) == 3
+
+    compilation_cache.release(keys_a)
+    assert len(compilation_cache) == 3
+    compilation_cache.release(keys_b)
+    assert len(compilation_cache) == 0
+
+
+def test_pylicy_shares_compilation_cache() -> None:
+    scope = "test_pylicy_shares_compilation_cache"
+
+    @policy.policy_checker("my_policy", scope=scope)
+    async def checker(_1: Any, __2: Any) -> Any:
+        pass
+
+    compilation_cache = cache.CompilationCache()
+    rules: List[Union[Rule, UserRule]] = [
+        UserRule(name="rule_a", resources=["a_*"], policies=["*"]),
+        UserRule(name="rule_b", resources=["b_*"], policies=["*"]),
+    ]
+
+    engines = [Pylicy(Pylicy.from_rules(rules, scope=scope).rules, scope=scope, cache=compilation_cache)]
+    assert len(compilation_cache) == 3
+    engines.append(Pylicy(engines[0].rules, scope=scope, cache=compilation_cache))
+    assert len(compilation_cache) == 3
+
+    engines.pop()
+    gc.collect()
+    assert len(compilation_cache) == 3
+    engines.pop()
+    gc.collect()
+    assert len(compilation_cache) == 0
+
+
+def test_compilation_cache_release_while_compiling() -> None:
+    compilation_cache = cache.CompilationCache()
+    released: List[Hashable] = []
+    compilation_cache.resource_matcher(["a_*"], keys=released)
+
+    # Garbage collection may finalize a Pylicy, releasing its entries, while another compiles its patterns
+    def compile_patterns() -> Any:
+        compilation_cache.release(released)
+        return object()
+
+    compilation_cache._acquire("key", compile_patterns, [])
+    assert len(compilation_cache) == 1
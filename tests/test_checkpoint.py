@@ -0,0 +1,94 @@
+import pathlib
+from typing import List
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    checkpoint,
+    policy,
+)
+
+SCOPE = "test_checkpoint"
+CALLS: List[str] = []
+
+
+@policy.policy_checker("checkpointed", scope=SCOPE)
+async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+    CALLS.append(rsrc.id)
+    if rsrc.id == "crash":
+        raise RuntimeError("interrupted")
+    return PolicyDecision(action=PolicyDecisionAction.DENY, reason=rsrc.id, detail={"size": rsrc.data})
+
+
+def _policies(resources: str = "*") -> Pylicy:
+    return Pylicy.from_rules([UserRule(name="rule", resources=[resources], policies=["*"])], scope=SCOPE)
+
+
+def test_checkpoint_records_results(tmp_path: pathlib.Path) -> None:
+    policies = _policies()
+    path = str(tmp_path / "checkpoint.db")
+    with checkpoint.Checkpoint(path, policies.fingerprint, commit_every=2) as recorded:
+        assert len(recorded) == 0
+        assert "a" not in recorded
+
+    with pytest.raises(ValueError):
+        checkpoint.Checkpoint(path, _policies("other_*").fingerprint)
+    with checkpoint.Checkpoint(path, "new fingerprint", resume=False) as recorded:
+        assert recorded.fingerprint == "new fingerprint"
+    assert _policies().fingerprint == policies.fingerprint
+
+
+@pytest.mark.asyncio
+async def test_pylicy_resumes_from_checkpoint(tmp_path: pathlib.Path) -> None:
+    policies = _policies()
+    path = str(tmp_path / "checkpoint.db")
+    resources = [Resource(id=f"resource_{i}", data=i) for i in range(5)]
+
+    CALLS.clear()
+    with checkpoint.Checkpoint(path, policies.fingerprint, commit_every=2) as recorded:
+        with pytest.raises(RuntimeError):
+            async for _ in policies.apply_iter(
+                [*resources[:3], Resource(id="crash")], concurrency=1, checkpoint=recorded
+            ):
+                pass
+    assert CALLS == ["resource_0", "resource_1", "resource_2", "crash"]
+
+    CALLS.clear()
+    with checkpoint.Checkpoint(path, policies.fingerprint) as recorded:
+        assert len(recorded) == 3
+        results = [result async for result in policies.apply_iter(resources, checkpoint=recorded)]
+        assert sorted(result.resource_id for result in results) == ["resource_3", "resource_4"]
+        assert CALLS == ["resource_3", "resource_4"]
+
+        previous = recorded.get("resource_1")
+        assert previous is not None
+        assert previous.decisions["checkpointed"] == PolicyDecision(
+            action=PolicyDecisionAction.DENY, reason="resource_1", detail={"size": 1}
+        )
+        assert [step.rule for step in previous.plan] == policies.rules
+
+        CALLS.clear()
+        assert await policies.apply_all(
+            [*resources, Resource(id="resource_5", data=5)], checkpoint=recorded
+        ) == {
+            f"resource_{i}": {
+                "checkpointed": PolicyDecision(
+                    action=PolicyDecisionAction.DENY, reason=f"resource_{i}", detail={"size": i}
+                )
+            }
+            for i in range(6)
+        }
+        assert CALLS == ["resource_5"]
+
+        summary = await policies.summarize([], checkpoint=recorded)
+        assert summary.resources == 6
+
+    with checkpoint.Checkpoint(path, "another configuration", resume=False) as recorded:
+        with pytest.raises(ValueError):
+            await policies.apply_all(resources, checkpoint=recorded)
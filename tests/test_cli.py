@@ -0,0 +1,184 @@
+import json
+import pathlib
+import textwrap
+from typing import Any, Dict, List
+
+import pytest
+
+from pylicy import cli, sinks
+
+POLICY_MODULE = textwrap.dedent("""
+    import pylicy
+
+    @pylicy.policy_checker("cli_token_age", scope="test_cli")
+    async def token_age(resource, rule):
+        if resource.data["age"] > 30:
+            return pylicy.PolicyDecision(action=pylicy.PolicyDecisionAction.DENY, reason="too old")
+        return pylicy.PolicyDecision(action=pylicy.PolicyDecisionAction.ALLOW)
+    """)
+
+RULES: Dict[str, Any] = {
+    "version": 1,
+    "rules": [{"name": "all_tokens", "resources": "*_token", "policies": "*"}],
+}
+
+RESOURCES = [
+    {"name": "new_token", "token": {"age": 1}},
+    {"name": "old_token", "token": {"age": 60}},
+    {"name": "not_a_match", "token": {"age": 60}},
+]
+
+
+@pytest.fixture
+def cli_files(tmp_path: pathlib.Path) -> pathlib.Path:
+    (tmp_path / "policies.py").write_text(POLICY_MODULE)
+    (tmp_path / "rules.json").write_text(json.dumps(RULES))
+    (tmp_path / "resources.jsonl").write_text("\n".join(json.dumps(resource) for resource in RESOURCES))
+    (tmp_path / "resources.json").write_text(json.dumps(RESOURCES))
+    return tmp_path
+
+
+def _run(tmp_path: pathlib.Path, *args: str) -> List[Dict[str, Any]]:
+    output = tmp_path / "results.jsonl"
+    base_args = [str(tmp_path / "rules.json"), "-p", str(tmp_path / "policies.py"), "-s", "test_cli"]
+    assert (
+        cli.main([*base_args, "--id-field", "name", "--data-field", "token", "-o", str(output), *args]) == 0
+    )
+    return sorted(
+        (json.loads(line) for line in output.read_text().splitlines()), key=lambda row: row["resource_id"]
+    )
+
+
+EXPECTED_ROWS = [
+    {
+        "resource_id": "new_token",
+        "policy": "cli_token_age",
+        "rule": "all_tokens",
+        "action": "allow",
+        "reason": None,
+        "detail": None,
+    },
+    {
+        "resource_id": "old_token",
+        "policy": "cli_token_age",
+        "rule": "all_tokens",
+        "action": "deny",
+        "reason": "too old",
+        "detail": None,
+    },
+]
+
+
+def test_cli_jsonl_input(cli_files: pathlib.Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert _run(cli_files, "-i", str(cli_files / "resources.jsonl")) == EXPECTED_ROWS
+
+    summary = capsys.readouterr().err
+    assert "Evaluated 3 resources (2 decisions)" in summary
+    assert "Actions: allow=1 deny=1" in summary
+
+
+def test_cli_summary(cli_files: pathlib.Path) -> None:
+    _run(cli_files, "-i", str(cli_files / "resources.jsonl"), "--summary", str(cli_files / "summary.json"))
+
+    summary = json.loads((cli_files / "summary.json").read_text())
+    assert summary["resources"] == 3
+    assert summary["by_policy"] == {"cli_token_age": {"allow": 1, "deny": 1}}
+    assert summary["top_denied"] == [["old_token", 1]]
+
+
+def test_cli_json_input_with_workers(cli_files: pathlib.Path) -> None:
+    assert (
+        _run(cli_files, "-i", str(cli_files / "resources.json"), "-w", "2", "--chunk-size", "1", "-q")
+        == EXPECTED_ROWS
+    )
+
+
+LIFECYCLE_POLICY_MODULE = textwrap.dedent("""
+    import os
+    import pylicy
+
+    class LifecyclePolicy(pylicy.policy.Policy, scope="test_cli_lifecycle"):
+        name = "lifecycle"
+
+        async def setup(self):
+            self._log("setup")
+
+        async def teardown(self):
+            self._log("teardown")
+
+        async def __call__(self, resource, rule):
+            return pylicy.PolicyDecision(action=pylicy.PolicyDecisionAction.ALLOW)
+
+        def _log(self, event):
+            with open(os.path.join(os.path.dirname(__file__), "lifecycle.log"), "a") as f:
+                f.write(f"{os.getpid()} {event}\\n")
+    """)
+
+
+def test_cli_workers_set_up_policies_once(cli_files: pathlib.Path) -> None:
+    (cli_files / "lifecycle.py").write_text(LIFECYCLE_POLICY_MODULE)
+    args = [
+        str(cli_files / "rules.json"),
+        "-p",
+        str(cli_files / "lifecycle.py"),
+        "-s",
+        "test_cli_lifecycle",
+    ]
+    args += ["-i", str(cli_files / "resources.json"), "--id-field", "name", "--data-field", "token"]
+    args += ["-w", "2", "--chunk-size", "1", "-o", str(cli_files / "results.jsonl"), "-q"]
+    assert cli.main(args) == 0
+    assert len((cli_files / "results.jsonl").read_text().splitlines()) == 2
+
+    events: Dict[str, List[str]] = {}
+    for line in (cli_files / "lifecycle.log").read_text().splitlines():
+        pid, event = line.split()
+        events.setdefault(pid, []).append(event)
+    assert events
+    assert all(worker_events == ["setup", "teardown"] for worker_events in events.values())
+
+
+@pytest.mark.parametrize("workers", ["1", "2"])
+def test_cli_checkpoint(cli_files: pathlib.Path, workers: str) -> None:
+    args = ["-i", str(cli_files / "resources.jsonl"), "-w", workers, "-q"]
+    args += ["--checkpoint", str(cli_files / "checkpoint.db")]
+    assert _run(cli_files, *args) == EXPECTED_ROWS
+    assert _run(cli_files, *args) == []
+    assert _run(cli_files, *args, "--restart") == EXPECTED_ROWS
+
+    (cli_files / "rules.json").write_text(
+        json.dumps({**RULES, "rules": [{**RULES["rules"][0], "weight": 1}]})
+    )
+    with pytest.raises(SystemExit):
+        _run(cli_files, *args)
+
+
+def test_cli_csv_output(cli_files: pathlib.Path) -> None:
+    output = cli_files / "results.csv"
+    cli.main(
+        [
+            str(cli_files / "rules.json"),
+            "-p",
+            str(cli_files / "policies.py"),
+            "-s",
+            "test_cli",
+            "-i",
+            str(cli_files / "resources.jsonl"),
+            "--id-field",
+            "name",
+            "--data-field",
+            "token",
+            "-o",
+            str(output),
+            "-q",
+        ]
+    )
+    assert output.read_text().splitlines()[0] == ",".join(sinks.COLUMNS)
+
+
+def test_cli_bad_arguments(cli_files: pathlib.Path) -> None:
+    with pytest.raises(SystemExit):
+        cli.main([str(cli_files / "rules.json"), "-w", "0"])
+    with pytest.raises(ValueError):
+        cli.open_sink("-", "parquet")
+    with pytest.raises(ValueError):
+        cli.to_resource({"name": "no_id"}, "id", "data")
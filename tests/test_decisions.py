@@ -0,0 +1,151 @@
+import copy
+import datetime
+import json
+import pickle
+from typing import Any, Dict
+
+import pytest
+from pydantic.json import pydantic_encoder
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    decisions,
+    policy,
+)
+
+
+def test_allow_is_immutable() -> None:
+    assert decisions.ALLOW == PolicyDecision(action=PolicyDecisionAction.ALLOW)
+    assert repr(decisions.ALLOW).startswith("PolicyDecision(")
+    with pytest.raises(TypeError):
+        decisions.ALLOW.reason = "changed"
+
+
+def test_decision_cache_shares_equal_decisions() -> None:
+    cache = decisions.DecisionCache()
+    assert cache.compact(PolicyDecision(action=PolicyDecisionAction.ALLOW)) is decisions.ALLOW
+
+    first = cache.compact(PolicyDecision(action=PolicyDecisionAction.DENY, reason="old", detail={"age": 1}))
+    second = cache.compact(
+        PolicyDecision(action=PolicyDecisionAction.DENY, reason="old", detail={"age": 1})
+    )
+    assert first is second
+    assert first == PolicyDecision(action=PolicyDecisionAction.DENY, reason="old", detail={"age": 1})
+    with pytest.raises(TypeError):
+        first.detail = None
+
+    # Details of different types are not conflated
+    assert first is not cache.compact(
+        PolicyDecision(action=PolicyDecisionAction.DENY, reason="old", detail={"age": True})
+    )
+    assert len(cache) == 3
+
+    assert first is not cache.compact(PolicyDecision(action=PolicyDecisionAction.DENY, reason="new"))
+    assert first.reason is cache.intern("".join(["o", "ld"]))
+
+
+def test_shared_decision_detail_is_read_only() -> None:
+    cache = decisions.DecisionCache()
+    owners = ["alice"]
+    shared = cache.compact(
+        PolicyDecision(action=PolicyDecisionAction.DENY, detail={"owners": owners, "limits": {"age": 30}})
+    )
+    assert isinstance(shared.detail, dict)
+
+    owners.append("bob")
+    assert shared.detail == {"owners": ["alice"], "limits": {"age": 30}}
+    with pytest.raises(TypeError):
+        shared.detail["owners"] = []
+    with pytest.raises(TypeError):
+        shared.detail["owners"].append("bob")
+    with pytest.raises(TypeError):
+        shared.detail["limits"].update(age=60)
+
+    assert json.loads(shared.json())["detail"] == shared.detail
+    assert pickle.loads(pickle.dumps(shared)) == shared
+    assert copy.deepcopy(shared) == shared
+
+
+def test_decision_cache_does_not_modify_decisions() -> None:
+    cache = decisions.DecisionCache()
+    cache.intern("old")
+    reason = "".join(["o", "ld"])
+    checked = datetime.datetime(2024, 1, 2)
+    decision = PolicyDecision(action=PolicyDecisionAction.DENY, reason=reason, detail={"checked": checked})
+
+    compacted = cache.compact(decision)
+    assert compacted == decision and compacted is not decision
+    assert compacted.reason is cache.intern("old")
+    assert decision.reason is reason
+
+
+def test_encode_decisions() -> None:
+    checked = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    detail: Dict[Any, Any] = {
+        "checked": checked,
+        "owners": ("alice",),
+        "tags": {"a"},
+        1: None,
+        "action": PolicyDecisionAction.WARN,
+    }
+    decision = PolicyDecision(action=PolicyDecisionAction.DENY, reason="old", detail=detail)
+
+    encoded = decisions.encode(decision)
+    assert encoded == json.loads(decision.json())
+    assert json.loads(json.dumps(encoded)) == encoded
+    assert decisions.encode_detail(detail) == json.loads(json.dumps(detail, default=pydantic_encoder))
+    assert decisions.decode(encoded) == PolicyDecision(
+        action=PolicyDecisionAction.DENY,
+        reason="old",
+        detail={
+            "checked": checked.isoformat(),
+            "owners": ["alice"],
+            "tags": ["a"],
+            "1": None,
+            "action": "warn",
+        },
+    )
+    assert decisions.decode(decisions.encode(decisions.ALLOW)) == decisions.ALLOW
+    with pytest.raises(TypeError):
+        decisions.encode_detail({"unencodable": object()})
+
+
+def test_decision_cache_bounded() -> None:
+    cache = decisions.DecisionCache(max_size=2)
+    for i in range(5):
+        cache.compact(PolicyDecision(action=PolicyDecisionAction.WARN, reason=str(i)))
+    assert len(cache) <= 2
+    assert cache.compact(PolicyDecision(action=PolicyDecisionAction.ALLOW)) is decisions.ALLOW
+
+    with pytest.raises(ValueError):
+        decisions.DecisionCache(max_size=0)
+
+
+@pytest.mark.asyncio
+async def test_pylicy_compacts_decisions() -> None:
+    scope = "test_pylicy_compacts_decisions"
+
+    @policy.policy_checker("rotated", scope=scope)
+    async def rotated(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        if rsrc.data["age"] > 30:
+            return PolicyDecision(action=PolicyDecisionAction.DENY, reason="Token has not been rotated")
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    @policy.policy_checker("named", scope=scope, sync=True)
+    def named(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return decisions.ALLOW
+
+    rules = Pylicy.from_rules([UserRule(name="all", resources=["*"], policies=["*"])], scope=scope).rules
+    policies = Pylicy(rules, scope=scope, decision_cache=decisions.DecisionCache())
+    resources = [Resource(id=f"token_{i}", data={"age": i}) for i in range(0, 60, 10)]
+
+    results = await policies.apply_all(resources)
+    denied = [results[resource.id]["rotated"] for resource in resources[4:]]
+    assert denied[0] is denied[1]
+    assert results["token_0"]["rotated"] is decisions.ALLOW
+    assert results["token_0"]["named"] is decisions.ALLOW
@@ -0,0 +1,138 @@
+import asyncio
+import types
+from typing import List
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    limits,
+    policy,
+)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_spaces_executions(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 0.0
+    sleeps: List[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    monkeypatch.setattr(limits, "time", types.SimpleNamespace(monotonic=lambda: now))
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    rate_limit = limits.RateLimit(100, burst=2)
+    await asyncio.gather(*[rate_limit.acquire() for _ in range(2)])
+    assert sleeps == []
+
+    await asyncio.gather(*[rate_limit.acquire() for _ in range(5)])
+    assert sleeps == pytest.approx([0.01, 0.02, 0.03, 0.04, 0.05])
+
+    now = 0.07
+    await rate_limit.acquire()
+    assert len(sleeps) == 5
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_cancel_returns_token() -> None:
+    rate_limit = limits.RateLimit(10)
+    await rate_limit.acquire()
+    waiting = asyncio.ensure_future(rate_limit.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert rate_limit._tokens == pytest.approx(0, abs=0.1)
+
+
+def test_limits_validation() -> None:
+    with pytest.raises(ValueError):
+        limits.RateLimit(0)
+    with pytest.raises(ValueError):
+        limits.RateLimit(1, burst=0)
+    with pytest.raises(ValueError):
+        limits.AdaptiveConcurrency(initial=4, maximum=2)
+    with pytest.raises(ValueError):
+        limits.AdaptiveConcurrency(backoff=1)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_aimd() -> None:
+    concurrency = limits.AdaptiveConcurrency(initial=2, maximum=3, latency_target=1.0)
+    await concurrency.acquire()
+    await concurrency.acquire()
+    waiting = asyncio.ensure_future(concurrency.acquire())
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    concurrency.release(0.1)
+    await waiting
+    assert concurrency.in_flight == 2
+    assert concurrency.limit == 2
+
+    concurrency.release(0.1)
+    concurrency.release(0.1)
+    assert concurrency.limit == 3
+    await concurrency.acquire()
+    concurrency.release(5.0)
+    assert concurrency.limit == 1
+
+    await concurrency.acquire()
+    concurrency.release(failed=True)
+    assert concurrency.limit == 1
+    assert concurrency.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_concurrency_cancelled_waiter() -> None:
+    concurrency = limits.AdaptiveConcurrency(initial=1)
+    await concurrency.acquire()
+    cancelled = asyncio.ensure_future(concurrency.acquire())
+    waiting = asyncio.ensure_future(concurrency.acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+
+    concurrency.release()
+    await waiting
+    assert concurrency.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_pylicy_enforces_policy_limits() -> None:
+    scope = "test_pylicy_enforces_policy_limits"
+    running: List[int] = [0]
+    peak: List[int] = [0]
+
+    @policy.policy_checker(
+        "limited",
+        scope=scope,
+        rate_limit=limits.RateLimit(1000, burst=1000),
+        concurrency=limits.AdaptiveConcurrency(initial=2, maximum=2),
+    )
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.001)
+        running[0] -= 1
+        if rsrc.id == "bad":
+            raise ConnectionError("throttled")
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    policies = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope)
+    results = await policies.apply_all([Resource(id=f"resource_{i}") for i in range(10)])
+    assert len(results) == 10
+    assert peak == [2]
+
+    concurrency = policy.get_options("limited", scope=scope).concurrency
+    assert concurrency is not None
+    with pytest.raises(ConnectionError):
+        await policies.apply(Resource(id="bad"))
+    assert concurrency.limit == 1
+    assert concurrency.in_flight == 0
@@ -0,0 +1,175 @@
+import asyncio
+from typing import Any, FrozenSet, List, Optional, Tuple
+
+import pytest
+
+from pylicy import (
+    MultiScopePylicy,
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    policy,
+    scheduling,
+)
+
+
+async def _allow(rsrc: Resource, rule: Rule) -> PolicyDecision:
+    return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+
+def _register_scope(scope: str, action: PolicyDecisionAction, calls: List[str]) -> None:
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        calls.append(f"{scope}:{rsrc.id}")
+        return PolicyDecision(action=action)
+
+    policy.register_policy(f"{scope}_policy", checker, scope=scope)
+
+
+@pytest.mark.asyncio
+async def test_multi_scope_apply_all() -> None:
+    calls: List[str] = []
+    _register_scope("test_multi_scope_security", PolicyDecisionAction.DENY, calls)
+    _register_scope("test_multi_scope_cost", PolicyDecisionAction.WARN, calls)
+
+    policies = MultiScopePylicy.from_rules(
+        [UserRule(name="all", resources=["my_*"], policies=["*"])],
+        scopes=["test_multi_scope_security", "test_multi_scope_cost"],
+    )
+    assert await policies.apply_all([Resource(id="my_resource"), Resource(id="other_resource")]) == {
+        "test_multi_scope_security": {
+            "my_resource": {
+                "test_multi_scope_security_policy": PolicyDecision(action=PolicyDecisionAction.DENY)
+            },
+            "other_resource": {},
+        },
+        "test_multi_scope_cost": {
+            "my_resource": {
+                "test_multi_scope_cost_policy": PolicyDecision(action=PolicyDecisionAction.WARN)
+            },
+            "other_resource": {},
+        },
+    }
+    assert sorted(calls) == ["test_multi_scope_cost:my_resource", "test_multi_scope_security:my_resource"]
+
+
+@pytest.mark.asyncio
+async def test_multi_scope_apply_matches_single_scope() -> None:
+    scope = "test_multi_scope_apply_matches_single_scope"
+    _register_scope(scope, PolicyDecisionAction.ALLOW, [])
+    engine = Pylicy.from_rules([UserRule(name="all", resources=["*"], policies=["*"])], scope=scope)
+
+    policies = MultiScopePylicy({scope: engine})
+    assert policies.engines == {scope: engine}
+    assert await policies.apply(Resource(id="my_resource")) == {
+        scope: await engine.apply(Resource(id="my_resource"))
+    }
+
+
+@pytest.mark.asyncio
+async def test_multi_scope_schedules_by_priority() -> None:
+    scope = "test_multi_scope_schedules_by_priority"
+    executed: List[str] = []
+    release = asyncio.Event()
+
+    @policy.policy_checker("slow", scope=scope)
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        executed.append(rsrc.id)
+        await release.wait()
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope).rules
+    scheduler = scheduling.Scheduler(1)
+    policies = MultiScopePylicy({scope: Pylicy(rules, scope=scope, scheduler=scheduler)})
+
+    batch = asyncio.ensure_future(policies.apply_all([Resource(id=f"batch_{i}") for i in range(5)]))
+    while not scheduler.waiting:
+        await asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await policies.apply(Resource(id="late"), priority=scheduling.Priority.BATCH, timeout=0.001)
+    interactive = asyncio.ensure_future(policies.apply(Resource(id="interactive")))
+    while scheduler.waiting < 5:
+        await asyncio.sleep(0)
+    release.set()
+
+    assert len((await batch)[scope]) == 5
+    assert len((await interactive)[scope]) == 1
+    assert executed.index("interactive") == 1
+    assert "late" not in executed
+
+
+@pytest.mark.asyncio
+async def test_multi_scope_loads_lazy_resources_once() -> None:
+    loaded: List[Tuple[str, Optional[FrozenSet[str]]]] = []
+
+    async def load(resource_id: str, fields: Optional[FrozenSet[str]]) -> Any:
+        loaded.append((resource_id, fields))
+        if resource_id == "unreachable":
+            raise ConnectionError(resource_id)
+        return {"owner": "alice", "age": 10, "size": 3}
+
+    scopes = {f"test_multi_scope_loads_lazy_resources_once_{field}": field for field in ["owner", "age"]}
+    for scope, field in scopes.items():
+        policy.register_policy(field, _allow, scope=scope, fields=[field])
+
+    rules = Pylicy.from_rules([UserRule(name="all", resources=["*"], policies=["*"])]).rules
+    policies = MultiScopePylicy(
+        {scope: Pylicy(rules, scope=scope, isolate_errors=True) for scope in scopes}
+    )
+    results = await policies.apply_all(
+        [Resource(id="reachable", loader=load), Resource(id="unreachable", loader=load)]
+    )
+
+    assert sorted(loaded) == [
+        ("reachable", frozenset(["owner", "age"])),
+        ("unreachable", frozenset(["owner", "age"])),
+    ]
+    assert [scoped["reachable"] for scoped in results.values()] == [
+        {"owner": PolicyDecision(action=PolicyDecisionAction.ALLOW)},
+        {"age": PolicyDecision(action=PolicyDecisionAction.ALLOW)},
+    ]
+    assert [
+        {name: decision.action for name, decision in scoped["unreachable"].items()}
+        for scoped in results.values()
+    ] == [{"owner": PolicyDecisionAction.ERROR}, {"age": PolicyDecisionAction.ERROR}]
+
+
+@pytest.mark.asyncio
+async def test_multi_scope_bad_types() -> None:
+    policies = MultiScopePylicy({})
+    with pytest.raises(TypeError):
+        await policies.apply("not a resource")  # type: ignore
+    with pytest.raises(TypeError):
+        await policies.apply_all("Not a resource list")  # type: ignore
+    with pytest.raises(ValueError):
+        await policies.apply_all([Resource(id="a"), Resource(id="a")], duplicates="error")
+
+
+@pytest.mark.asyncio
+async def test_multi_scope_lifecycle() -> None:
+    events: List[str] = []
+
+    def register(scope: str) -> None:
+        class LifecyclePolicy(policy.Policy, scope=scope):
+            name = f"{scope}_policy"
+
+            async def setup(self) -> None:
+                events.append(f"setup:{scope}")
+
+            async def teardown(self) -> None:
+                events.append(f"teardown:{scope}")
+
+            async def __call__(self, rsrc: Resource, rule: Rule) -> PolicyDecision:
+                return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    register("test_multi_scope_lifecycle_a")
+    register("test_multi_scope_lifecycle_b")
+    policies = MultiScopePylicy.from_rules(
+        [UserRule(name="all", resources=["*"], policies=["*"])],
+        scopes=["test_multi_scope_lifecycle_a", "test_multi_scope_lifecycle_b"],
+    )
+    async with policies:
+        assert events == ["setup:test_multi_scope_lifecycle_a", "setup:test_multi_scope_lifecycle_b"]
+    assert events[2:] == ["teardown:test_multi_scope_lifecycle_b", "teardown:test_multi_scope_lifecycle_a"]
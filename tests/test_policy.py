@@ -2,7 +2,8 @@ from typing import Any
 
 import pytest
 
-from pylicy import models, policy
+from pylicy import Pylicy, models, policy
+from pylicy import retry as retry_
 
 
 async def stub_checker(resource: models.Resource, rule: models.Rule) -> models.PolicyDecision:
@@ -59,6 +60,21 @@ def test_register_policy_non_coroutine() -> None:
         policy.register_policy("my_policy", lambda rsrc, rule: None, scope=scope)  # type: ignore
 
 
+def test_register_policy_sync() -> None:
+    scope = "test_register_policy_sync"
+
+    def sync_checker(resource: models.Resource, rule: models.Rule) -> models.PolicyDecision:
+        return models.PolicyDecision(action=models.PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("my_policy", sync_checker, scope=scope, sync=True)
+    assert policy.get_options("my_policy", scope=scope).sync
+    assert not policy.is_sync(sync_checker)
+    assert not policy.is_sync(stub_checker)
+
+    with pytest.raises(TypeError):
+        policy.register_policy("my_async_policy", stub_checker, scope=scope, sync=True)
+
+
 def test_register_policy_decorator() -> None:
     scope = "test_register_policy_decorator"
 
@@ -69,6 +85,70 @@ def test_register_policy_decorator() -> None:
     assert policy.get_policies(scope=scope) == {"my_policy": checker}
 
 
+def test_register_policy_decorator_prepare() -> None:
+    scope = "test_register_policy_decorator_prepare"
+
+    def prepare(rule: models.Rule) -> Any:
+        return rule.name
+
+    @policy.policy_checker("my_policy", scope=scope, prepare=prepare)
+    async def checker(_1: Any, __2: Any, prepared: Any) -> Any:
+        pass
+
+    assert policy.get_options("my_policy", scope=scope).prepare is prepare
+    assert policy.get_preparer(checker) is None
+    assert policy.get_preparer(stub_checker) is None
+    with pytest.raises(TypeError):
+        policy.register_policy("other_policy", checker, scope=scope, prepare="uncallable")  # type: ignore
+
+
+def test_register_policy_options() -> None:
+    scope = "test_register_policy_options"
+
+    class FieldsPolicy(policy.Policy, scope=scope):
+        name = "fields_policy"
+        fields = frozenset(["owner"])
+        retry = retry_.Retry(attempts=2)
+
+        async def __call__(self, _1: Any, __2: Any) -> Any:
+            pass
+
+    # Options belong to each registration, even of the same checker
+    policy.register_policy("all_fields", stub_checker, scope=scope)
+    policy.register_policy("some_fields", stub_checker, scope=scope, fields=["age"])
+    assert policy.get_options("all_fields", scope=scope) == policy.PolicyOptions()
+    assert policy.get_options("some_fields", scope=scope).fields == frozenset(["age"])
+    assert policy.get_fields(stub_checker) is None
+
+    options = policy.get_options("fields_policy", scope=scope)
+    assert options.fields == frozenset(["owner"])
+    assert options.retry is FieldsPolicy.retry
+    with pytest.raises(KeyError):
+        policy.get_options("unknown", scope=scope)
+
+
+def test_unregistered_policy_options() -> None:
+    scope = "test_unregistered_policy_options"
+
+    class FieldsPolicy(policy.Policy, scope=scope):
+        name = "fields_policy"
+        fields = frozenset(["owner"])
+
+        async def __call__(self, _1: Any, __2: Any) -> Any:
+            pass
+
+    # Policies placed in the registry directly have the options they declare
+    policy.policies[scope]["direct"] = stub_checker
+    policy.policies[scope]["replaced"] = FieldsPolicy()
+    policy.policies[scope]["fields_policy"] = stub_checker
+    assert policy.get_options("direct", scope=scope) == policy.PolicyOptions()
+    assert policy.get_options("replaced", scope=scope).fields == frozenset(["owner"])
+    assert policy.get_options("fields_policy", scope=scope) == policy.PolicyOptions()
+
+    rules = Pylicy.from_rules([models.UserRule(name="all", resources=["*"], policies=["*"])], scope=scope)
+    assert [step.policy_name for step in rules.plan("resource")] == ["fields_policy", "direct", "replaced"]
+
+
 def test_register_policy_decorator_used_directly_error() -> None:
     with pytest.raises(TypeError):
 
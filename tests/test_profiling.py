@@ -0,0 +1,140 @@
+import asyncio
+import json
+import pathlib
+import time
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    policy,
+    profiling,
+    scheduling,
+)
+
+
+def _spin(seconds: float) -> None:
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_profiler_attributes_cpu_to_running_steps() -> None:
+    profiler = profiling.Profiler()
+
+    async def busy() -> str:
+        _spin(0.02)
+        return "busy"
+
+    async def idle() -> str:
+        await asyncio.sleep(0.05)
+        return "idle"
+
+    assert list(
+        await asyncio.gather(
+            profiler.profile(busy(), "execute", "busy"), profiler.profile(idle(), "execute", "idle")
+        )
+    ) == ["busy", "idle"]
+
+    totals = profiler.totals
+    assert totals[("execute", "busy")].cpu >= 0.02
+    assert totals[("execute", "idle")].cpu < 0.01
+    assert totals[("execute", "idle")].wall >= 0.05
+    assert totals[("schedule",)].calls == 2
+
+
+@pytest.mark.asyncio
+async def test_profiler_propagates_errors() -> None:
+    profiler = profiling.Profiler()
+
+    async def failing() -> None:
+        await asyncio.sleep(0)
+        raise RuntimeError("failed")
+
+    with pytest.raises(RuntimeError):
+        await profiler.profile(failing(), "execute", "failing")
+    assert profiler.totals[("execute", "failing")].calls == 1
+
+
+@pytest.mark.asyncio
+async def test_pylicy_profiling(tmp_path: pathlib.Path) -> None:
+    scope = "test_pylicy_profiling"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        await asyncio.sleep(0)
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    profiler = profiling.Profiler()
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope).rules
+    policies = Pylicy(rules, scope=scope, profiler=profiler)
+    await policies.apply_all([Resource(id=f"resource_{i}", data=None) for i in range(3)])
+
+    assert profiler.totals[("plan",)].calls == 3
+    assert profiler.totals[("execute", "my_policy")].calls == 3
+
+    profiler.dump_chrome_trace(str(tmp_path / "trace.json"))
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert [event["ph"] for event in events if event["cat"] == "plan"] == ["X"] * 3
+    assert {event["args"]["resource"] for event in events if event["cat"] == "execute"} == {
+        "resource_0",
+        "resource_1",
+        "resource_2",
+    }
+
+    profiler.dump_collapsed(str(tmp_path / "stacks.txt"), metric="wall")
+    stacks = dict(line.rsplit(" ", 1) for line in (tmp_path / "stacks.txt").read_text().splitlines())
+    assert set(stacks) == {"pylicy;plan", "pylicy;schedule", "pylicy;execute;my_policy"}
+    assert all(int(value) > 0 for value in stacks.values())
+
+
+@pytest.mark.asyncio
+async def test_profiler_excludes_waits() -> None:
+    profiler = profiling.Profiler()
+
+    async def waiting() -> str:
+        await profiler.wait(asyncio.sleep(0.05), "schedule", "waiting")
+        return "waiting"
+
+    assert await profiler.profile(waiting(), "execute", "waiting") == "waiting"
+
+    totals = profiler.totals
+    assert totals[("schedule", "waiting")].wall >= 0.05
+    assert totals[("execute", "waiting")].wall < 0.05
+
+
+@pytest.mark.asyncio
+async def test_pylicy_profiling_schedule() -> None:
+    scope = "test_pylicy_profiling_schedule"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        await asyncio.sleep(0.02)
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    profiler = profiling.Profiler()
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope).rules
+    policies = Pylicy(rules, scope=scope, profiler=profiler, scheduler=scheduling.Scheduler(1))
+    await policies.apply_all([Resource(id=f"resource_{i}", data=None) for i in range(3)])
+
+    totals = profiler.totals
+    assert totals[("schedule", "my_policy")].calls == 3
+    # Executions run one at a time, the last waits for the other two to finish
+    assert totals[("schedule", "my_policy")].wall >= 0.06
+    assert totals[("execute", "my_policy")].wall < totals[("schedule", "my_policy")].wall + 0.06
+
+
+def test_profiler_without_events(tmp_path: pathlib.Path) -> None:
+    profiler = profiling.Profiler(record_events=False)
+    with profiler.phase("plan"):
+        pass
+
+    profiler.dump_chrome_trace(str(tmp_path / "trace.json"))
+    assert json.loads((tmp_path / "trace.json").read_text())["traceEvents"] == []
+    assert profiler.totals[("plan",)].calls == 1
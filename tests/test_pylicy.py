@@ -1,3 +1,8 @@
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from typing import Any, Dict, FrozenSet, List, Optional, Union
+
 import pytest
 
 from pylicy import (
@@ -91,3 +96,655 @@ async def test_pylicy_apply_all_match() -> None:
         "my_resource": {"my_policy": PolicyDecision(action=PolicyDecisionAction.ALLOW)},
         "my_other_resource": {"my_policy": PolicyDecision(action=PolicyDecisionAction.ALLOW)},
     }
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_all_duplicates() -> None:
+    scope = "test_pylicy_apply_all_duplicates"
+    calls: List[Any] = []
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        calls.append(rsrc.data)
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW, detail={"n": rsrc.data})
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["*"], policies=["my_policy"])], scope=scope
+    )
+    resources = [
+        Resource(id="my_resource", data=1),
+        Resource(id="my_other_resource", data=2),
+        Resource(id="my_resource", data=3),
+    ]
+
+    assert await policies.apply_all(resources) == {
+        "my_resource": {"my_policy": PolicyDecision(action=PolicyDecisionAction.ALLOW, detail={"n": 3})},
+        "my_other_resource": {
+            "my_policy": PolicyDecision(action=PolicyDecisionAction.ALLOW, detail={"n": 2})
+        },
+    }
+    assert calls == [3, 2]
+
+    result = await policies.apply_all(resources, duplicates="first")
+    assert result["my_resource"]["my_policy"].detail == {"n": 1}
+
+    with pytest.raises(ValueError):
+        await policies.apply_all(resources, duplicates="error")
+    with pytest.raises(ValueError):
+        await policies.apply_all(resources, duplicates="unknown")  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_coalesces_concurrent_steps() -> None:
+    scope = "test_pylicy_apply_coalesces_concurrent_steps"
+    calls: List[Any] = []
+    release = asyncio.Event()
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        calls.append(rsrc.data)
+        await release.wait()
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW, detail={"n": rsrc.data})
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    rules = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["*"], policies=["my_policy"])], scope=scope
+    ).rules
+    policies = Pylicy(rules, scope=scope, coalesce=True)
+
+    pending = [
+        asyncio.ensure_future(policies.apply(Resource(id="my_resource", data=1))),
+        asyncio.ensure_future(policies.apply(Resource(id="my_resource", data=1))),
+        asyncio.ensure_future(policies.apply(Resource(id="my_resource", data=2))),
+    ]
+    while len(calls) < 2:
+        await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*pending)
+
+    assert sorted(calls) == [1, 2]
+    assert results[0]["my_policy"] is results[1]["my_policy"]
+    assert results[2]["my_policy"].detail == {"n": 2}
+    assert policies._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_coalesces_cancellation() -> None:
+    scope = "test_pylicy_apply_coalesces_cancellation"
+    calls: List[Any] = []
+    release = asyncio.Event()
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        calls.append(rsrc.data)
+        await release.wait()
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    rules = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["*"], policies=["my_policy"])], scope=scope
+    ).rules
+    policies = Pylicy(rules, scope=scope, coalesce=True)
+
+    leader = asyncio.ensure_future(policies.apply(Resource(id="my_resource", data=1)))
+    follower = asyncio.ensure_future(policies.apply(Resource(id="my_resource", data=1)))
+    while not calls:
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    # Cancelling the step which started the execution leaves it running for the coalesced step
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert (await follower)["my_policy"].action == PolicyDecisionAction.ALLOW
+    assert calls == [1]
+    assert policies._in_flight == {}
+
+    # Once every step is cancelled the execution is too, and later steps start a new one
+    release.clear()
+    pending = [asyncio.ensure_future(policies.apply(Resource(id="my_resource", data=1))) for _ in range(2)]
+    while len(calls) < 2:
+        await asyncio.sleep(0)
+    for step in pending:
+        step.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    assert policies._in_flight == {}
+
+    release.set()
+    assert len(await policies.apply(Resource(id="my_resource", data=1))) == 1
+    assert calls == [1, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_coalesces_errors() -> None:
+    scope = "test_pylicy_apply_coalesces_errors"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        await asyncio.sleep(0)
+        raise RuntimeError("backend unavailable")
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    rules = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["*"], policies=["my_policy"])], scope=scope
+    ).rules
+    policies = Pylicy(rules, scope=scope, coalesce=True)
+
+    results = await asyncio.gather(
+        policies.apply(Resource(id="my_resource", data=1)),
+        policies.apply(Resource(id="my_resource", data=1)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_iter() -> None:
+    scope = "test_pylicy_apply_iter"
+    running: List[str] = []
+    max_running = 0
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        nonlocal max_running
+        running.append(rsrc.id)
+        max_running = max(max_running, len(running))
+        await asyncio.sleep(0)
+        running.remove(rsrc.id)
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["match_*"], policies=["my_policy"])], scope=scope
+    )
+
+    async def resources() -> AsyncIterator[Resource]:
+        for i in range(10):
+            yield Resource(id=f"match_{i}", data=None)
+        yield Resource(id="other", data=None)
+
+    results = [result async for result in policies.apply_iter(resources(), concurrency=3)]
+    assert max_running == 3
+    assert sorted(result.resource_id for result in results) == sorted(
+        [f"match_{i}" for i in range(10)] + ["other"]
+    )
+    assert all(
+        result.decisions == {"my_policy": PolicyDecision(action=PolicyDecisionAction.ALLOW)}
+        and [step.rule.name for step in result.plan] == ["simple_rule"]
+        for result in results
+        if result.resource_id != "other"
+    )
+
+    with pytest.raises(ValueError):
+        [result async for result in policies.apply_iter([], concurrency=0)]
+    with pytest.raises(TypeError):
+        [result async for result in policies.apply_iter(["not a resource"])]  # type: ignore
+
+
+def test_pylicy_explain() -> None:
+    scope = "test_pylicy_explain"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        raise AssertionError("explain must not execute checkers")
+
+    policy.register_policy("token_age", checker, scope=scope)
+    policy.register_policy("token_no_wildcard", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [
+            UserRule(name="enforce_all", weight=1, resources=["*"], policies=["*"]),
+            UserRule(name="admin_wildcards", resources=["admin_*"], policies=["!token_no_wildcard"]),
+            UserRule(name="frank_extend", resources=["frank_*"], policies=["token_age"]),
+        ],
+        scope=scope,
+    )
+
+    dummy, admin, frank = policies.explain(["dummy_token", "admin_token", "frank_token"])
+    assert [rule.name for rule in dummy.effective_rules] == ["enforce_all"]
+    assert {step.policy_name: step.rule.name for step in dummy.plan} == {
+        "token_age": "enforce_all",
+        "token_no_wildcard": "enforce_all",
+    }
+    assert dummy.excluded == {}
+
+    assert [rule.name for rule in admin.effective_rules] == ["enforce_all", "admin_wildcards"]
+    # A leading negated pattern includes every other policy, so the higher weighted rule wins those too
+    assert {step.policy_name: step.rule.name for step in admin.plan} == {"token_age": "admin_wildcards"}
+    assert {name: rule.name for name, rule in admin.excluded.items()} == {
+        "token_no_wildcard": "admin_wildcards"
+    }
+
+    assert {step.policy_name: step.rule.name for step in frank.plan} == {
+        "token_age": "frank_extend",
+        "token_no_wildcard": "enforce_all",
+    }
+
+    with pytest.raises(TypeError):
+        list(policies.explain("dummy_token"))
+
+
+def test_pylicy_plan_all() -> None:
+    scope = "test_pylicy_plan_all"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        raise AssertionError("plan_all must not execute checkers")
+
+    policy.register_policy("token_age", checker, scope=scope)
+    policy.register_policy("token_no_wildcard", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [
+            UserRule(name="enforce_tokens", weight=1, resources=["*_token"], policies=["*"]),
+            UserRule(name="admin_wildcards", resources=["admin_*"], policies=["!token_no_wildcard"]),
+        ],
+        scope=scope,
+    )
+
+    resource_ids = [f"user{i}_token" for i in range(100)] + ["admin_token", "admin_key", "other"]
+    coverage = policies.plan_all(iter(resource_ids))
+    assert coverage.to_dict() == {
+        "resources": 103,
+        "unmatched_resources": 1,
+        "by_rule": {"enforce_tokens": 101, "admin_wildcards": 2},
+        "by_policy": {
+            "token_age": {"enforce_tokens": 100, "admin_wildcards": 2},
+            "token_no_wildcard": {"enforce_tokens": 100},
+        },
+        "excluded": {"token_no_wildcard": {"admin_wildcards": 2}},
+    }
+    assert coverage.policy_totals() == {"token_age": 102, "token_no_wildcard": 100}
+
+
+def test_pylicy_regex_patterns() -> None:
+    scope = "test_pylicy_regex_patterns"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    for name in ["team_owner", "team_size", "billing"]:
+        policy.register_policy(name, checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [
+            UserRule(
+                name="teams",
+                resources=["regex:team-[a-z]+-\\d+", "!*-sandbox-*"],
+                policies=["regex:team_(owner|size)"],
+            )
+        ],
+        scope=scope,
+        regex_patterns=True,
+    )
+    rules = policies.rules
+    planned = {
+        explanation.resource_id: {step.policy_name for step in explanation.plan}
+        for explanation in policies.explain(["team-data-1", "team-data-x", "team-data-sandbox-1"])
+    }
+    assert planned == {
+        "team-data-1": {"team_owner", "team_size"},
+        "team-data-x": set(),
+        "team-data-sandbox-1": set(),
+    }
+
+    # Without regex patterns enabled the prefix is matched literally
+    assert next(Pylicy(rules, scope=scope).explain(["team-data-1"])).plan == []
+    assert Pylicy(rules, scope=scope).fingerprint != policies.fingerprint
+
+    invalid: List[Union[Rule, UserRule]] = [UserRule(name="invalid", resources=["regex:("], policies=["*"])]
+    assert Pylicy.from_rules(invalid, scope=scope).rules
+    with pytest.raises(re.error):
+        Pylicy.from_rules(invalid, scope=scope, regex_patterns=True)
+
+
+def test_pylicy_prefilter() -> None:
+    scope = "test_pylicy_prefilter"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        raise AssertionError("prefilter must not execute checkers")
+
+    policy.register_policy("token_age", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [
+            UserRule(name="enforce_tokens", weight=1, resources=["*_token"], policies=["*"]),
+            UserRule(name="revoked", resources=["revoked_*"], policies=["!*"]),
+        ],
+        scope=scope,
+    )
+
+    resource_ids = ["a_token", "other", "revoked_token", "b_token"]
+    assert list(policies.prefilter(iter(resource_ids))) == ["a_token", "b_token"]
+    assert list(policies.prefilter([("other", {}), ("a_token", {"age": 1})])) == [("a_token", {"age": 1})]
+    with pytest.raises(TypeError):
+        list(policies.prefilter("a_token"))
+
+
+def test_pylicy_plan_many_policies() -> None:
+    scope = "test_pylicy_plan_many_policies"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    for i in range(100):
+        policy.register_policy(f"policy_{i:03}", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [
+            UserRule(name="base", weight=1, resources=["*"], policies=["*"]),
+            UserRule(name="tens", resources=["res_*"], policies=["policy_0?5", "!policy_00?"]),
+            UserRule(name="override", weight=200, resources=["res_1"], policies=["policy_00[0-4]"]),
+        ],
+        scope=scope,
+    )
+
+    (explanation,) = policies.explain(["res_1"])
+    owners = {step.policy_name: step.rule.name for step in explanation.plan}
+    assert len(owners) == 95
+    assert [owners[f"policy_00{i}"] for i in range(5)] == ["override"] * 5
+    assert [owners.get(f"policy_00{i}") for i in range(5, 10)] == [None] * 5
+    assert {name: rule.name for name, rule in explanation.excluded.items()} == {
+        f"policy_00{i}": "tens" for i in range(5, 10)
+    }
+    assert owners["policy_015"] == "tens" and owners["policy_050"] == "base"
+    assert [step.policy_name for step in explanation.plan][:5] == [f"policy_00{i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_prepares_rules_once() -> None:
+    scope = "test_pylicy_prepares_rules_once"
+    prepared_rules: List[str] = []
+
+    def prepare(rule: Rule) -> Any:
+        prepared_rules.append(rule.name)
+        context = rule.context if isinstance(rule.context, dict) else {}
+        return context.get("max", 1)
+
+    class LimitPolicy(policy.Policy, scope=scope):
+        name = "limit"
+
+        def prepare(self, rule: Rule) -> Any:
+            return prepare(rule)
+
+        async def __call__(self, rsrc: Resource, rule: Rule, limit: Any) -> PolicyDecision:  # type: ignore
+            allowed = rsrc.data["size"] <= limit
+            return PolicyDecision(
+                action=PolicyDecisionAction.ALLOW if allowed else PolicyDecisionAction.DENY
+            )
+
+    @policy.policy_checker("echo", scope=scope, prepare=prepare)
+    async def echo(rsrc: Resource, rule: Rule, limit: Any) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW, detail={"limit": limit})
+
+    async def plain(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    policy.register_policy("plain", plain, scope=scope)
+    policies = Pylicy.from_rules(
+        [
+            UserRule(name="default", resources=["*"], policies=["*"]),
+            UserRule(name="big", resources=["big_*"], policies=["limit", "echo"], context={"max": 10}),
+        ],
+        scope=scope,
+    )
+    assert sorted(prepared_rules) == ["big", "big", "default", "default"]
+
+    results = await policies.apply_all(
+        [Resource(id=f"big_{i}", data={"size": 5}) for i in range(3)]
+        + [Resource(id="small", data={"size": 5})]
+    )
+    assert sorted(prepared_rules) == ["big", "big", "default", "default"]
+    assert results["big_0"]["limit"].action == PolicyDecisionAction.ALLOW
+    assert results["big_0"]["echo"].detail == {"limit": 10}
+    assert results["small"]["limit"].action == PolicyDecisionAction.DENY
+    assert results["small"]["echo"].detail == {"limit": 1}
+    assert results["small"]["plain"].action == PolicyDecisionAction.ALLOW
+
+    # Rules of plans not built by this instance, here copies of its own, are prepared when applied
+    plan = [step._replace(rule=step.rule.copy()) for step in policies.plan("big_0")]
+    decisions = await policies.apply_plan(Resource(id="big_0", data={"size": 5}), plan)
+    assert decisions == results["big_0"]
+    assert sorted(prepared_rules) == ["big", "big", "big", "big", "default", "default"]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_policy_lifecycle() -> None:
+    scope = "test_pylicy_policy_lifecycle"
+    events: List[str] = []
+
+    class PooledPolicy(policy.Policy, scope=scope):
+        name = "pooled"
+        pool: Any = None
+
+        async def setup(self) -> None:
+            await asyncio.sleep(0)
+            events.append("setup")
+            self.pool = object()
+
+        async def teardown(self) -> None:
+            events.append("teardown")
+            self.pool = None
+
+        async def __call__(self, rsrc: Resource, rule: Rule) -> PolicyDecision:
+            assert self.pool is not None
+            return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules: List[Union[Rule, UserRule]] = [UserRule(name="rule", resources=["*"], policies=["*"])]
+    first, second = Pylicy.from_rules(rules, scope=scope), Pylicy.from_rules(rules, scope=scope)
+    async with first:
+        await asyncio.gather(second.__aenter__(), second.__aenter__())
+        assert events == ["setup"]
+        assert (await first.apply(Resource(id="my_resource")))[
+            "pooled"
+        ].action == PolicyDecisionAction.ALLOW
+        await second.__aexit__(None, None, None)
+        await second.__aexit__(None, None, None)
+        assert events == ["setup"]
+    assert events == ["setup", "teardown"]
+
+    async with first:
+        assert events == ["setup", "teardown", "setup"]
+    assert events == ["setup", "teardown", "setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_policy_lifecycle_unmatched_exit() -> None:
+    scope = "test_pylicy_policy_lifecycle_unmatched_exit"
+    events: List[str] = []
+
+    class PooledPolicy(policy.Policy, scope=scope):
+        name = "pooled"
+
+        async def setup(self) -> None:
+            events.append("setup")
+
+        async def teardown(self) -> None:
+            events.append("teardown")
+
+        async def __call__(self, rsrc: Resource, rule: Rule) -> PolicyDecision:
+            return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules: List[Union[Rule, UserRule]] = [UserRule(name="rule", resources=["*"], policies=["*"])]
+    first, second = Pylicy.from_rules(rules, scope=scope), Pylicy.from_rules(rules, scope=scope)
+    async with first:
+        await second.__aexit__(None, None, None)
+        async with second:
+            pass
+        await second.__aexit__(None, None, None)
+        assert events == ["setup"]
+    assert events == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_policy_lifecycle_setup_error() -> None:
+    scope = "test_pylicy_policy_lifecycle_setup_error"
+    events: List[str] = []
+
+    class GoodPolicy(policy.Policy, scope=scope):
+        name = "good"
+
+        async def setup(self) -> None:
+            events.append("setup")
+
+        async def teardown(self) -> None:
+            events.append("teardown")
+
+        async def __call__(self, rsrc: Resource, rule: Rule) -> PolicyDecision:
+            return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    class BadPolicy(GoodPolicy, scope=scope):
+        name = "bad"
+
+        async def setup(self) -> None:
+            raise ConnectionError("backend unavailable")
+
+    policies = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope)
+    with pytest.raises(ConnectionError):
+        async with policies:
+            pass  # pragma: no cover
+    assert events == ["setup", "teardown"]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_lazy_resources() -> None:
+    scope = "test_pylicy_lazy_resources"
+    loaded: Dict[str, Optional[FrozenSet[str]]] = {}
+
+    async def load(resource_id: str, fields: Optional[FrozenSet[str]]) -> Any:
+        loaded[resource_id] = fields
+        data = {"owner": "alice", "age": 10, "size": 3}
+        return data if fields is None else {field: data[field] for field in fields}
+
+    class OwnerPolicy(policy.Policy, scope=scope):
+        name = "owner"
+        fields = frozenset(["owner"])
+
+        async def __call__(self, rsrc: Resource, rule: Rule) -> PolicyDecision:
+            assert rsrc.loader is None
+            return PolicyDecision(action=PolicyDecisionAction.ALLOW, detail=rsrc.data)
+
+    @policy.policy_checker("age", scope=scope, fields=["age"])
+    async def age(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW, detail=rsrc.data)
+
+    @policy.policy_checker("everything", scope=scope)
+    async def everything(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW, detail=rsrc.data)
+
+    policies = Pylicy.from_rules(
+        [
+            UserRule(name="owned", resources=["owned_*"], policies=["owner"]),
+            UserRule(name="aged", resources=["*_aged"], policies=["age"]),
+            UserRule(name="full", resources=["full"], policies=["*"]),
+        ],
+        scope=scope,
+    )
+    results = await policies.apply_all(
+        [
+            Resource(id=resource_id, loader=load)
+            for resource_id in ["owned_a", "owned_aged", "full", "other"]
+        ]
+    )
+
+    assert loaded == {
+        "owned_a": frozenset(["owner"]),
+        "owned_aged": frozenset(["owner", "age"]),
+        "full": None,
+    }
+    assert results["owned_a"]["owner"].detail == {"owner": "alice"}
+    assert results["owned_aged"]["age"].detail == {"owner": "alice", "age": 10}
+    assert results["full"]["everything"].detail == {"owner": "alice", "age": 10, "size": 3}
+    assert results["other"] == {}
+
+
+@pytest.mark.asyncio
+async def test_pylicy_lazy_resource_errors() -> None:
+    scope = "test_pylicy_lazy_resource_errors"
+
+    async def load(resource_id: str, fields: Optional[FrozenSet[str]]) -> Any:
+        raise ConnectionError(resource_id)
+
+    @policy.policy_checker("owner", scope=scope)
+    async def owner(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    @policy.policy_checker("age", scope=scope)
+    async def age(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules = Pylicy.from_rules([UserRule(name="all", resources=["*"], policies=["*"])], scope=scope).rules
+    with pytest.raises(ConnectionError):
+        await Pylicy(rules, scope=scope).apply(Resource(id="unreachable", loader=load))
+
+    policies = Pylicy(rules, scope=scope, isolate_errors=True)
+    results = await policies.apply_all(
+        [Resource(id="unreachable", loader=load), Resource(id="loaded", data={})]
+    )
+    assert {name: decision.action for name, decision in results["unreachable"].items()} == {
+        "owner": PolicyDecisionAction.ERROR,
+        "age": PolicyDecisionAction.ERROR,
+    }
+    assert results["unreachable"]["owner"].reason == "ConnectionError: unreachable"
+    assert results["loaded"]["owner"].action == PolicyDecisionAction.ALLOW
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_sync() -> None:
+    scope = "test_pylicy_apply_sync"
+
+    class SizePolicy(policy.Policy, scope=scope):
+        name = "size"
+        sync = True
+
+        def prepare(self, rule: Rule) -> Any:
+            context = rule.context if isinstance(rule.context, dict) else {}
+            return context.get("max", 1)
+
+        def __call__(self, rsrc: Resource, rule: Rule, limit: Any) -> PolicyDecision:  # type: ignore
+            allowed = rsrc.data["size"] <= limit
+            return PolicyDecision(
+                action=PolicyDecisionAction.ALLOW if allowed else PolicyDecisionAction.DENY
+            )
+
+    checked: List[str] = []
+
+    @policy.policy_checker("positive", scope=scope, sync=True)
+    def positive(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        checked.append(rsrc.id)
+        if rsrc.data["size"] < 0:
+            raise ValueError("negative size")
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    @policy.policy_checker("remote", scope=scope)
+    async def remote(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules = Pylicy.from_rules(
+        [
+            UserRule(
+                name="local", resources=["local_*"], policies=["size", "positive"], context={"max": 10}
+            ),
+            UserRule(name="remote", resources=["remote_*"], policies=["*"]),
+        ],
+        scope=scope,
+    ).rules
+    policies = Pylicy(rules, scope=scope)
+    resources = [Resource(id="local_small", data={"size": 5}), Resource(id="local_big", data={"size": 50})]
+
+    results = policies.apply_all_sync(resources + [Resource(id="other", data={})])
+    assert results["local_small"]["size"].action == PolicyDecisionAction.ALLOW
+    assert results["local_big"]["size"].action == PolicyDecisionAction.DENY
+    assert results["other"] == {}
+    # Synchronous checkers can still be applied asynchronously
+    assert await policies.apply_all(resources) == {
+        resource.id: results[resource.id] for resource in resources
+    }
+
+    # Plans are checked before any policy is called
+    checked.clear()
+    with pytest.raises(TypeError):
+        policies.apply_sync(Resource(id="remote_a", data={"size": 1}))
+    with pytest.raises(TypeError):
+        policies.apply_all_sync(resources + [Resource(id="remote_a", data={"size": 1})])
+    assert checked == []
+    with pytest.raises(TypeError):
+        policies.apply_all_sync(resources[0])  # type: ignore
+    with pytest.raises(ValueError):
+        policies.apply_sync(Resource(id="local_negative", data={"size": -1}))
+
+    isolated = Pylicy(rules, scope=scope, isolate_errors=True).apply_sync(
+        Resource(id="local_negative", data={"size": -1})
+    )
+    assert isolated["positive"].action == PolicyDecisionAction.ERROR
+    assert isolated["size"].action == PolicyDecisionAction.ALLOW
@@ -1,11 +1,13 @@
 import io
 import json
+import pathlib
 from typing import Dict
 from unittest import mock
 
+import pytest
 import yaml
 
-from pylicy import Pylicy, models
+from pylicy import Pylicy, models, rules
 
 TEST_BASIC_USER_RAW_RULES: Dict[str, models.JSON] = {
     "version": 1,
@@ -179,3 +181,112 @@ def test_pylicy_equality() -> None:
     assert Pylicy(test_rules) == Pylicy(test_rules)
 
     assert Pylicy([]) != Pylicy(test_rules)
+
+
+def test_pylicy_load_from_json_io_stream() -> None:
+    assert (
+        Pylicy.from_json(io.StringIO(json.dumps(TEST_BASIC_USER_RAW_RULES)), stream=True)
+        == TEST_BASIC_USER_RAW_RULES_PYLICY
+    )
+
+
+def test_pylicy_load_from_yaml_io_stream() -> None:
+    assert (
+        Pylicy.from_yaml(io.StringIO(yaml.dump(TEST_BASIC_USER_RAW_RULES)), stream=True)
+        == TEST_BASIC_USER_RAW_RULES_PYLICY
+    )
+
+
+def test_pylicy_load_forwards_options(tmp_path: pathlib.Path) -> None:
+    expected = Pylicy(TEST_BASIC_USER_RAW_RULES_PYLICY.rules, regex_patterns=True).fingerprint
+    assert expected != TEST_BASIC_USER_RAW_RULES_PYLICY.fingerprint
+
+    (tmp_path / "rules.json").write_text(json.dumps(TEST_BASIC_USER_RAW_RULES))
+    for stream in [False, True]:
+        document = json.dumps(TEST_BASIC_USER_RAW_RULES)
+        assert (
+            Pylicy.from_json(io.StringIO(document), stream=stream, regex_patterns=True).fingerprint
+            == expected
+        )
+        document = yaml.dump(TEST_BASIC_USER_RAW_RULES)
+        assert (
+            Pylicy.from_yaml(io.StringIO(document), stream=stream, regex_patterns=True).fingerprint
+            == expected
+        )
+        loaded = Pylicy.from_paths(str(tmp_path / "*.json"), stream=stream, regex_patterns=True)
+        assert loaded.fingerprint == expected
+    assert Pylicy.from_raw_dict(TEST_BASIC_USER_RAW_RULES, regex_patterns=True).fingerprint == expected
+
+
+def _write_rule_files(tmp_path: pathlib.Path) -> None:
+    (tmp_path / "team_b").mkdir()
+    (tmp_path / "team_a.yml").write_text(
+        yaml.dump({"version": 1, "rules": [{"name": "rule_a", "resources": "a_*", "policies": "*"}]})
+    )
+    (tmp_path / "team_b" / "rules.json").write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "rules": [
+                    {"name": "rule_b1", "resources": "b_*", "policies": "*"},
+                    {"name": "rule_b2", "weight": 5, "resources": "b_*", "policies": "!x"},
+                ],
+            }
+        )
+    )
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_pylicy_load_from_paths(tmp_path: pathlib.Path, processes: bool) -> None:
+    _write_rule_files(tmp_path)
+
+    loaded = Pylicy.from_paths(str(tmp_path / "**" / "*.*"), processes=processes, max_workers=2)
+    assert loaded == Pylicy.from_rules(
+        [
+            models.UserRule(name="rule_a", resources="a_*", policies="*"),
+            models.UserRule(name="rule_b1", resources="b_*", policies="*"),
+            models.UserRule(name="rule_b2", weight=5, resources="b_*", policies="!x"),
+        ]
+    )
+    assert (
+        Pylicy.from_paths([str(tmp_path / "*.yml"), str(tmp_path / "*" / "*.json")], stream=True) == loaded
+    )
+
+
+def test_pylicy_load_from_paths_errors(tmp_path: pathlib.Path) -> None:
+    _write_rule_files(tmp_path)
+
+    with pytest.raises(FileNotFoundError):
+        Pylicy.from_paths(str(tmp_path / "*.toml"))
+
+    (tmp_path / "team_c.yml").write_text(
+        yaml.dump({"version": 1, "rules": [{"name": "rule_a", "resources": "c_*", "policies": "*"}]})
+    )
+    with pytest.raises(ValueError):
+        Pylicy.from_paths(str(tmp_path / "**" / "*.*"))
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_pylicy_load_from_paths_invalid_rules(tmp_path: pathlib.Path, processes: bool) -> None:
+    _write_rule_files(tmp_path)
+    bad_rule = {"name": "bad", "weight": "heavy", "resources": "*", "policies": "*"}
+    (tmp_path / "team_c.yml").write_text(yaml.dump({"version": 1, "rules": [bad_rule]}))
+    (tmp_path / "team_d.json").write_text(json.dumps({"version": 1, "rules": ["invalid"]}))
+
+    with pytest.raises(rules.RuleValidationError) as e:
+        Pylicy.from_paths(str(tmp_path / "**" / "*.*"), processes=processes, stream=True)
+    assert [(error.path, error.position, error.name) for error in e.value.errors] == [
+        (str(tmp_path / "team_c.yml"), 0, "bad"),
+        (str(tmp_path / "team_d.json"), 0, None),
+    ]
+    assert str(e.value).startswith(f"2 invalid rule(s): bad ({tmp_path / 'team_c.yml'}, line 2): weight")
+
+
+def test_load_files_reports_timings(tmp_path: pathlib.Path) -> None:
+    _write_rule_files(tmp_path)
+
+    paths = rules.expand_paths(str(tmp_path / "**" / "*.*"))
+    loaded_files = rules.load_files(paths, [])
+    assert [loaded_file.path for loaded_file in loaded_files] == paths
+    assert [len(loaded_file.rules) for loaded_file in loaded_files] == [1, 2]
+    assert all(loaded_file.elapsed >= 0 for loaded_file in loaded_files)
@@ -0,0 +1,85 @@
+from typing import List
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    policy,
+    retry,
+)
+
+
+def test_retry_delays() -> None:
+    backoff = retry.Retry(5, initial=1, maximum=3, jitter=False)
+    assert [backoff.delay(attempt) for attempt in range(1, 5)] == [1, 2, 3, 3]
+
+    jittered = retry.Retry(5, initial=1, maximum=3, seed=0)
+    assert all(0 <= jittered.delay(attempt) <= min(3, 2 ** (attempt - 1)) for attempt in range(1, 5))
+
+    with pytest.raises(ValueError):
+        retry.Retry(0)
+    with pytest.raises(ValueError):
+        retry.Retry(initial=-1)
+
+
+@pytest.mark.asyncio
+async def test_retry_run() -> None:
+    calls: List[int] = []
+
+    async def flaky() -> str:
+        calls.append(len(calls))
+        if len(calls) < 3:
+            raise ConnectionError("try again")
+        return "done"
+
+    assert await retry.Retry(3, initial=0).run(flaky) == "done"
+    assert calls == [0, 1, 2]
+
+    calls.clear()
+    with pytest.raises(ConnectionError):
+        await retry.Retry(2, initial=0).run(flaky)
+    assert calls == [0, 1]
+
+    calls.clear()
+    with pytest.raises(ConnectionError):
+        await retry.Retry(3, initial=0, retry_on=(TimeoutError,)).run(flaky)
+    assert calls == [0]
+
+
+@pytest.mark.asyncio
+async def test_pylicy_retries_and_isolates_errors() -> None:
+    scope = "test_pylicy_retries_and_isolates_errors"
+    attempts: List[str] = []
+
+    @policy.policy_checker("flaky", scope=scope, retry=retry.Retry(3, initial=0))
+    async def flaky(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        attempts.append(rsrc.id)
+        if rsrc.id == "broken" or attempts.count(rsrc.id) < 2:
+            raise ConnectionError(f"{rsrc.id} unavailable")
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope).rules
+    with pytest.raises(ConnectionError):
+        await Pylicy(rules, scope=scope).apply_all([Resource(id="broken")])
+    assert attempts == ["broken"] * 3
+
+    attempts.clear()
+    results = await Pylicy(rules, scope=scope, isolate_errors=True).apply_all(
+        [Resource(id="broken"), Resource(id="fine")]
+    )
+    assert results == {
+        "broken": {
+            "flaky": PolicyDecision(
+                action=PolicyDecisionAction.ERROR,
+                reason="ConnectionError: broken unavailable",
+                detail={"exception": "ConnectionError"},
+            )
+        },
+        "fine": {"flaky": PolicyDecision(action=PolicyDecisionAction.ALLOW)},
+    }
+    assert sorted(attempts) == ["broken"] * 3 + ["fine"] * 2
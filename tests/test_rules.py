@@ -1,6 +1,9 @@
+import io
+import json
 from typing import Any, Dict, List
 
 import pytest
+import yaml
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -170,3 +173,133 @@ def test_load_v1_rules_invalid_rule() -> None:
             },
             [],
         )
+
+
+STREAM_TEST_RULES: Dict[str, Any] = {
+    "version": 1,
+    "rules": [
+        {"name": "enforce_all", "weight": 1, "resources": "*", "policies": "*"},
+        {
+            "name": "frank_extend_time",
+            "resources": "frank_*",
+            "policies": ["token_age"],
+            "context": {"n": 1},
+        },
+    ],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_iter_json_entries_matches_load(chunk_size: int) -> None:
+    document = json.dumps(STREAM_TEST_RULES, indent=2)
+    entries = list(rules.iter_json_entries(io.StringIO(document), chunk_size=chunk_size))
+    assert [(entry.key, entry.position) for entry in entries] == [
+        ("version", None),
+        ("rules", None),
+        ("rules", 0),
+        ("rules", 1),
+    ]
+    assert list(rules.iter_load_stream(entries, [])) == rules.load(STREAM_TEST_RULES, [])
+
+
+def test_iter_json_entries_bytes() -> None:
+    document = json.dumps({"version": 1, "rules": [{"name": "ü", "resources": "*", "policies": "*"}]})
+    entries = rules.iter_json_entries(io.BytesIO(document.encode("utf-8")), chunk_size=3)
+    assert [rule.name for rule in rules.iter_load_stream(entries, [])] == ["ü"]
+
+
+def test_iter_json_entries_invalid_json() -> None:
+    with pytest.raises(ValueError):
+        list(rules.iter_json_entries(io.StringIO('{"version": 1, "rules": [{"name": }]}')))
+
+
+def test_iter_json_entries_trailing_data() -> None:
+    document = json.dumps(STREAM_TEST_RULES) + " garbage ]]]"
+    with pytest.raises(json.JSONDecodeError):
+        json.load(io.StringIO(document))
+    with pytest.raises(ValueError):
+        list(rules.iter_json_entries(io.StringIO(document)))
+    assert len(list(rules.iter_json_entries(io.StringIO(json.dumps(STREAM_TEST_RULES) + "\n")))) == 4
+
+
+def test_iter_load_stream_duplicate_rules() -> None:
+    document = '{"version": 1, "rules": [], "rules": [{"name": "a", "resources": "*", "policies": "*"}]}'
+    with pytest.raises(ValueError):
+        list(rules.iter_load_stream(rules.iter_json_entries(io.StringIO(document)), []))
+    with pytest.raises(ValueError):
+        list(rules.iter_load_stream(rules.iter_yaml_entries(io.StringIO(document)), []))
+
+
+def test_iter_yaml_entries_matches_load() -> None:
+    entries = list(rules.iter_yaml_entries(io.StringIO(yaml.dump(STREAM_TEST_RULES))))
+    assert [(entry.key, entry.position) for entry in entries] == [
+        ("rules", None),
+        ("rules", 0),
+        ("rules", 1),
+        ("version", None),
+    ]
+    assert list(rules.iter_load_stream(entries, [])) == rules.load(STREAM_TEST_RULES, [])
+
+
+def test_iter_load_stream_collects_errors() -> None:
+    document = "\n".join(
+        [
+            "version: 1",
+            "rules:",
+            "  - name: good",
+            "    resources: '*'",
+            "    policies: '*'",
+            "  - name: bad_weight",
+            "    weight: heavy",
+            "    resources: '*'",
+            "    policies: '*'",
+            "  - not a rule",
+        ]
+    )
+    with pytest.raises(rules.RuleValidationError) as e:
+        list(rules.iter_load_stream(rules.iter_yaml_entries(io.StringIO(document)), []))
+
+    assert [(error.position, error.line, error.name) for error in e.value.errors] == [
+        (1, 6, "bad_weight"),
+        (2, 10, None),
+    ]
+    assert "weight" in e.value.errors[0].message
+
+
+def test_iter_json_entries_lines() -> None:
+    document = json.dumps(
+        {
+            "version": 1,
+            "rules": [
+                {"name": "good", "resources": "*", "policies": "*"},
+                {"name": "bad_weight", "weight": "heavy", "resources": "*", "policies": "*"},
+            ],
+        },
+        indent=2,
+    )
+    entries = list(rules.iter_json_entries(io.StringIO(document)))
+    assert [(entry.key, entry.line) for entry in entries] == [
+        ("version", 2),
+        ("rules", 3),
+        ("rules", 4),
+        ("rules", 9),
+    ]
+
+    with pytest.raises(rules.RuleValidationError) as e:
+        list(rules.iter_load_stream(rules.iter_json_entries(io.StringIO(document)), []))
+    assert [(error.position, error.line, error.name) for error in e.value.errors] == [(1, 9, "bad_weight")]
+
+
+def test_iter_load_stream_bad_documents() -> None:
+    def stream(document: Dict[str, Any]) -> List[models.Rule]:
+        return list(rules.iter_load_stream(rules.iter_json_entries(io.StringIO(json.dumps(document))), []))
+
+    with pytest.raises(AttributeError):
+        stream({"rules": []})
+    with pytest.raises(AttributeError):
+        stream({"version": 1})
+    with pytest.raises(NotImplementedError):
+        stream({"version": 9999, "rules": []})
+    with pytest.raises(TypeError):
+        stream({"version": 1, "rules": {}})
+    assert stream({"version": 1, "rules": []}) == []
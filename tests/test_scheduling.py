@@ -0,0 +1,159 @@
+import asyncio
+import time
+from typing import List
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    limits,
+    policy,
+    retry,
+    scheduling,
+)
+
+
+def test_scheduler_validation() -> None:
+    with pytest.raises(ValueError):
+        scheduling.Scheduler(0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_admits_by_priority() -> None:
+    scheduler = scheduling.Scheduler(1)
+    await scheduler.admit(scheduling.Request.create(scheduling.Priority.BATCH))
+    admitted: List[str] = []
+
+    async def admit(name: str, priority: int) -> None:
+        await scheduler.admit(scheduling.Request.create(priority))
+        admitted.append(name)
+
+    waiting = [
+        asyncio.ensure_future(admit("batch_1", scheduling.Priority.BATCH)),
+        asyncio.ensure_future(admit("batch_2", scheduling.Priority.BATCH)),
+        asyncio.ensure_future(admit("interactive", scheduling.Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    assert scheduler.waiting == 3
+
+    for _ in waiting:
+        scheduler.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*waiting)
+    assert admitted == ["interactive", "batch_1", "batch_2"]
+    assert scheduler.running == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_deadlines() -> None:
+    scheduler = scheduling.Scheduler(1)
+    with pytest.raises(TimeoutError):
+        await scheduler.admit(scheduling.Request.create(scheduling.Priority.INTERACTIVE, -1))
+
+    await scheduler.admit(scheduling.Request.create(scheduling.Priority.BATCH))
+    with pytest.raises(TimeoutError):
+        await scheduler.admit(scheduling.Request.create(scheduling.Priority.INTERACTIVE, 0.01))
+    assert scheduler.waiting == 0
+
+    cancelled = asyncio.ensure_future(scheduler.admit(scheduling.Request.create(scheduling.Priority.BATCH)))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    scheduler.release()
+    assert scheduler.running == 0
+
+    # Expired and cancelled waiters do not hold up later executions
+    await asyncio.wait_for(scheduler.admit(scheduling.Request.create(scheduling.Priority.BATCH)), 1)
+    assert scheduler.running == 1
+
+
+@pytest.mark.asyncio
+async def test_pylicy_interactive_preempts_batch() -> None:
+    scope = "test_pylicy_interactive_preempts_batch"
+    executed: List[str] = []
+    release = asyncio.Event()
+    release.set()
+
+    @policy.policy_checker("slow", scope=scope)
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        executed.append(rsrc.id)
+        await asyncio.sleep(0.001)
+        await release.wait()
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=scope).rules
+    scheduler = scheduling.Scheduler(2)
+    policies = Pylicy(rules, scope=scope, scheduler=scheduler)
+
+    batch = asyncio.ensure_future(policies.apply_all([Resource(id=f"batch_{i}") for i in range(20)]))
+    while not scheduler.waiting:
+        await asyncio.sleep(0)
+    assert len(await policies.apply(Resource(id="interactive"))) == 1
+    assert executed.index("interactive") == 2
+    assert len(await batch) == 20
+
+    # Deadlines only apply to admission by the scheduler
+    release.clear()
+    batch = asyncio.ensure_future(policies.apply_all([Resource(id=f"batch_{i}") for i in range(20)]))
+    while not scheduler.waiting:
+        await asyncio.sleep(0)
+    with pytest.raises(TimeoutError):
+        await policies.apply(Resource(id="late"), priority=scheduling.Priority.BATCH, timeout=0.001)
+    release.set()
+    assert len(await batch) == 20
+    assert "late" not in executed
+
+
+@pytest.mark.asyncio
+async def test_pylicy_throttled_batch_does_not_hold_slots() -> None:
+    scope = "test_pylicy_throttled_batch_does_not_hold_slots"
+    attempts: List[str] = []
+
+    @policy.policy_checker("throttled", scope=scope, rate_limit=limits.RateLimit(2, burst=1))
+    async def throttled(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    @policy.policy_checker("flaky", scope=scope, retry=retry.Retry(attempts=3, initial=10, jitter=False))
+    async def flaky(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        attempts.append(rsrc.id)
+        if attempts.count(rsrc.id) == 1:
+            raise ConnectionError(rsrc.id)
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    @policy.policy_checker("fast", scope=scope)
+    async def fast(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW)
+
+    rules = Pylicy.from_rules(
+        [
+            UserRule(name="throttled", resources=["throttled_*"], policies=["throttled"]),
+            UserRule(name="flaky", resources=["flaky_*"], policies=["flaky"]),
+            UserRule(name="fast", resources=["interactive"], policies=["fast"]),
+        ],
+        scope=scope,
+    ).rules
+    scheduler = scheduling.Scheduler(2)
+    policies = Pylicy(rules, scope=scope, scheduler=scheduler)
+
+    batch = asyncio.ensure_future(
+        policies.apply_all(
+            [Resource(id=f"throttled_{i}") for i in range(20)]
+            + [Resource(id=f"flaky_{i}") for i in range(4)]
+        )
+    )
+    while len(attempts) < 4:
+        await asyncio.sleep(0.001)
+
+    # Batch executions are waiting on their rate limit or retry backoff, not holding the scheduler's slots
+    start = time.monotonic()
+    assert len(await policies.apply(Resource(id="interactive"), timeout=0.5)) == 1
+    assert time.monotonic() - start < 0.1
+
+    batch.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await batch
@@ -0,0 +1,126 @@
+import csv
+import datetime
+import io
+import json
+import pathlib
+from typing import Any, List
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    policy,
+    sinks,
+)
+from pylicy.models import ExecutionPlanStep, ResourceResult
+
+RULE = Rule(
+    name="my_rule", description="my_rule", weight=100, resource_patterns=["*"], policy_patterns=["*"]
+)
+RESULTS = [
+    ResourceResult(
+        resource_id="my_resource",
+        plan=[ExecutionPlanStep("policy_a", RULE), ExecutionPlanStep("policy_b", RULE)],
+        decisions={
+            "policy_a": PolicyDecision(action=PolicyDecisionAction.ALLOW),
+            "policy_b": PolicyDecision(action=PolicyDecisionAction.DENY, reason="bad", detail={"n": 1}),
+        },
+    ),
+    ResourceResult(resource_id="unmatched_resource", plan=[], decisions={}),
+]
+EXPECTED_ROWS: List[List[Any]] = [
+    ["my_resource", "policy_a", "my_rule", "allow", None, None],
+    ["my_resource", "policy_b", "my_rule", "deny", "bad", {"n": 1}],
+]
+
+
+def test_jsonl_sink_buffers_rows() -> None:
+    out = io.StringIO()
+    sink = sinks.JSONLinesSink(out, buffer_size=10)
+    for result in RESULTS:
+        sink.write(result)
+
+    assert sink.pending == 2
+    assert out.getvalue() == ""
+
+    sink.close()
+    assert sink.pending == 0
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        dict(zip(sinks.COLUMNS, row)) for row in EXPECTED_ROWS
+    ]
+    with pytest.raises(ValueError):
+        sink.write(RESULTS[0])
+
+
+def test_csv_sink(tmp_path: pathlib.Path) -> None:
+    with sinks.CSVSink(str(tmp_path / "results.csv")) as sink:
+        for result in RESULTS:
+            sink.write(result)
+
+    with open(tmp_path / "results.csv", newline="") as f:
+        assert list(csv.reader(f)) == [
+            list(sinks.COLUMNS),
+            ["my_resource", "policy_a", "my_rule", "allow", "", ""],
+            ["my_resource", "policy_b", "my_rule", "deny", "bad", '{"n": 1}'],
+        ]
+
+
+def test_sinks_encode_detail(tmp_path: pathlib.Path) -> None:
+    checked = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    result = ResourceResult(
+        resource_id="my_resource",
+        plan=[ExecutionPlanStep("policy_a", RULE)],
+        decisions={
+            "policy_a": PolicyDecision(action=PolicyDecisionAction.DENY, detail={"checked": checked})
+        },
+    )
+
+    out = io.StringIO()
+    with sinks.JSONLinesSink(out) as sink:
+        sink.write(result)
+    assert json.loads(out.getvalue())["detail"] == {"checked": checked.isoformat()}
+
+    with sinks.CSVSink(str(tmp_path / "results.csv")) as sink:
+        sink.write(result)
+    with open(tmp_path / "results.csv", newline="") as f:
+        assert json.loads(list(csv.reader(f))[1][-1]) == {"checked": checked.isoformat()}
+
+
+def test_parquet_sink(tmp_path: pathlib.Path) -> None:
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    with sinks.ParquetSink(str(tmp_path / "results.parquet")) as sink:
+        for result in RESULTS:
+            sink.write(result)
+
+    table = pyarrow.parquet.read_table(tmp_path / "results.parquet")
+    assert table.column("policy").to_pylist() == ["policy_a", "policy_b"]
+    assert table.column("detail").to_pylist() == [None, '{"n": 1}']
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_to_sink() -> None:
+    scope = "test_pylicy_apply_to_sink"
+
+    async def checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        return PolicyDecision(action=PolicyDecisionAction.WARN)
+
+    policy.register_policy("my_policy", checker, scope=scope)
+    policies = Pylicy.from_rules(
+        [UserRule(name="simple_rule", resources=["match_*"], policies=["my_policy"])], scope=scope
+    )
+
+    out = io.StringIO()
+    sink = sinks.JSONLinesSink(out, buffer_size=2)
+    resources = [Resource(id=f"match_{i}", data=None) for i in range(5)] + [Resource(id="other", data=None)]
+    assert await policies.apply_to_sink(resources, sink) == 6
+
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert sorted(row["resource_id"] for row in rows) == [f"match_{i}" for i in range(5)]
+    assert all(row["action"] == "warn" and row["rule"] == "simple_rule" for row in rows)
@@ -0,0 +1,118 @@
+import datetime
+import os
+from typing import Dict
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    policy,
+    store,
+)
+from pylicy.models import ResourceResult
+
+
+def make_result(resource_id: str, decisions: Dict[str, PolicyDecision]) -> ResourceResult:
+    return ResourceResult(resource_id=resource_id, plan=[], decisions=decisions)
+
+
+def test_result_store_in_memory() -> None:
+    results = store.ResultStore(memory_budget=10)
+    decisions = {"age": PolicyDecision(action=PolicyDecisionAction.ALLOW)}
+    results.add(make_result("a", decisions))
+    results.add(make_result("b", {}))
+
+    assert not results.spilled
+    assert results["a"] is decisions
+    assert dict(results) == {"a": decisions, "b": {}}
+    assert "c" not in results
+    with pytest.raises(KeyError):
+        results["c"]
+
+    with pytest.raises(ValueError):
+        store.ResultStore(memory_budget=0)
+
+
+def test_result_store_spills(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "results.db")
+    with store.ResultStore(path, memory_budget=3) as results:
+        for i in range(10):
+            results.add(
+                make_result(
+                    f"resource_{i}",
+                    {
+                        "age": PolicyDecision(
+                            action=PolicyDecisionAction.DENY, reason="old", detail={"age": i}
+                        ),
+                        "owner": PolicyDecision(action=PolicyDecisionAction.ALLOW),
+                    },
+                )
+            )
+        results.add(make_result("resource_0", {"age": PolicyDecision(action=PolicyDecisionAction.WARN)}))
+
+        assert results.spilled
+        assert os.path.exists(path)
+        assert results["resource_0"] == {"age": PolicyDecision(action=PolicyDecisionAction.WARN)}
+        assert results["resource_5"]["age"].detail == {"age": 5}
+        assert "resource_9" in results
+        assert len(results) == 10
+        assert sorted(results) == sorted(f"resource_{i}" for i in range(10))
+        items = dict(results.items())
+        assert items["resource_3"]["owner"].action == PolicyDecisionAction.ALLOW
+        assert items["resource_0"] == results["resource_0"]
+
+
+def test_result_store_counts_empty_results(tmp_path: str) -> None:
+    with store.ResultStore(os.path.join(tmp_path, "results.db"), memory_budget=3) as results:
+        for i in range(4):
+            results.add(make_result(f"resource_{i}", {}))
+        assert results.spilled
+        assert dict(results) == {f"resource_{i}": {} for i in range(4)}
+
+
+def test_result_store_encodes_detail(tmp_path: str) -> None:
+    checked = datetime.datetime(2024, 1, 2, 3, 4, 5)
+    with store.ResultStore(os.path.join(tmp_path, "results.db"), memory_budget=1) as results:
+        decision = PolicyDecision(action=PolicyDecisionAction.DENY, detail={"checked": checked})
+        results.add(make_result("a", {"age": decision}))
+        results.add(make_result("b", {"age": decision}))
+        assert results.spilled
+        assert results["a"] == {
+            "age": PolicyDecision(action=PolicyDecisionAction.DENY, detail={"checked": checked.isoformat()})
+        }
+
+
+def test_result_store_temporary_file() -> None:
+    results = store.ResultStore(memory_budget=1)
+    results.add(make_result("a", {"age": PolicyDecision(action=PolicyDecisionAction.ALLOW)}))
+    results.add(make_result("b", {"age": PolicyDecision(action=PolicyDecisionAction.ALLOW)}))
+    assert results.spilled
+    path = results._connection.execute("PRAGMA database_list").fetchone()[2]  # type: ignore
+    assert os.path.exists(path)
+
+    results.close()
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_pylicy_apply_to_store() -> None:
+    scope = "test_pylicy_apply_to_store"
+
+    @policy.policy_checker("size", scope=scope)
+    async def size(rsrc: Resource, rule: Rule) -> PolicyDecision:
+        allowed = rsrc.data["size"] < 5
+        return PolicyDecision(action=PolicyDecisionAction.ALLOW if allowed else PolicyDecisionAction.DENY)
+
+    policies = Pylicy.from_rules([UserRule(name="all", resources=["r*"], policies=["*"])], scope=scope)
+    resources = [Resource(id=f"r{i}", data={"size": i}) for i in range(10)] + [
+        Resource(id="other", data={})
+    ]
+
+    with await policies.apply_to_store(resources, store=store.ResultStore(memory_budget=4)) as results:
+        assert results.spilled
+        assert dict(results.items()) == await policies.apply_all(resources)
@@ -0,0 +1,120 @@
+from typing import Any, Optional, Tuple
+
+import pytest
+
+from pylicy import (
+    PolicyDecision,
+    PolicyDecisionAction,
+    Pylicy,
+    Resource,
+    Rule,
+    UserRule,
+    policy,
+    scheduling,
+    tracing,
+)
+
+SCOPE = "test_tracing"
+
+
+@policy.policy_checker("traced_policy", scope=SCOPE)
+async def traced_checker(rsrc: Resource, rule: Rule) -> PolicyDecision:
+    return PolicyDecision(action=PolicyDecisionAction.WARN)
+
+
+def _traced_pylicy(scheduler: Optional[scheduling.Scheduler] = None, **kwargs: Any) -> Tuple[Pylicy, Any]:
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    in_memory = pytest.importorskip("opentelemetry.sdk.trace.export.in_memory_span_exporter")
+    export = pytest.importorskip("opentelemetry.sdk.trace.export")
+
+    exporter = in_memory.InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(export.SimpleSpanProcessor(exporter))
+
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=SCOPE).rules
+    return (
+        Pylicy(
+            rules,
+            scope=SCOPE,
+            tracing_config=tracing.Tracing(tracer_provider=provider, **kwargs),
+            scheduler=scheduler,
+        ),
+        exporter,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pylicy_tracing_spans() -> None:
+    policies, exporter = _traced_pylicy()
+    await policies.apply_all([Resource(id="resource_a", data=None), Resource(id="resource_b", data=None)])
+
+    spans = {
+        (span.name, span.attributes.get("pylicy.resource.id")): span
+        for span in exporter.get_finished_spans()
+    }
+    assert set(spans) == {
+        ("pylicy.apply_all", None),
+        ("pylicy.apply", "resource_a"),
+        ("pylicy.apply", "resource_b"),
+        ("pylicy.execute", "resource_a"),
+        ("pylicy.execute", "resource_b"),
+    }
+
+    apply_all = spans[("pylicy.apply_all", None)]
+    apply = spans[("pylicy.apply", "resource_a")]
+    execute = spans[("pylicy.execute", "resource_a")]
+    assert apply_all.attributes["pylicy.resources"] == 2
+    assert apply.parent.span_id == apply_all.context.span_id
+    assert apply.attributes["pylicy.plan.size"] == 1
+    assert execute.parent.span_id == apply.context.span_id
+    assert dict(execute.attributes) == {
+        "pylicy.resource.id": "resource_a",
+        "pylicy.policy": "traced_policy",
+        "pylicy.rule": "rule",
+        "pylicy.decision.action": "warn",
+    }
+
+
+@pytest.mark.asyncio
+async def test_pylicy_tracing_schedule() -> None:
+    policies, exporter = _traced_pylicy(scheduler=scheduling.Scheduler(1))
+    await policies.apply_all([Resource(id="resource_a", data=None), Resource(id="resource_b", data=None)])
+
+    spans = {
+        (span.name, span.attributes.get("pylicy.resource.id")): span
+        for span in exporter.get_finished_spans()
+    }
+    schedule = spans[("pylicy.schedule", "resource_a")]
+    assert schedule.parent.span_id == spans[("pylicy.execute", "resource_a")].context.span_id
+    assert dict(schedule.attributes) == {
+        "pylicy.resource.id": "resource_a",
+        "pylicy.policy": "traced_policy",
+        "pylicy.rule": "rule",
+    }
+    assert ("pylicy.schedule", "resource_b") in spans
+
+
+@pytest.mark.asyncio
+async def test_pylicy_tracing_sampling() -> None:
+    policies, exporter = _traced_pylicy(resource_sample_rate=0.0)
+    await policies.apply_all([Resource(id=f"resource_{i}", data=None) for i in range(10)])
+    assert [span.name for span in exporter.get_finished_spans()] == ["pylicy.apply_all"]
+
+
+@pytest.mark.asyncio
+async def test_tracing_disabled_without_library(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tracing, "otel_trace", None)
+    disabled = tracing.Tracing()
+    assert not disabled.enabled
+
+    rules = Pylicy.from_rules([UserRule(name="rule", resources=["*"], policies=["*"])], scope=SCOPE).rules
+    policies = Pylicy(rules, scope=SCOPE, tracing_config=disabled)
+    assert policies._tracing is None
+    assert await policies.apply(Resource(id="resource", data=None)) == {
+        "traced_policy": PolicyDecision(action=PolicyDecisionAction.WARN)
+    }
+
+
+def test_tracing_bad_sample_rate() -> None:
+    with pytest.raises(ValueError):
+        tracing.Tracing(resource_sample_rate=2)
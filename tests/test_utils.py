@@ -1,7 +1,9 @@
+import io
 import itertools
 from collections.abc import Iterable
 from typing import Any, List
 
+import pytest
 from hypothesis import given
 from hypothesis import strategies as st
 
@@ -73,3 +75,69 @@ def test_pattern_matches_props() -> None:
     assert utils.PatternMatches({"in"}, {"in", "out"}, all=["in", "out"]).matched == ["in", "out"]
     assert utils.PatternMatches({"in"}, {"in", "out"}, all=["in", "out"]).include == ["in"]
     assert utils.PatternMatches({"in"}, {"in", "out"}, all=["in", "out"]).exclude == ["out"]
+
+
+@given(st.sets(st.integers(min_value=0, max_value=200)))
+def test_iter_bits(positions: set[int]) -> None:
+    assert list(utils.iter_bits(sum(1 << position for position in positions))) == sorted(positions)
+
+
+def test_pattern_matches_masks() -> None:
+    items = ("iphone", "ipad", "iwatch", "apple watch")
+    phones = utils.match_patterns(["i*", "!*watch"], items)
+    assert phones == utils.PatternMatches.from_masks(items, 0b0011, 0b1111)
+    assert phones.include_mask == 0b0011
+    assert phones.exclude_mask == 0b1100
+    assert phones.include is phones.include
+
+    watches = utils.match_patterns(["*watch"], items)
+    assert (phones | watches).include == ["iphone", "ipad", "iwatch", "apple watch"]
+    assert (phones | watches).exclude == []
+    assert (phones & watches).include == []
+    assert (phones & watches).exclude == ["iwatch", "apple watch"]
+    assert (phones & utils.match_patterns(["*"], items)) == phones
+    assert "ipad" in phones and "iwatch" not in phones
+
+    with pytest.raises(ValueError):
+        phones | utils.match_patterns(["*"], ["iphone"])
+
+
+@given(
+    st.lists(st.one_of(st.text(alphabet="ab*?!"), st.sampled_from(["!*", "*", "!a*"]))),
+    st.lists(st.text(alphabet="ab")),
+)
+def test_pattern_set_agrees_with_match_patterns(patterns: List[str], items: List[str]) -> None:
+    pattern_set = utils.PatternSet(patterns)
+    included = utils.match_patterns(patterns, items)
+    assert [item for item in items if pattern_set.match(item)] == [
+        item for item in items if item in included
+    ]
+    assert utils.match_patterns(pattern_set, items) == included
+    assert utils.match_patterns(pattern_set, items).matched == included.matched
+
+
+def test_pattern_set_regex() -> None:
+    patterns = utils.PatternSet(["regex:(?P<org>[a-z]+)-\\d+", "!regex:admin-\\d+", "a*b*c*"], regex=True)
+    assert patterns.match("dev-1")
+    assert not patterns.match("dev-1x")
+    assert not patterns.match("admin-1")
+    assert patterns.match("abc")
+    assert patterns.position("admin-1") == 1
+    assert patterns.position("other") is None
+    assert utils.PatternSet(["regex:(?P<a>x)(?P=a)", "regex:(?P<a>y)"], regex=True).match("xx")
+
+    assert not utils.PatternSet(["regex:dev-*"]).match("dev-1")
+    assert utils.PatternSet(["regex:dev-*"]).match("regex:dev-1")
+
+
+def test_iter_json_array() -> None:
+    assert list(utils.iter_json_array(io.StringIO(' [1, {"a": [2]}, "3"] \n'), chunk_size=2)) == [
+        1,
+        {"a": [2]},
+        "3",
+    ]
+    assert list(utils.iter_json_array(io.StringIO("[]"))) == []
+    with pytest.raises(ValueError):
+        list(utils.iter_json_array(io.StringIO("[1, 2] [3]")))
+    with pytest.raises(ValueError):
+        list(utils.iter_json_array(io.StringIO("[1, 2")))